@@ -0,0 +1,111 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('statistics',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('total_users', sa.Integer(), nullable=False),
+    sa.Column('total_requests', sa.Integer(), nullable=False),
+    sa.Column('total_revenue', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('daily_users', sa.Integer(), nullable=False),
+    sa.Column('daily_requests', sa.Integer(), nullable=False),
+    sa.Column('daily_revenue', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_statistics_date'), 'statistics', ['date'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('telegram_id', sa.BigInteger(), nullable=False),
+    sa.Column('username', sa.String(length=255), nullable=True),
+    sa.Column('first_name', sa.String(length=255), nullable=True),
+    sa.Column('last_name', sa.String(length=255), nullable=True),
+    sa.Column('balance', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('last_free_usage', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_telegram_id'), 'users', ['telegram_id'], unique=True)
+    op.create_table('balance_transactions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.BigInteger(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('transaction_type', sa.Enum('CREDIT', 'DEBIT', name='transactiontype'), nullable=False),
+    sa.Column('description', sa.String(length=500), nullable=False),
+    sa.Column('payment_method', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_balance_transactions_user_id'), 'balance_transactions', ['user_id'], unique=False)
+    op.create_table('payments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.BigInteger(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('method', sa.Enum('YOOMONEY', 'TELEGRAM_STARS', name='paymentmethod'), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'SUCCESS', 'FAILED', 'CANCELLED', name='paymentstatus'), nullable=False),
+    sa.Column('external_payment_id', sa.String(length=255), nullable=True),
+    sa.Column('payment_url', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_payments_user_id'), 'payments', ['user_id'], unique=False)
+    op.create_table('service_requests',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.BigInteger(), nullable=False),
+    sa.Column('category', sa.Enum('ARTISTIC', 'BUSINESS', 'NUMBERS', name='servicecategory'), nullable=False),
+    sa.Column('subcategory', sa.Enum('DIALOGS', 'NATURE', 'MUSIC', 'POETRY', 'AGREEMENTS', 'LAWS', 'PRESENTATIONS', 'NEGOTIATIONS', 'ROUTES', 'PHONE_NUMBERS', 'STATISTICS', 'CALCULATIONS', name='servicesubcategory'), nullable=False),
+    sa.Column('voice_file_id', sa.String(length=255), nullable=False),
+    sa.Column('voice_file_unique_id', sa.String(length=255), nullable=True),
+    sa.Column('voice_duration', sa.Integer(), nullable=False),
+    sa.Column('voice_file_size', sa.Integer(), nullable=True),
+    sa.Column('processed_text', sa.Text(), nullable=True),
+    sa.Column('response_text', sa.Text(), nullable=True),
+    sa.Column('status', sa.Enum('PENDING', 'PROCESSING', 'COMPLETED', 'FAILED', name='requeststatus'), nullable=False),
+    sa.Column('cost', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('is_free', sa.Boolean(), nullable=False),
+    sa.Column('processing_started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('processing_completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_service_requests_user_id'), 'service_requests', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_service_requests_user_id"), table_name="service_requests")
+    op.drop_table("service_requests")
+    op.drop_index(op.f("ix_payments_user_id"), table_name="payments")
+    op.drop_table("payments")
+    op.drop_index(op.f("ix_balance_transactions_user_id"), table_name="balance_transactions")
+    op.drop_table("balance_transactions")
+    op.drop_index(op.f("ix_users_telegram_id"), table_name="users")
+    op.drop_table("users")
+    op.drop_index(op.f("ix_statistics_date"), table_name="statistics")
+    op.drop_table("statistics")
+    for enum in ("requeststatus", "servicesubcategory", "servicecategory", "paymentstatus", "paymentmethod", "transactiontype"):
+        sa.Enum(name=enum).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,51 @@
+"""service catalog tables
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The enum types already exist: service_requests created them
+    category = postgresql.ENUM(name="servicecategory", create_type=False)
+    subcategory = postgresql.ENUM(name="servicesubcategory", create_type=False)
+    op.create_table(
+        "catalog_categories",
+        sa.Column("category", category, nullable=False),
+        sa.Column("description", sa.String(length=255), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("category"),
+    )
+    op.create_table(
+        "catalog_subcategories",
+        sa.Column("subcategory", subcategory, nullable=False),
+        sa.Column("category", category, nullable=False),
+        sa.Column("description", sa.String(length=255), nullable=False),
+        sa.Column("price", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("max_duration", sa.Integer(), nullable=False),
+        sa.Column("processor", sa.String(length=50), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["category"], ["catalog_categories.category"]),
+        sa.PrimaryKeyConstraint("subcategory"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("catalog_subcategories")
+    op.drop_table("catalog_categories")
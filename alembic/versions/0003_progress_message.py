@@ -0,0 +1,28 @@
+"""service request progress message
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("service_requests", sa.Column("chat_id", sa.BigInteger(), nullable=True))
+    op.add_column("service_requests", sa.Column("progress_message_id", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("service_requests", "progress_message_id")
+    op.drop_column("service_requests", "chat_id")
@@ -0,0 +1,28 @@
+"""service request speech duration
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("service_requests", sa.Column("speech_duration", sa.Float(), nullable=True))
+    op.add_column("service_requests", sa.Column("asr_seconds_saved", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("service_requests", "asr_seconds_saved")
+    op.drop_column("service_requests", "speech_duration")
@@ -0,0 +1,26 @@
+"""service request recognizer tier
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("service_requests", sa.Column("recognizer_tier", sa.String(length=16), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("service_requests", "recognizer_tier")
@@ -0,0 +1,49 @@
+"""shadow results table
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "shadow_results",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("request_id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(length=16), nullable=False),
+        sa.Column("primary_engine", sa.String(length=64), nullable=False),
+        sa.Column("candidate_engine", sa.String(length=64), nullable=False),
+        sa.Column("primary_seconds", sa.Float(), nullable=True),
+        sa.Column("primary_cpu_seconds", sa.Float(), nullable=True),
+        sa.Column("candidate_seconds", sa.Float(), nullable=True),
+        sa.Column("candidate_cpu_seconds", sa.Float(), nullable=True),
+        sa.Column("exact_match", sa.Boolean(), nullable=True),
+        sa.Column("similarity", sa.Float(), nullable=True),
+        sa.Column("word_error_rate", sa.Float(), nullable=True),
+        sa.Column("candidate_output", sa.Text(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["request_id"], ["service_requests.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_shadow_results_request_id"), "shadow_results", ["request_id"], unique=False)
+    op.create_index(op.f("ix_shadow_results_created_at"), "shadow_results", ["created_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_shadow_results_created_at"), table_name="shadow_results")
+    op.drop_index(op.f("ix_shadow_results_request_id"), table_name="shadow_results")
+    op.drop_table("shadow_results")
@@ -0,0 +1,26 @@
+"""
+Обработка аудио перед распознаванием: декодирование, проверка качества, VAD, разбиение, склейка
+"""
+
+from .decode import SAMPLE_RATE, decode_audio, decode_wav, pcm_duration
+from .quality import AudioQuality, QualityIssue, assess_quality, measure_quality
+from .segment import Chunk, split_on_silence
+from .stitch import stitch_transcripts
+from .vad import VadResult, detect_speech, trim_silence
+
+__all__ = [
+    "SAMPLE_RATE",
+    "AudioQuality",
+    "Chunk",
+    "QualityIssue",
+    "VadResult",
+    "assess_quality",
+    "decode_audio",
+    "decode_wav",
+    "detect_speech",
+    "measure_quality",
+    "pcm_duration",
+    "split_on_silence",
+    "stitch_transcripts",
+    "trim_silence",
+]
@@ -0,0 +1,65 @@
+"""
+Декодирование голосовых сообщений в 16-bit mono PCM
+"""
+
+import asyncio
+import io
+import wave
+from typing import Optional
+
+import numpy as np
+
+from app.config import settings
+
+SAMPLE_RATE = 16000
+
+
+async def decode_audio(
+    data: bytes,
+    sample_rate: int = SAMPLE_RATE,
+    max_seconds: Optional[float] = None,
+) -> np.ndarray:
+    """Декодировать запись в int16 PCM: OGG/Opus через ffmpeg, WAV — без него.
+
+    max_seconds ограничивает декодирование началом записи.
+    """
+    if data[:4] == b"RIFF":
+        pcm = decode_wav(data, sample_rate)
+        return pcm if max_seconds is None else pcm[:int(max_seconds * sample_rate)]
+
+    limit = ["-t", str(max_seconds)] if max_seconds is not None else []
+    process = await asyncio.create_subprocess_exec(
+        settings.ffmpeg_path, "-nostdin", "-loglevel", "error",
+        "-i", "pipe:0",
+        "-f", "s16le", "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(sample_rate),
+        *limit, "pipe:1",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate(data)
+    if process.returncode != 0:
+        raise ValueError(f"Audio decoding failed: {stderr.decode(errors='replace').strip()}")
+    return np.frombuffer(stdout, dtype="<i2")
+
+
+def decode_wav(data: bytes, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """16-bit WAV → mono int16 PCM с нужной частотой дискретизации."""
+    with wave.open(io.BytesIO(data)) as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError("Only 16-bit WAV is supported")
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        pcm = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2")
+
+    if channels > 1:
+        pcm = pcm.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    if rate != sample_rate:
+        # Линейной интерполяции достаточно для речи перед распознаванием
+        positions = np.arange(0, len(pcm), rate / sample_rate)
+        pcm = np.interp(positions, np.arange(len(pcm)), pcm).astype(np.int16)
+    return pcm
+
+
+def pcm_duration(pcm: np.ndarray, sample_rate: int = SAMPLE_RATE) -> float:
+    return len(pcm) / sample_rate
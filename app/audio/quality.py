@@ -0,0 +1,83 @@
+"""
+Быстрая проверка качества записи по разреженной выборке до списания оплаты
+"""
+
+import math
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+import numpy as np
+
+from app.audio.decode import SAMPLE_RATE
+
+SAMPLE_WINDOWS = 32
+WINDOW_SECONDS = 0.25
+# Отсчёт на уровне не ниже -0.01 dBFS считаем срезанным
+CLIP_LEVEL = 32730
+FULL_SCALE = 32768.0
+
+
+class QualityIssue(str, Enum):
+    SILENT = "silent"
+    CLIPPED = "clipped"
+    BROKEN = "broken"  # Не декодируется или не содержит ни одного отсчёта
+
+
+@dataclass(frozen=True, slots=True)
+class AudioQuality:
+    rms_dbfs: float
+    peak_dbfs: float
+    clipping_ratio: float
+    samples: int  # Сколько отсчётов вошло в выборку
+
+
+def _dbfs(value: float) -> float:
+    return 20 * math.log10(value / FULL_SCALE) if value > 0 else float("-inf")
+
+
+def sparse_sample(
+    pcm: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    windows: int = SAMPLE_WINDOWS,
+    window_seconds: float = WINDOW_SECONDS,
+) -> np.ndarray:
+    """Равномерно разнесённые окна записи; короткая запись берётся целиком."""
+    window = max(1, int(window_seconds * sample_rate))
+    if len(pcm) <= windows * window:
+        return pcm
+    starts = np.linspace(0, len(pcm) - window, windows).astype(np.int64)
+    return pcm[starts[:, None] + np.arange(window)].ravel()
+
+
+def measure_quality(pcm: np.ndarray, sample_rate: int = SAMPLE_RATE) -> AudioQuality:
+    """RMS, пик и доля клиппинга по разреженной выборке int16 PCM."""
+    sample = sparse_sample(pcm, sample_rate)
+    if not len(sample):
+        return AudioQuality(float("-inf"), float("-inf"), 0.0, 0)
+    # int32: модуль -32768 не помещается в int16
+    magnitude = np.abs(sample.astype(np.int32))
+    rms = float(np.sqrt(np.mean(np.square(magnitude, dtype=np.float64))))
+    return AudioQuality(
+        rms_dbfs=_dbfs(rms),
+        peak_dbfs=_dbfs(float(magnitude.max())),
+        clipping_ratio=float(np.count_nonzero(magnitude >= CLIP_LEVEL)) / len(sample),
+        samples=len(sample),
+    )
+
+
+def assess_quality(
+    pcm: np.ndarray,
+    min_rms_dbfs: float,
+    max_clipping_ratio: float,
+    sample_rate: int = SAMPLE_RATE,
+) -> tuple[AudioQuality, Optional[QualityIssue]]:
+    """Измерения и проблема записи (None — запись можно распознавать)."""
+    quality = measure_quality(pcm, sample_rate)
+    if not quality.samples:
+        return quality, QualityIssue.BROKEN
+    if quality.rms_dbfs < min_rms_dbfs:
+        return quality, QualityIssue.SILENT
+    if quality.clipping_ratio > max_clipping_ratio:
+        return quality, QualityIssue.CLIPPED
+    return quality, None
@@ -0,0 +1,98 @@
+"""
+Разбиение записи на фрагменты по паузам
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.audio.decode import SAMPLE_RATE
+
+FRAME_SECONDS = 0.02
+
+
+@dataclass(frozen=True, slots=True)
+class Chunk:
+    start: int  # Отсчёты PCM
+    end: int
+    overlaps_previous: bool = False
+
+    def duration(self, sample_rate: int = SAMPLE_RATE) -> float:
+        return (self.end - self.start) / sample_rate
+
+
+def frame_signal(pcm: np.ndarray, frame_length: int) -> np.ndarray:
+    """Неперекрывающиеся кадры float32 (хвост короче кадра отбрасывается)."""
+    frames = len(pcm) // frame_length
+    return pcm[:frames * frame_length].astype(np.float32).reshape(frames, frame_length)
+
+
+def frame_energy(pcm: np.ndarray, frame_length: int) -> np.ndarray:
+    """RMS-энергия по кадрам."""
+    framed = frame_signal(pcm, frame_length)
+    return np.sqrt(np.mean(framed * framed, axis=1))
+
+
+def silence_threshold(energy: np.ndarray, min_threshold: float = 200.0) -> float:
+    """Порог тишины: кратный уровню шума (10-й перцентиль энергии).
+
+    Для записей без пауз (ровный шум) порог ограничен серединой между
+    10-м и 90-м перцентилями, чтобы вся запись не оказалась «тишиной».
+    """
+    if len(energy) == 0:
+        return min_threshold
+    low, high = np.percentile(energy, [10, 90])
+    return max(min_threshold, float(min(low * 3, (low + high) / 2)))
+
+
+def silence_runs(silent: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Начала и концы (не включая) непрерывных участков тишины, в кадрах."""
+    padded = np.concatenate(([0], silent.astype(np.int8), [0]))
+    changes = np.flatnonzero(np.diff(padded))
+    return changes[0::2], changes[1::2]
+
+
+def split_on_silence(
+    pcm: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    max_chunk_seconds: float = 30.0,
+    min_chunk_seconds: float = 5.0,
+    min_silence_seconds: float = 0.3,
+    overlap_seconds: float = 1.0,
+) -> list[Chunk]:
+    """Разбить PCM на фрагменты не длиннее max_chunk_seconds."""
+    if overlap_seconds >= max_chunk_seconds:
+        # Иначе жёсткий разрез не сдвигает начало следующего фрагмента
+        raise ValueError("Chunk overlap must be shorter than the chunk")
+    total = len(pcm)
+    max_chunk = int(max_chunk_seconds * sample_rate)
+    if total <= max_chunk:
+        return [Chunk(0, total)]
+
+    frame_length = int(FRAME_SECONDS * sample_rate)
+    energy = frame_energy(pcm, frame_length)
+    starts, ends = silence_runs(energy < silence_threshold(energy))
+    long_enough = (ends - starts) * FRAME_SECONDS >= min_silence_seconds
+    # Точки разреза — середины длинных пауз, в отсчётах
+    cut_points = ((starts[long_enough] + ends[long_enough]) // 2) * frame_length
+
+    min_chunk = int(min_chunk_seconds * sample_rate)
+    overlap = int(overlap_seconds * sample_rate)
+    chunks: list[Chunk] = []
+    start = 0
+    overlaps_previous = False
+
+    while total - start > max_chunk:
+        low = np.searchsorted(cut_points, start + min_chunk, side="left")
+        high = np.searchsorted(cut_points, start + max_chunk, side="right")
+        if high > low:
+            cut = int(cut_points[high - 1])
+            chunks.append(Chunk(start, cut, overlaps_previous))
+            start, overlaps_previous = cut, False
+        else:
+            cut = start + max_chunk
+            chunks.append(Chunk(start, cut, overlaps_previous))
+            start, overlaps_previous = cut - overlap, True
+
+    chunks.append(Chunk(start, total, overlaps_previous))
+    return chunks
@@ -0,0 +1,41 @@
+"""
+Склейка распознанных фрагментов в один текст
+"""
+
+import re
+from typing import Sequence
+
+from app.audio.segment import Chunk
+
+# Сколько слов на стыке сравнивать при поиске дубля из перекрытия
+MAX_OVERLAP_WORDS = 8
+
+_WORD_EDGE = re.compile(r"^\W+|\W+$")
+
+
+def _normalize(word: str) -> str:
+    return _WORD_EDGE.sub("", word).lower()
+
+
+def merge_overlap(previous: str, current: str, max_words: int = MAX_OVERLAP_WORDS) -> str:
+    """Убрать из начала current слова, повторяющие конец previous."""
+    previous_words = [_normalize(word) for word in previous.split()[-max_words:]]
+    current_words = current.split()
+    current_normalized = [_normalize(word) for word in current_words[:max_words]]
+
+    for size in range(min(len(previous_words), len(current_normalized)), 0, -1):
+        if previous_words[-size:] == current_normalized[:size]:
+            return " ".join(current_words[size:])
+    return current
+
+
+def stitch_transcripts(chunks: Sequence[Chunk], texts: Sequence[str]) -> str:
+    """Собрать текст фрагментов по порядку, убирая дубли на перекрытых стыках."""
+    parts: list[str] = []
+    for chunk, text in zip(chunks, texts):
+        text = text.strip()
+        if parts and chunk.overlaps_previous:
+            text = merge_overlap(parts[-1], text)
+        if text:
+            parts.append(text)
+    return " ".join(parts)
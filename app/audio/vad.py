@@ -0,0 +1,135 @@
+"""
+Детектор речи (VAD) по энергии и ZCR кадров с гистерезисом и обрезка тишины перед распознаванием
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.audio.decode import SAMPLE_RATE
+from app.audio.segment import FRAME_SECONDS, frame_signal
+
+# Абсолютный минимум энергии речи (int16 RMS, около -50 dBFS)
+MIN_SPEECH_ENERGY = 100.0
+# Доля переходов через ноль, характерная для шипящих и глухих согласных
+FRICATIVE_ZCR = 0.25
+
+
+@dataclass(frozen=True)
+class VadResult:
+    # Начала и концы (не включая) речевых участков, в кадрах
+    starts: np.ndarray
+    ends: np.ndarray
+    frame_length: int
+    total_samples: int
+    sample_rate: int = SAMPLE_RATE
+
+    @property
+    def speech_samples(self) -> int:
+        return int(np.sum(self.ends - self.starts)) * self.frame_length
+
+    @property
+    def speech_seconds(self) -> float:
+        return self.speech_samples / self.sample_rate
+
+    @property
+    def total_seconds(self) -> float:
+        return self.total_samples / self.sample_rate
+
+    def segments(self) -> list[tuple[int, int]]:
+        """Речевые участки в отсчётах PCM."""
+        return [
+            (int(start) * self.frame_length, min(int(end) * self.frame_length, self.total_samples))
+            for start, end in zip(self.starts, self.ends)
+        ]
+
+
+def frame_features(pcm: np.ndarray, frame_length: int) -> tuple[np.ndarray, np.ndarray]:
+    """RMS-энергия и доля переходов через ноль по кадрам."""
+    framed = frame_signal(pcm, frame_length)
+    energy = np.sqrt(np.mean(framed * framed, axis=1))
+    signs = np.signbit(framed)
+    zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1) if frame_length > 1 else np.zeros(len(framed))
+    return energy, zcr
+
+
+def _runs(mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    padded = np.concatenate(([0], mask.astype(np.int8), [0]))
+    changes = np.flatnonzero(np.diff(padded))
+    return changes[0::2], changes[1::2]
+
+
+def detect_speech(
+    pcm: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    min_speech_seconds: float = 0.1,
+    hangover_seconds: float = 0.15,
+    min_gap_seconds: float = 0.2,
+) -> VadResult:
+    """Найти речевые участки записи."""
+    frame_length = int(FRAME_SECONDS * sample_rate)
+    energy, zcr = frame_features(pcm, frame_length)
+    empty = np.zeros(0, dtype=np.int64)
+    if len(energy) == 0:
+        return VadResult(empty, empty, frame_length, len(pcm), sample_rate)
+
+    # Пороги от уровня шума записи; для записей без пауз ограничены медианой и 90-м перцентилем
+    noise, median, loud = np.percentile(energy, [10, 50, 90])
+    low = max(MIN_SPEECH_ENERGY, min(noise * 2.5, median))
+    high = max(low * 1.5, min(noise * 5, loud))
+
+    weak = (energy > low) | ((zcr > FRICATIVE_ZCR) & (energy > noise * 1.5) & (energy > MIN_SPEECH_ENERGY))
+    strong = energy > high
+
+    # Гистерезис: участок weak засчитывается, если в нём есть кадр strong
+    starts, ends = _runs(weak)
+    strong_count = np.concatenate(([0], np.cumsum(strong)))
+    keep = (strong_count[ends] - strong_count[starts] > 0) & (
+        (ends - starts) * FRAME_SECONDS >= min_speech_seconds
+    )
+    starts, ends = starts[keep], ends[keep]
+    if len(starts) == 0:
+        return VadResult(empty, empty, frame_length, len(pcm), sample_rate)
+
+    # Хвост после речи и слияние участков с короткими паузами
+    ends = np.minimum(ends + int(hangover_seconds / FRAME_SECONDS), len(energy))
+    split = (starts[1:] - ends[:-1]) >= int(min_gap_seconds / FRAME_SECONDS)
+    starts = starts[np.concatenate(([True], split))]
+    ends = ends[np.concatenate((split, [True]))]
+    return VadResult(starts, ends, frame_length, len(pcm), sample_rate)
+
+
+def trim_silence(
+    pcm: np.ndarray,
+    result: VadResult,
+    max_pause_seconds: float = 0.5,
+    padding_seconds: float = 0.1,
+) -> np.ndarray:
+    """Убрать тишину в начале и конце, длинные паузы сократить до max_pause_seconds.
+
+    Паузы не удаляются совсем: по ним запись режется на фрагменты,
+    и распознавателю они нужны как границы фраз.
+    """
+    segments = result.segments()
+    if not segments:
+        return pcm[:0]
+
+    padding = int(padding_seconds * result.sample_rate)
+    max_pause = int(max_pause_seconds * result.sample_rate)
+    pieces = []
+    previous_end = None
+    for start, end in segments:
+        start = max(0, start - padding)
+        end = min(len(pcm), end + padding)
+        if previous_end is not None:
+            start = max(start, previous_end)
+            gap = start - previous_end
+            if gap > max_pause:
+                # Оставляем середину паузы длиной max_pause
+                middle = previous_end + gap // 2
+                pieces.append(pcm[middle - max_pause // 2:middle + max_pause - max_pause // 2])
+            else:
+                pieces.append(pcm[previous_end:start])
+        pieces.append(pcm[start:end])
+        previous_end = end
+    return np.concatenate(pieces)
@@ -0,0 +1,3 @@
+"""
+Бенчмарки и нагрузочные тесты (запуск: python -m app.benchmarks.<модуль>)
+"""
@@ -0,0 +1,232 @@
+"""
+Симуляция контроля допуска на всплеске нагрузки
+"""
+
+import argparse
+import heapq
+import math
+import random
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.benchmarks.common import add_output_argument, summarize, write_report
+from app.services.admission import AdmissionPolicy, AdmissionVerdict, QueueLoad
+
+ARRIVAL, RETRY, COMPLETE = 0, 1, 2
+
+
+@dataclass
+class Job:
+    job_id: int
+    is_free: bool
+    service_time: float
+    created_at: float
+    eta: Optional[float] = None
+    admitted_at: Optional[float] = None
+    attempts: int = 0
+
+
+@dataclass
+class SimulationResult:
+    paid_latency: list[float] = field(default_factory=list)
+    free_latency: list[float] = field(default_factory=list)
+    eta_error: list[float] = field(default_factory=list)
+    verdicts: dict[str, int] = field(default_factory=dict)
+    free_served: int = 0
+    free_abandoned: int = 0
+    max_queue: int = 0
+
+
+class QueueSimulation:
+    def __init__(
+        self,
+        policy: Optional[AdmissionPolicy],
+        workers: int,
+        window: float,
+        retry_delay: float,
+        retry_probability: float,
+        max_retries: int,
+        seed: int,
+    ):
+        self.policy = policy
+        self.workers = workers
+        self.window = window
+        self.retry_delay = retry_delay
+        self.retry_probability = retry_probability
+        self.max_retries = max_retries
+        self.rng = random.Random(seed)
+
+        self.queue: deque[Job] = deque()
+        self.busy = 0
+        self.in_flight = {True: 0, False: 0}
+        # (время завершения, длительность обработки) за скользящее окно
+        self.completions: deque[tuple[float, float]] = deque()
+        self.result = SimulationResult()
+
+    def _load(self, now: float) -> QueueLoad:
+        while self.completions and self.completions[0][0] < now - self.window:
+            self.completions.popleft()
+        processing = [duration for _, duration in self.completions]
+        return QueueLoad(
+            pending=len(self.queue),
+            in_flight_free=self.in_flight[True],
+            in_flight_paid=self.in_flight[False],
+            completed_in_window=len(processing),
+            window_seconds=self.window,
+            avg_processing_seconds=sum(processing) / len(processing) if processing else None,
+        )
+
+    def run(self, jobs: list[Job]) -> SimulationResult:
+        events: list[tuple[float, int, int, Job]] = []
+        sequence = 0
+        for job in jobs:
+            heapq.heappush(events, (job.created_at, sequence, ARRIVAL, job))
+            sequence += 1
+
+        while events:
+            now, _, kind, job = heapq.heappop(events)
+
+            if kind == COMPLETE:
+                self.busy -= 1
+                self.in_flight[job.is_free] -= 1
+                self.completions.append((now, job.service_time))
+                latency = now - job.admitted_at
+                if job.is_free:
+                    self.result.free_latency.append(latency)
+                    self.result.free_served += 1
+                else:
+                    self.result.paid_latency.append(latency)
+                if job.eta is not None:
+                    self.result.eta_error.append(job.eta - latency)
+            else:
+                job.attempts += 1
+                verdict = AdmissionVerdict.ADMIT
+                if self.policy:
+                    decision = self.policy.decide(self._load(now), job.is_free)
+                    verdict = decision.verdict
+                    job.eta = decision.eta_seconds
+                self.result.verdicts[verdict.value] = self.result.verdicts.get(verdict.value, 0) + 1
+
+                if verdict == AdmissionVerdict.ADMIT:
+                    job.admitted_at = now
+                    self.in_flight[job.is_free] += 1
+                    self.queue.append(job)
+                    self.result.max_queue = max(self.result.max_queue, len(self.queue))
+                elif (
+                    verdict == AdmissionVerdict.DEFER
+                    and job.attempts <= self.max_retries
+                    and self.rng.random() < self.retry_probability
+                ):
+                    heapq.heappush(events, (now + self.retry_delay, sequence, RETRY, job))
+                    sequence += 1
+                elif job.is_free:
+                    self.result.free_abandoned += 1
+
+            # Свободные воркеры забирают запросы из очереди
+            while self.busy < self.workers and self.queue:
+                started = self.queue.popleft()
+                self.busy += 1
+                heapq.heappush(events, (now + started.service_time, sequence, COMPLETE, started))
+                sequence += 1
+
+        return self.result
+
+
+def generate_jobs(
+    duration: float,
+    rate: float,
+    spike_start: float,
+    spike_length: float,
+    spike_factor: float,
+    free_share: float,
+    mean_service: float,
+    service_sigma: float,
+    seed: int,
+) -> list[Job]:
+    """Поток запросов: пуассоновские приходы, логнормальное время обработки."""
+    rng = random.Random(seed)
+    mu = math.log(mean_service) - service_sigma ** 2 / 2
+    jobs: list[Job] = []
+    now = 0.0
+    while True:
+        in_spike = spike_start <= now < spike_start + spike_length
+        now += rng.expovariate(rate * (spike_factor if in_spike else 1.0))
+        if now >= duration:
+            return jobs
+        jobs.append(Job(
+            job_id=len(jobs),
+            is_free=rng.random() < free_share,
+            service_time=rng.lognormvariate(mu, service_sigma),
+            created_at=now,
+        ))
+
+
+def _report(result: SimulationResult, jobs: list[Job]) -> dict:
+    free_total = sum(1 for job in jobs if job.is_free)
+    report = {
+        "paid_latency_s": summarize(result.paid_latency),
+        "free_latency_s": summarize(result.free_latency),
+        "free_requests": free_total,
+        "free_served": result.free_served,
+        "free_abandoned": result.free_abandoned,
+        "verdicts": result.verdicts,
+        "max_queue": result.max_queue,
+    }
+    if result.eta_error:
+        report["eta_error_s"] = summarize(result.eta_error)
+        report["eta_abs_error_s"] = summarize(abs(e) for e in result.eta_error)
+    return report
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Admission control queue simulation")
+    parser.add_argument("--duration", type=float, default=3600, help="Simulated seconds")
+    parser.add_argument("--rate", type=float, default=0.5, help="Base arrivals per second")
+    parser.add_argument("--spike-start", type=float, default=900)
+    parser.add_argument("--spike-length", type=float, default=600)
+    parser.add_argument("--spike-factor", type=float, default=6.0, help="Arrival rate multiplier in the spike")
+    parser.add_argument("--free-share", type=float, default=0.6, help="Share of free requests")
+    parser.add_argument("--workers", type=int, default=30, help="Concurrent recognition slots")
+    parser.add_argument("--mean-service", type=float, default=40.0, help="Mean processing time, seconds")
+    parser.add_argument("--service-sigma", type=float, default=0.5, help="Lognormal sigma of processing time")
+    parser.add_argument("--window", type=float, default=300, help="Throughput window, seconds")
+    parser.add_argument("--retry-delay", type=float, default=300, help="Deferred user retries after, seconds")
+    parser.add_argument("--retry-probability", type=float, default=0.5)
+    parser.add_argument("--max-retries", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    add_output_argument(parser)
+    args = parser.parse_args(argv)
+
+    jobs_args = dict(
+        duration=args.duration,
+        rate=args.rate,
+        spike_start=args.spike_start,
+        spike_length=args.spike_length,
+        spike_factor=args.spike_factor,
+        free_share=args.free_share,
+        mean_service=args.mean_service,
+        service_sigma=args.service_sigma,
+        seed=args.seed,
+    )
+    sim_args = dict(
+        workers=args.workers,
+        window=args.window,
+        retry_delay=args.retry_delay,
+        retry_probability=args.retry_probability,
+        max_retries=args.max_retries,
+        seed=args.seed,
+    )
+
+    report = {"parameters": vars(args)}
+    for name, policy in (("no_admission", None), ("admission", AdmissionPolicy.from_settings())):
+        # Каждый режим получает одинаковый поток запросов
+        jobs = generate_jobs(**jobs_args)
+        result = QueueSimulation(policy=policy, **sim_args).run(jobs)
+        report[name] = _report(result, jobs)
+
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Бенчмарк проверки качества записи
+"""
+
+import argparse
+import time
+from typing import Optional
+
+import numpy as np
+
+from app.audio import SAMPLE_RATE, QualityIssue, assess_quality
+from app.audio.quality import CLIP_LEVEL
+from app.benchmarks.common import add_output_argument, summarize, write_report
+from app.config import settings
+from app.testing.audio_samples import synthesize_voice_pcm
+
+
+def make_recordings(duration: float, count: int, seed: int) -> list[tuple[Optional[QualityIssue], np.ndarray]]:
+    """Записи с ожидаемой проблемой (None — нормальная речь)."""
+    noise = np.random.default_rng(seed)
+    recordings = []
+    for index in range(count):
+        speech = np.array(synthesize_voice_pcm(duration, seed=seed + index), dtype=np.int16)
+        recordings.append((None, speech))
+        silence = noise.normal(0, noise.uniform(2, 20), len(speech))
+        recordings.append((QualityIssue.SILENT, silence.astype(np.int16)))
+        loud = np.clip(speech.astype(np.float64) * 40, -32768, 32767)
+        recordings.append((QualityIssue.CLIPPED, loud.astype(np.int16)))
+    recordings.append((QualityIssue.BROKEN, np.zeros(0, dtype=np.int16)))
+    return recordings
+
+
+def full_scan(pcm: np.ndarray) -> tuple[float, float, float]:
+    """Те же показатели по всем отсчётам записи, для сравнения."""
+    magnitude = np.abs(pcm.astype(np.int32))
+    rms = float(np.sqrt(np.mean(np.square(magnitude, dtype=np.float64)))) if len(pcm) else 0.0
+    peak = float(magnitude.max()) if len(pcm) else 0.0
+    clipping = float(np.count_nonzero(magnitude >= CLIP_LEVEL)) / len(pcm) if len(pcm) else 0.0
+    return rms, peak, clipping
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Audio quality pre-check benchmark")
+    parser.add_argument("--durations", type=float, nargs="+", default=[5, 60, 600], help="Recording lengths in seconds")
+    parser.add_argument("--recordings", type=int, default=10, help="Recordings of each kind per length")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per recording")
+    parser.add_argument("--seed", type=int, default=42)
+    add_output_argument(parser)
+    args = parser.parse_args(argv)
+
+    report = {"durations": {}}
+    for duration in args.durations:
+        recordings = make_recordings(duration, args.recordings, args.seed)
+        sparse_ms, full_ms = [], []
+        correct = 0
+        for expected, pcm in recordings:
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                _, issue = assess_quality(pcm, settings.quality_min_rms_dbfs, settings.quality_max_clipping_ratio)
+            sparse_ms.append((time.perf_counter() - started) / args.repeat * 1000)
+
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                full_scan(pcm)
+            full_ms.append((time.perf_counter() - started) / args.repeat * 1000)
+            correct += issue == expected
+
+        report["durations"][str(duration)] = {
+            "recordings": len(recordings),
+            "check_ms": summarize(sparse_ms),
+            "full_scan_ms": summarize(full_ms),
+            "accuracy": correct / len(recordings),
+        }
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
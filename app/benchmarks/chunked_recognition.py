@@ -0,0 +1,92 @@
+"""
+Бенчмарк распознавания длинной записи по фрагментам
+"""
+
+import os
+
+# Дочерние процессы пула создают распознаватель по этим настройкам
+os.environ.setdefault("RECOGNIZER", "fake")
+os.environ.setdefault("FAKE_RECOGNIZER_MODE", "cpu")
+
+import argparse
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.audio import SAMPLE_RATE, decode_wav, split_on_silence
+from app.benchmarks.common import add_output_argument, write_report
+from app.recognition import ChunkedRecognizer, FakeRecognizer
+from app.testing.audio_samples import synthesize_voice_wav
+
+
+def _warm_up(pool: ProcessPoolExecutor, processes: int) -> None:
+    """Запустить все процессы пула до замера."""
+    list(pool.map(time.sleep, [0.05] * processes))
+
+
+async def _run_chunked(recognizer: ChunkedRecognizer, wav: bytes, duration: int) -> tuple[float, float]:
+    """Время до первого частичного результата и до итогового текста."""
+    started = time.perf_counter()
+    first_partial = None
+    async for _ in recognizer.recognize_stream(wav, duration):
+        if first_partial is None:
+            first_partial = time.perf_counter() - started
+    return first_partial or 0.0, time.perf_counter() - started
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Chunked parallel recognition benchmark")
+    parser.add_argument("--duration", type=int, default=300, help="Recording duration, seconds")
+    parser.add_argument("--cost", type=float, default=0.05, help="Fake recognizer CPU seconds per audio second")
+    parser.add_argument("--processes", default=f"1,2,4,{os.cpu_count()}", help="Comma-separated pool sizes")
+    parser.add_argument("--chunk-seconds", type=float, default=30.0)
+    parser.add_argument("--overlap", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+    add_output_argument(parser)
+    args = parser.parse_args(argv)
+
+    os.environ["FAKE_RECOGNIZER_COST"] = str(args.cost)
+    wav = synthesize_voice_wav(args.duration, seed=args.seed)
+    pcm = decode_wav(wav)
+
+    chunks = split_on_silence(
+        pcm, SAMPLE_RATE, max_chunk_seconds=args.chunk_seconds, overlap_seconds=args.overlap
+    )
+    inner = FakeRecognizer(cost_per_second=args.cost, mode="cpu")
+
+    started = time.perf_counter()
+    inner.recognize_pcm(pcm, SAMPLE_RATE)
+    baseline = time.perf_counter() - started
+
+    report = {
+        "duration_seconds": args.duration,
+        "cost_per_second": args.cost,
+        "chunks": {
+            "count": len(chunks),
+            "durations_s": [round(chunk.duration(), 2) for chunk in chunks],
+            "hard_cuts": sum(chunk.overlaps_previous for chunk in chunks),
+            "audio_overhead_s": round(sum(chunk.duration() for chunk in chunks) - len(pcm) / SAMPLE_RATE, 2),
+        },
+        "whole_seconds": baseline,
+        "chunked": {},
+    }
+
+    for processes in (int(value) for value in args.processes.split(",")):
+        with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn")) as pool:
+            _warm_up(pool, processes)
+            recognizer = ChunkedRecognizer(inner, args.chunk_seconds, args.overlap, executor=pool)
+            first_partial, elapsed = asyncio.run(_run_chunked(recognizer, wav, args.duration))
+        report["chunked"][str(processes)] = {
+            "seconds": elapsed,
+            "first_partial_seconds": first_partial,
+            "speedup": baseline / elapsed,
+            "efficiency": baseline / elapsed / min(processes, len(chunks)),
+        }
+
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Общие функции для бенчмарков
+"""
+
+import json
+import math
+import resource
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.monitoring.metrics import stage_durations
+
+DEFAULT_PERCENTILES = (50, 90, 95, 99)
+
+# Счётчик SQL-выражений текущего контекста (None — не считаем)
+_statement_counter: ContextVar[Optional[list[int]]] = ContextVar("statement_counter", default=None)
+# Журнал SQL-выражений текущего контекста: (statement, parameters)
+_statement_log: ContextVar[Optional[list[tuple[str, Any]]]] = ContextVar("statement_log", default=None)
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Перцентиль с линейной интерполяцией по отсортированным значениям."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return sorted_values[lower]
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def summarize(values: Iterable[float], percentiles: Sequence[int] = DEFAULT_PERCENTILES) -> dict:
+    """Сводка по выборке: count, mean, max и перцентили (в тех же единицах)."""
+    ordered = sorted(values)
+    if not ordered:
+        return {"count": 0}
+
+    summary = {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "max": ordered[-1],
+    }
+    for q in percentiles:
+        summary[f"p{q}"] = percentile(ordered, q)
+    return summary
+
+
+def write_report(report: dict, output: Optional[str]) -> None:
+    """Вывести отчёт в stdout и, если указан путь, сохранить в JSON."""
+    text = json.dumps(report, ensure_ascii=False, indent=2, default=str)
+    print(text)
+    if output:
+        Path(output).write_text(text, encoding="utf-8")
+
+
+def add_output_argument(parser: Any) -> None:
+    parser.add_argument("--output", help="Path to save the JSON report")
+
+
+def install_statement_counter(engine: AsyncEngine) -> None:
+    """Считать SQL-выражения движка в count_statements() и писать в capture_statements()."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count_statement(conn, cursor, statement, parameters, context, executemany):
+        counter = _statement_counter.get()
+        if counter is not None:
+            counter[0] += 1
+        log = _statement_log.get()
+        if log is not None:
+            log.append((statement, parameters))
+
+
+@contextmanager
+def count_statements() -> Iterator[list[int]]:
+    """Счётчик SQL-выражений, выполненных в текущем контексте; значение в [0]."""
+    counter = [0]
+    token = _statement_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _statement_counter.reset(token)
+
+
+@contextmanager
+def capture_statements() -> Iterator[list[tuple[str, Any]]]:
+    """Журнал SQL-выражений (statement, parameters), выполненных в текущем контексте."""
+    log: list[tuple[str, Any]] = []
+    token = _statement_log.set(log)
+    try:
+        yield log
+    finally:
+        _statement_log.reset(token)
+
+
+@contextmanager
+def collect_stages() -> Iterator[dict[str, list[float]]]:
+    """Длительности этапов track_stage() и ожидания в очереди в текущем контексте."""
+    collector: dict[str, list[float]] = {}
+    token = stage_durations.set(collector)
+    try:
+        yield collector
+    finally:
+        stage_durations.reset(token)
+
+
+def peak_rss_mb() -> float:
+    """Пиковый RSS процесса в мегабайтах."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux отдаёт килобайты, macOS — байты
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return peak / divisor
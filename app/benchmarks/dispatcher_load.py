@@ -0,0 +1,232 @@
+"""
+Нагрузочный тест стека middleware и обработчиков бота
+"""
+
+import os
+
+# Задачи публикуются в in-memory брокер, RabbitMQ не нужен
+os.environ.setdefault("TASK_BROKER", "memory")
+
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.types import Update
+
+from app.benchmarks.common import (
+    add_output_argument, count_statements, install_statement_counter, summarize, write_report
+)
+from app.database.engine import db_manager
+from app.main import setup_bot
+from app.services.catalog import get_catalog
+from app.tasks.broker import broker
+from app.testing.bot_session import FakeBotSession
+
+
+class UpdateFactory:
+    """Построение синтетических апдейтов в формате Bot API."""
+
+    def __init__(self, bot: Bot):
+        self.bot = bot
+        self._update_ids = itertools.count(1)
+        self._message_ids = itertools.count(1)
+
+    @staticmethod
+    def _user(telegram_id: int) -> dict:
+        return {
+            "id": telegram_id,
+            "is_bot": False,
+            "first_name": f"Load{telegram_id}",
+            "username": f"load_{telegram_id}",
+            "language_code": "ru",
+        }
+
+    def _message(self, telegram_id: int, **fields: Any) -> dict:
+        return {
+            "message_id": next(self._message_ids),
+            "date": int(datetime.now().timestamp()),
+            "chat": {"id": telegram_id, "type": "private"},
+            "from": self._user(telegram_id),
+            **fields,
+        }
+
+    def _build(self, payload: dict) -> Update:
+        payload["update_id"] = next(self._update_ids)
+        return Update.model_validate(payload, context={"bot": self.bot})
+
+    def command(self, telegram_id: int, command: str) -> Update:
+        text = f"/{command}"
+        return self._build({"message": self._message(
+            telegram_id,
+            text=text,
+            entities=[{"type": "bot_command", "offset": 0, "length": len(text)}],
+        )})
+
+    def callback(self, telegram_id: int, data: str) -> Update:
+        bot_message = self._message(telegram_id, text="menu")
+        bot_message["from"] = {"id": self.bot.id, "is_bot": True, "first_name": "Bot"}
+        return self._build({"callback_query": {
+            "id": str(next(self._update_ids)),
+            "from": self._user(telegram_id),
+            "chat_instance": str(telegram_id),
+            "message": bot_message,
+            "data": data,
+        }})
+
+    def voice(self, telegram_id: int, duration: int) -> Update:
+        return self._build({"message": self._message(
+            telegram_id,
+            voice={
+                "file_id": f"voice_{telegram_id}_{duration}",
+                "file_unique_id": f"uvoice_{telegram_id}",
+                "duration": duration,
+                "mime_type": "audio/ogg",
+                "file_size": duration * 2000,
+            },
+        )})
+
+
+def build_flow(factory: UpdateFactory, telegram_id: int, rng: random.Random) -> list[tuple[str, Update]]:
+    """Сценарий пользователя: (шаг, апдейт)."""
+    catalog = get_catalog()
+    category = rng.choice(list(catalog.categories.values()))
+    service = rng.choice(category.subcategories)
+    # Длительности голосовых смещены к коротким, как в реальном трафике
+    duration = min(int(rng.lognormvariate(2.7, 0.9)) + 1, service.max_duration)
+
+    return [
+        ("start", factory.command(telegram_id, "start")),
+        ("service_start", factory.callback(telegram_id, "service_start")),
+        ("category", factory.callback(telegram_id, f"category_{category.category.value}")),
+        ("subcategory", factory.callback(telegram_id, f"subcategory_{service.subcategory.value}")),
+        ("voice", factory.voice(telegram_id, duration)),
+    ]
+
+
+class LoadResult:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statements: dict[str, list[int]] = defaultdict(list)
+        self.unhandled: dict[str, int] = defaultdict(int)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    def record(self, step: str, latency: float, statements: int, handled: bool) -> None:
+        self.latencies[step].append(latency)
+        self.statements[step].append(statements)
+        if not handled:
+            self.unhandled[step] += 1
+
+
+async def run_user(
+    dp: Dispatcher,
+    bot: Bot,
+    flow: list[tuple[str, Update]],
+    think_time: float,
+    result: LoadResult,
+) -> None:
+    for step, update in flow:
+        with count_statements() as counter:
+            started = time.perf_counter()
+            try:
+                response = await dp.feed_update(bot, update)
+            except Exception:
+                result.errors[step] += 1
+                continue
+            latency = time.perf_counter() - started
+        result.record(step, latency, counter[0], response is not UNHANDLED)
+        # Пауза больше лимита ThrottlingMiddleware, иначе апдейты отбрасываются
+        await asyncio.sleep(think_time)
+
+
+async def run_load(
+    users: int,
+    concurrency: int,
+    think_time: float,
+    ramp_up: float,
+    bot_latency: float,
+    user_id_base: int,
+    seed: int,
+) -> dict:
+    db_manager.init_engine()
+    install_statement_counter(db_manager.engine)
+    await broker.startup()
+
+    session = FakeBotSession(latency=bot_latency)
+    bot, dp = await setup_bot(session=session)
+    factory = UpdateFactory(bot)
+    rng = random.Random(seed)
+    result = LoadResult()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def simulated_user(index: int) -> None:
+        await asyncio.sleep(ramp_up * index / max(users, 1))
+        async with semaphore:
+            flow = build_flow(factory, user_id_base + index, rng)
+            await run_user(dp, bot, flow, think_time, result)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(simulated_user(i) for i in range(users)))
+    finally:
+        elapsed = time.perf_counter() - started
+        await broker.shutdown()
+        await db_manager.close()
+
+    total_updates = sum(len(values) for values in result.latencies.values())
+    all_statements = [n for values in result.statements.values() for n in values]
+
+    return {
+        "users": users,
+        "concurrency": concurrency,
+        "elapsed_seconds": elapsed,
+        "updates": total_updates,
+        "updates_per_second": total_updates / elapsed if elapsed else 0.0,
+        "latency_ms": summarize(v * 1000 for values in result.latencies.values() for v in values),
+        "latency_ms_by_step": {
+            step: summarize(v * 1000 for v in values) for step, values in result.latencies.items()
+        },
+        "db_statements_per_update": summarize(all_statements),
+        "db_statements_by_step": {
+            step: summarize(values) for step, values in result.statements.items()
+        },
+        "unhandled": dict(result.unhandled),
+        "errors": dict(result.errors),
+        "bot_api_calls": dict(session.calls),
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Load test for the bot dispatcher stack")
+    parser.add_argument("--users", type=int, default=1000, help="Simulated users")
+    parser.add_argument("--concurrency", type=int, default=100, help="Users active at the same time")
+    parser.add_argument("--think-time", type=float, default=0.6,
+                        help="Pause between a user's steps (must exceed the throttling limit)")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="Seconds to start all users")
+    parser.add_argument("--bot-latency", type=float, default=0.0, help="Fake Bot API latency, seconds")
+    parser.add_argument("--user-id-base", type=int, default=int(time.time()) * 1000,
+                        help="First simulated telegram_id; new base means fresh users")
+    parser.add_argument("--seed", type=int, default=42)
+    add_output_argument(parser)
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_load(
+        users=args.users,
+        concurrency=args.concurrency,
+        think_time=args.think_time,
+        ramp_up=args.ramp_up,
+        bot_latency=args.bot_latency,
+        user_id_base=args.user_id_base,
+        seed=args.seed,
+    ))
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
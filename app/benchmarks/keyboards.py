@@ -0,0 +1,90 @@
+"""
+Микробенчмарк построения inline-клавиатур
+"""
+
+import argparse
+import time
+import tracemalloc
+from decimal import Decimal
+from typing import Callable, Optional
+
+from app.benchmarks.common import add_output_argument, write_report
+from app.bot.keyboards import inline
+from app.database.models import ServiceCategory
+from app.services.catalog import get_catalog
+
+AMOUNT = Decimal("500")
+
+# (клавиатура, сборка на каждый вызов, закэшированная)
+CASES: list[tuple[str, Callable, Callable]] = [
+    ("main_menu", inline._build_main_menu_keyboard, inline.get_main_menu_keyboard),
+    (
+        "service_categories",
+        lambda: inline._build_service_categories_keyboard(get_catalog()),
+        inline.get_service_categories_keyboard,
+    ),
+    (
+        "service_subcategories",
+        lambda: inline._build_service_subcategories_keyboard(get_catalog(), ServiceCategory.BUSINESS),
+        lambda: inline.get_service_subcategories_keyboard(ServiceCategory.BUSINESS),
+    ),
+    ("payment_amounts", inline._build_payment_amounts_keyboard, inline.get_payment_amounts_keyboard),
+    (
+        "payment_methods",
+        lambda: inline._build_payment_methods_keyboard(AMOUNT),
+        lambda: inline.get_payment_methods_keyboard(AMOUNT),
+    ),
+    (
+        "balance",
+        lambda: inline._build_balance_keyboard(AMOUNT),
+        lambda: inline.get_balance_keyboard(AMOUNT),
+    ),
+]
+
+
+def measure_time(func: Callable, calls: int) -> float:
+    """Среднее время вызова, микросекунды."""
+    started = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def measure_allocations(func: Callable, calls: int) -> float:
+    """Байт, выделенных и удерживаемых результатом, на один вызов."""
+    results = []
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(calls):
+        results.append(func())
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # Сам список результатов одинаков для обоих вариантов и не вычитается
+    return allocated / calls
+
+
+def run(calls: int) -> dict:
+    inline.rebuild_keyboards()
+    results = {}
+    for name, build, cached in CASES:
+        results[name] = {
+            "build_us": measure_time(build, calls),
+            "cached_us": measure_time(cached, calls),
+            "build_bytes": measure_allocations(build, calls),
+            "cached_bytes": measure_allocations(cached, calls),
+        }
+    return {"calls": calls, "keyboards": results}
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Per-call cost of inline keyboards, built vs cached")
+    parser.add_argument("--calls", type=int, default=10000)
+    add_output_argument(parser)
+    args = parser.parse_args(argv)
+    write_report(run(args.calls), args.output)
+
+
+if __name__ == "__main__":
+    main()
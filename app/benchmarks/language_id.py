@@ -0,0 +1,92 @@
+"""
+Бенчмарк определения языка по тексту первого прохода
+"""
+
+import argparse
+import time
+from typing import Optional
+
+from app.benchmarks.common import add_output_argument, write_report
+from app.config import settings
+from app.recognition.language import LANGUAGES, identify_text
+
+PHRASES = {
+    "ru": (
+        "Привет, как дела? Хотел обсудить новый проект и сроки на следующей неделе.",
+        "Нужно организовать встречу с клиентом, если он сможет приехать в пятницу.",
+        "Расскажи мне, что ты думаешь об этом договоре и какие там риски.",
+        "Я отправил документы вчера вечером, но ответа пока нет.",
+    ),
+    "uk": (
+        "Привіт, як справи? Хотів обговорити новий проєкт і терміни на наступному тижні.",
+        "Треба організувати зустріч з клієнтом, якщо він зможе приїхати в п'ятницю.",
+        "Розкажи мені, що ти думаєш про цей договір і які там ризики.",
+        "Я надіслав документи вчора ввечері, але відповіді поки що немає.",
+    ),
+    "be": (
+        "Прывітанне, як справы? Хацеў абмеркаваць новы праект і тэрміны на наступным тыдні.",
+        "Трэба арганізаваць сустрэчу з кліентам, калі ён зможа прыехаць у пятніцу.",
+        "Раскажы мне, што ты думаеш пра гэта дамову і якія там рызыкі.",
+        "Я адправіў дакументы ўчора ўвечары, але адказу пакуль няма.",
+    ),
+    "kk": (
+        "Сәлем, қалайсың? Жаңа жоба мен келесі аптадағы мерзімдерді талқылағым келеді.",
+        "Клиентпен кездесу ұйымдастыру керек, егер ол жұмада келе алса.",
+        "Бұл келісім туралы не ойлайтыныңды және қандай тәуекелдер бар екенін айт.",
+        "Мен құжаттарды кеше кешке жібердім, бірақ әлі жауап жоқ.",
+    ),
+    "en": (
+        "Hi, how are you? I wanted to discuss the new project and the deadlines for next week.",
+        "We need to set up a meeting with the client if he can come on Friday.",
+        "Tell me what you think of this contract and what the risks are.",
+        "I sent the documents last night, but there is no answer yet.",
+    ),
+    "de": (
+        "Hallo, wie geht es dir? Ich wollte das neue Projekt und die Fristen für nächste Woche besprechen.",
+        "Wir müssen ein Treffen mit dem Kunden organisieren, wenn er am Freitag kommen kann.",
+        "Sag mir, was du von diesem Vertrag hältst und welche Risiken es gibt.",
+        "Ich habe die Unterlagen gestern Abend geschickt, aber es gibt noch keine Antwort.",
+    ),
+}
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Language identification benchmark")
+    parser.add_argument("--words", type=int, nargs="+", default=[3, 5, 10], help="Words of the first-pass transcript")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed runs per text")
+    add_output_argument(parser)
+    args = parser.parse_args(argv)
+
+    report = {"languages": sorted(LANGUAGES), "lengths": {}}
+    for words in args.words:
+        samples = [
+            (language, " ".join(phrase.split()[:words]))
+            for language, phrases in PHRASES.items()
+            for phrase in phrases
+        ]
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            guesses = [identify_text(text) for _, text in samples]
+        elapsed = (time.perf_counter() - started) / args.repeat
+
+        correct = unsure = 0
+        errors = []
+        for (language, text), guess in zip(samples, guesses):
+            if guess is None or guess.confidence < settings.language_id_min_confidence:
+                unsure += 1
+            elif guess.language == language:
+                correct += 1
+            else:
+                errors.append({"expected": language, "guess": guess.language, "text": text})
+        report["lengths"][str(words)] = {
+            "texts": len(samples),
+            "accuracy": correct / len(samples),
+            "unsure": unsure / len(samples),
+            "us_per_text": elapsed / len(samples) * 1e6,
+            "errors": errors,
+        }
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
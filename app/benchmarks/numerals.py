@@ -0,0 +1,144 @@
+"""
+Бенчмарк разбора чисел, записанных словами
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import Optional
+
+from app.benchmarks.common import add_output_argument, write_report
+from app.recognition.mock import MOCK_TEXTS
+from app.text.numerals import (
+    GENITIVE_PREFIXES, HUNDREDS, LEXICON, ORDINAL_STEMS, TEENS, TENS, UNITS, find_numbers,
+)
+
+SCALE_FORMS = {
+    1000: ("тысяча", "тысячи", "тысяч"),
+    10 ** 6: ("миллион", "миллиона", "миллионов"),
+    10 ** 9: ("миллиард", "миллиарда", "миллиардов"),
+}
+
+FILLER = [
+    word for word in re.findall(r"[а-яё]+", " ".join(MOCK_TEXTS).lower())
+    if word not in LEXICON
+]
+
+
+def _plural(count: int, forms: tuple[str, str, str]) -> str:
+    if count % 100 in range(11, 15):
+        return forms[2]
+    if count % 10 == 1:
+        return forms[0]
+    if count % 10 in (2, 3, 4):
+        return forms[1]
+    return forms[2]
+
+
+def _group_words(value: int, feminine: bool = False) -> list[str]:
+    """Слова для числа 1-999 в именительном падеже."""
+    words = []
+    hundreds, rest = divmod(value, 100)
+    if hundreds == 1:
+        words.append("сто")
+    elif hundreds:
+        words.append(HUNDREDS[hundreds][0])
+    if 10 <= rest < 20:
+        words.append(TEENS[rest])
+        return words
+    tens, units = divmod(rest, 10)
+    if tens:
+        words.append(TENS[tens * 10][0])
+    if units:
+        if feminine and units in (1, 2):
+            words.append("одна" if units == 1 else "две")
+        else:
+            words.append(UNITS[units][0])
+    return words
+
+
+def to_words(value: int) -> list[str]:
+    if value == 0:
+        return ["ноль"]
+    words = []
+    for scale in sorted(SCALE_FORMS, reverse=True):
+        count, value = divmod(value, scale)
+        if count:
+            words += _group_words(count, feminine=scale == 1000) + [_plural(count, SCALE_FORMS[scale])]
+    return words + _group_words(value)
+
+
+def _ordinal_word(value: int) -> str:
+    if value in ORDINAL_STEMS:
+        stem, ending = ORDINAL_STEMS[value]
+        return stem + ending
+    return GENITIVE_PREFIXES[value // 100] + "сотый"
+
+
+def to_ordinal_words(value: int) -> list[str]:
+    """Порядковое числительное: меняется только последнее слово."""
+    words = to_words(value)
+    if value % 10:
+        last = value % 10 if value % 100 >= 20 or value % 100 < 10 else value % 100
+    elif value % 100:
+        last = value % 100
+    else:
+        last = value % 1000
+    return words[:-1] + [_ordinal_word(last)]
+
+
+def random_value(rng: random.Random) -> int:
+    magnitude = rng.choice((10, 100, 1000, 10 ** 6, 10 ** 9, 10 ** 12))
+    return rng.randrange(magnitude)
+
+
+def make_transcript(words: int, rng: random.Random) -> tuple[str, list[int]]:
+    parts: list[str] = []
+    expected: list[int] = []
+    while len(parts) < words:
+        parts += rng.sample(FILLER, rng.randint(1, 4))
+        value = random_value(rng)
+        # Порядковые — для чисел, не кратных тысяче
+        if value % 1000 and rng.random() < 0.3:
+            parts += to_ordinal_words(value)
+        else:
+            parts += to_words(value)
+        expected.append(value)
+    return " ".join(parts), expected
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Russian number word parsing benchmark")
+    parser.add_argument("--words", type=int, nargs="+", default=[1000, 10000, 100000], help="Transcript lengths in words")
+    parser.add_argument("--transcripts", type=int, default=5, help="Transcripts per length")
+    parser.add_argument("--seed", type=int, default=42)
+    add_output_argument(parser)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    report = {"lexicon_forms": len(LEXICON), "lengths": {}}
+    for words in args.words:
+        transcripts = [make_transcript(words, rng) for _ in range(args.transcripts)]
+        total_words = sum(len(text.split()) for text, _ in transcripts)
+
+        started = time.perf_counter()
+        found = [find_numbers(text) for text, _ in transcripts]
+        elapsed = time.perf_counter() - started
+
+        numbers = correct = 0
+        for spans, (_, expected) in zip(found, transcripts):
+            numbers += len(expected)
+            correct += sum(span.value == value for span, value in zip(spans, expected))
+        report["lengths"][str(words)] = {
+            "seconds": elapsed,
+            "words_per_second": total_words / elapsed if elapsed else 0.0,
+            "ns_per_word": elapsed / total_words * 1e9 if total_words else 0.0,
+            "numbers": numbers,
+            "accuracy": correct / numbers if numbers else 1.0,
+        }
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Бенчмарк поиска телефонных номеров
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import Optional
+
+from app.benchmarks.common import add_output_argument, write_report
+from app.recognition.mock import MOCK_TEXTS
+from app.text.phones import extract_phones, extract_phones_batch
+
+LEGACY_PATTERN = re.compile(r"\d[\d\-\(\)\s]{7,}")
+
+DIGIT_WORDS = ("ноль", "один", "два", "три", "четыре", "пять", "шесть", "семь", "восемь", "девять")
+
+# Фразы без цифр: номера в корпусе — только сгенерированные
+FILLER = tuple(text for text in MOCK_TEXTS if not any(char.isdigit() for char in text))
+
+DISTRACTORS = (
+    "Встреча {day:02d}.{month:02d}.2024 в {hour}:30.",
+    "Сумма {amount} рублей, скидка {percent}%.",
+    "Продажи за неделю: {a}, {b}, {c} и {d}.",
+    "Квартира {flat}, дом {house}, индекс {index}.",
+)
+
+
+def _random_phone(rng: random.Random) -> tuple[str, str]:
+    """Номер в случайной записи и его E.164."""
+    code = rng.choice(("912", "903", "916", "800", "495", "812"))
+    rest = f"{rng.randrange(10 ** 7):07d}"
+    e164 = f"+7{code}{rest}"
+    style = rng.randrange(6)
+    if style == 0:
+        return f"+7 ({code}) {rest[:3]}-{rest[3:5]}-{rest[5:]}", e164
+    if style == 1:
+        return f"8-{code}-{rest[:3]}-{rest[3:5]}-{rest[5:]}", e164
+    if style == 2:
+        return f"8{code}{rest}", e164
+    if style == 3:
+        return " ".join(DIGIT_WORDS[int(digit)] for digit in "8" + code + rest), e164
+    if style == 4:
+        # Мобильный без кода страны
+        return f"9{code[1:]} {rest[:3]} {rest[3:5]} {rest[5:]}", f"+79{code[1:]}{rest}"
+    number = f"{rng.randrange(1, 10)}{rng.randrange(10 ** 9):09d}"
+    return f"+44 {number[:2]} {number[2:6]} {number[6:]}", f"+44{number}"
+
+
+def make_corpus(count: int, seed: int) -> tuple[list[str], list[set[str]]]:
+    rng = random.Random(seed)
+    texts, expected = [], []
+    for _ in range(count):
+        parts = [rng.choice(FILLER)]
+        phones = set()
+        for _ in range(rng.choice((0, 1, 1, 2, 3))):
+            phone, e164 = _random_phone(rng)
+            phones.add(e164)
+            parts.append(f"Мой номер {phone}.")
+        if rng.random() < 0.5:
+            parts.append(rng.choice(DISTRACTORS).format(
+                day=rng.randint(1, 28), month=rng.randint(1, 12), hour=rng.randint(8, 20),
+                amount=rng.randint(100, 99999), percent=rng.randint(1, 50),
+                a=rng.randint(50, 500), b=rng.randint(50, 500), c=rng.randint(50, 500), d=rng.randint(50, 500),
+                flat=rng.randint(1, 300), house=rng.randint(1, 150), index=rng.randint(100000, 999999),
+            ))
+        rng.shuffle(parts)
+        texts.append(" ".join(parts))
+        expected.append(phones)
+    return texts, expected
+
+
+def _throughput(elapsed: float, texts: list[str]) -> dict:
+    chars = sum(map(len, texts))
+    return {
+        "seconds": elapsed,
+        "texts_per_second": len(texts) / elapsed if elapsed else 0.0,
+        "mb_per_second": chars * 2 / 1e6 / elapsed if elapsed else 0.0,
+    }
+
+
+def _accuracy(found: list[list], expected: list[set[str]]) -> dict:
+    true_positive = false_positive = false_negative = 0
+    for phones, wanted in zip(found, expected):
+        got = {phone.e164 for phone in phones}
+        true_positive += len(got & wanted)
+        false_positive += len(got - wanted)
+        false_negative += len(wanted - got)
+    return {
+        "precision": true_positive / (true_positive + false_positive) if true_positive + false_positive else 1.0,
+        "recall": true_positive / (true_positive + false_negative) if true_positive + false_negative else 1.0,
+        "false_positives": false_positive,
+        "missed": false_negative,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Phone number extraction benchmark")
+    parser.add_argument("--transcripts", type=int, default=100000, help="Synthetic transcripts")
+    parser.add_argument("--batch-size", type=int, default=256, help="Transcripts per extract_phones_batch call")
+    parser.add_argument("--seed", type=int, default=42)
+    add_output_argument(parser)
+    args = parser.parse_args(argv)
+
+    texts, expected = make_corpus(args.transcripts, args.seed)
+
+    started = time.perf_counter()
+    legacy_matches = sum(len(LEGACY_PATTERN.findall(text)) for text in texts)
+    legacy = _throughput(time.perf_counter() - started, texts)
+
+    started = time.perf_counter()
+    single = [extract_phones(text) for text in texts]
+    single_report = _throughput(time.perf_counter() - started, texts)
+
+    started = time.perf_counter()
+    batched = []
+    for offset in range(0, len(texts), args.batch_size):
+        batched.extend(extract_phones_batch(texts[offset:offset + args.batch_size]))
+    batch_report = _throughput(time.perf_counter() - started, texts)
+
+    write_report({
+        "transcripts": len(texts),
+        "phones": sum(map(len, expected)),
+        "legacy_findall": {**legacy, "raw_matches": legacy_matches},
+        "extract_phones": {**single_report, **_accuracy(single, expected)},
+        "extract_phones_batch": {
+            **batch_report, **_accuracy(batched, expected), "batch_size": args.batch_size,
+            "same_as_single": batched == single,
+        },
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Бенчмарк обработчиков подкатегорий
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Optional
+
+from app.benchmarks.common import add_output_argument, summarize, write_report
+from app.executors import shutdown_process_pool
+from app.processors import get_processor, registered_keys, run_processor
+from app.processors.registry import _registry
+from app.recognition.mock import MOCK_TEXTS
+
+# Фразы с числами и выражениями для обработчиков категории «Числа»
+NUMERIC_TEXTS = (
+    "Продажи за неделю: 120, 140, 95, 180 и 133.",
+    "Посчитай 1250 * 12 и 640 / 8, а потом 17,5 + 2,5.",
+    "Позвони мне по номеру +7 (912) 345-67-89 или 8 800 555 35 35.",
+    "Доехать от вокзала до офиса: 3 остановки на трамвае и 600 метров пешком.",
+)
+
+
+def make_transcripts(count: int, sentences: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    pool = MOCK_TEXTS + NUMERIC_TEXTS
+    return [" ".join(rng.choice(pool) for _ in range(sentences)) for _ in range(count)]
+
+
+def _micros(values: list[float]) -> dict:
+    return summarize(v * 1e6 for v in values)
+
+
+async def bench_processor(key: str, transcripts: list[str], repeat: int) -> dict:
+    setup_started = time.perf_counter()
+    processor = _registry[key]()
+    processor.setup()
+    setup_seconds = time.perf_counter() - setup_started
+
+    direct = []
+    for index in range(repeat):
+        text = transcripts[index % len(transcripts)]
+        started = time.perf_counter()
+        processor.process(text)
+        direct.append(time.perf_counter() - started)
+
+    # Прогрев: экземпляр процесса и дочерние процессы пула
+    await run_processor(key, transcripts[0])
+    dispatched = []
+    for index in range(repeat):
+        text = transcripts[index % len(transcripts)]
+        started = time.perf_counter()
+        await run_processor(key, text)
+        dispatched.append(time.perf_counter() - started)
+
+    return {
+        "profile": get_processor(key).profile.value,
+        "version": processor.version,
+        "setup_ms": setup_seconds * 1e3,
+        "process_us": _micros(direct),
+        "run_processor_us": _micros(dispatched),
+        "texts_per_second": repeat / sum(direct) if sum(direct) else 0.0,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    transcripts = make_transcripts(args.transcripts, args.transcript_sentences, args.seed)
+    keys = args.processors or registered_keys()
+    try:
+        results = {key: await bench_processor(key, transcripts, args.repeat) for key in keys}
+    finally:
+        shutdown_process_pool()
+    return {
+        "transcripts": len(transcripts),
+        "avg_transcript_chars": sum(map(len, transcripts)) / len(transcripts),
+        "repeat": args.repeat,
+        "processors": results,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Subcategory processor benchmark")
+    parser.add_argument("--processors", nargs="*", help="Processor keys (default: all registered)")
+    parser.add_argument("--transcripts", type=int, default=50, help="Synthetic transcripts")
+    parser.add_argument("--transcript-sentences", type=int, default=5, help="Sentences per transcript")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed calls per processor")
+    parser.add_argument("--seed", type=int, default=42)
+    add_output_argument(parser)
+    args = parser.parse_args(argv)
+
+    write_report(asyncio.run(run(args)), args.output)
+
+
+if __name__ == "__main__":
+    main()
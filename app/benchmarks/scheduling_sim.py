@@ -0,0 +1,187 @@
+"""
+Симуляция планирования задач распознавания: FIFO против SJF со старением
+"""
+
+import argparse
+import heapq
+import math
+import random
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Optional
+
+from app.benchmarks.common import add_output_argument, summarize, write_report
+from app.config import settings
+from app.tasks.scheduling import SchedulingPolicy
+
+ARRIVAL, COMPLETE, SWEEP = 0, 1, 2
+
+
+@dataclass
+class Job:
+    job_id: int
+    duration: int
+    service_time: float
+    arrived_at: float
+    priority: int = 0
+
+
+def generate_jobs(
+    count: int,
+    workers: int,
+    utilization: float,
+    median_duration: float,
+    duration_sigma: float,
+    max_duration: int,
+    overhead: float,
+    cost_per_second: float,
+    seed: int,
+) -> list[Job]:
+    """Поток запросов с интенсивностью, дающей заданную загрузку воркеров."""
+    rng = random.Random(seed)
+    durations = [
+        min(max_duration, max(1, int(rng.lognormvariate(math.log(median_duration), duration_sigma))))
+        for _ in range(count)
+    ]
+    service_times = [overhead + cost_per_second * duration for duration in durations]
+    rate = utilization * workers / (sum(service_times) / count)
+
+    jobs = []
+    now = 0.0
+    for index, (duration, service_time) in enumerate(zip(durations, service_times)):
+        now += rng.expovariate(rate)
+        jobs.append(Job(job_id=index, duration=duration, service_time=service_time, arrived_at=now))
+    return jobs
+
+
+def simulate(
+    jobs: list[Job],
+    workers: int,
+    policy: Optional[SchedulingPolicy],
+    aging: bool,
+    sweep_interval: float,
+) -> list[tuple[Job, float]]:
+    """Прогнать поток; вернуть (задача, время от поступления до завершения)."""
+    # Очередь по уровням приоритета, внутри уровня — FIFO, как в RabbitMQ
+    levels: dict[int, deque[Job]] = defaultdict(deque)
+    events: list[tuple[float, int, int, Optional[Job]]] = []
+    sequence = 0
+
+    def push(at: float, kind: int, job: Optional[Job]) -> None:
+        nonlocal sequence
+        heapq.heappush(events, (at, sequence, kind, job))
+        sequence += 1
+
+    for job in jobs:
+        job.priority = policy.priority(job.duration) if policy else 0
+        push(job.arrived_at, ARRIVAL, job)
+    if policy and aging:
+        push(sweep_interval, SWEEP, None)
+
+    busy = 0
+    remaining = len(jobs)
+    results: list[tuple[Job, float]] = []
+
+    while events and remaining:
+        now, _, kind, job = heapq.heappop(events)
+
+        if kind == ARRIVAL:
+            levels[job.priority].append(job)
+        elif kind == COMPLETE:
+            busy -= 1
+            remaining -= 1
+            results.append((job, now - job.arrived_at))
+        else:
+            # Старение: зависшие запросы переходят на наивысший уровень
+            for priority in list(levels):
+                if priority == policy.aged_priority:
+                    continue
+                queue = levels[priority]
+                while queue and now - queue[0].arrived_at > policy.max_wait:
+                    aged = queue.popleft()
+                    aged.priority = policy.aged_priority
+                    levels[policy.aged_priority].append(aged)
+            push(now + sweep_interval, SWEEP, None)
+
+        while busy < workers:
+            next_priority = max((p for p, queue in levels.items() if queue), default=None)
+            if next_priority is None:
+                break
+            started = levels[next_priority].popleft()
+            busy += 1
+            push(now + started.service_time, COMPLETE, started)
+
+    return results
+
+
+def _report(results: list[tuple[Job, float]], policy: SchedulingPolicy) -> dict:
+    by_bucket: dict[str, list[float]] = defaultdict(list)
+    limits = policy.bucket_limits
+    for job, latency in results:
+        bucket = next((f"<={limit}s" for limit in limits if job.duration <= limit), f">{limits[-1]}s")
+        by_bucket[bucket].append(latency)
+
+    return {
+        "latency_s": summarize(latency for _, latency in results),
+        "slowdown": summarize(latency / job.service_time for job, latency in results),
+        "latency_s_by_duration": {
+            bucket: summarize(values) for bucket, values in sorted(by_bucket.items())
+        },
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="FIFO vs shortest-job-first scheduling simulation")
+    parser.add_argument("--jobs", type=int, default=50000)
+    parser.add_argument("--workers", type=int, default=30, help="Concurrent recognition slots")
+    parser.add_argument("--utilization", type=float, default=0.9, help="Offered load relative to capacity")
+    parser.add_argument("--median-duration", type=float, default=15.0, help="Median voice duration, seconds")
+    parser.add_argument("--duration-sigma", type=float, default=1.0, help="Lognormal sigma of voice duration")
+    parser.add_argument("--max-duration", type=int, default=300)
+    parser.add_argument("--overhead", type=float, default=2.0, help="Per-task fixed cost, seconds")
+    parser.add_argument("--cost-per-second", type=float, default=1.0,
+                        help="Processing seconds per second of audio")
+    parser.add_argument("--max-wait", type=float, default=None,
+                        help="Aging threshold, seconds (default: scheduling_max_wait)")
+    parser.add_argument("--sweep-interval", type=float, default=None,
+                        help="Aging sweep interval, seconds (default: scheduling_sweep_interval)")
+    parser.add_argument("--seed", type=int, default=42)
+    add_output_argument(parser)
+    args = parser.parse_args(argv)
+
+    policy = SchedulingPolicy.from_settings()
+    if args.max_wait is not None:
+        policy = SchedulingPolicy(bucket_limits=policy.bucket_limits, max_wait=args.max_wait)
+    sweep_interval = args.sweep_interval or settings.scheduling_sweep_interval
+
+    jobs_args = dict(
+        count=args.jobs,
+        workers=args.workers,
+        utilization=args.utilization,
+        median_duration=args.median_duration,
+        duration_sigma=args.duration_sigma,
+        max_duration=args.max_duration,
+        overhead=args.overhead,
+        cost_per_second=args.cost_per_second,
+        seed=args.seed,
+    )
+
+    report = {
+        "parameters": vars(args),
+        "policy": {"bucket_limits": policy.bucket_limits, "max_wait": policy.max_wait},
+    }
+    modes = (
+        ("fifo", None, False),
+        ("sjf", policy, False),
+        ("sjf_aging", policy, True),
+    )
+    for name, mode_policy, aging in modes:
+        # Каждый режим получает одинаковый поток запросов
+        results = simulate(generate_jobs(**jobs_args), args.workers, mode_policy, aging, sweep_interval)
+        report[name] = _report(results, policy)
+
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Генератор синтетических данных для бенчмарков сервисного слоя
+"""
+
+import argparse
+import asyncio
+import bisect
+import itertools
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Iterator, Optional
+
+import asyncpg
+
+from app.benchmarks.common import add_output_argument, write_report
+from app.config import settings
+from app.database.models import PaymentMethod, PaymentStatus, RequestStatus, TransactionType
+from app.recognition.mock import MOCK_TEXTS
+from app.services.catalog import get_catalog
+
+PAYMENT_AMOUNTS = (Decimal("100.00"), Decimal("250.00"), Decimal("500.00"), Decimal("1000.00"))
+
+USER_COLUMNS = (
+    "id", "telegram_id", "username", "first_name", "balance", "is_active", "created_at", "updated_at",
+)
+PAYMENT_COLUMNS = (
+    "id", "user_id", "amount", "method", "status", "external_payment_id", "created_at", "updated_at",
+)
+TRANSACTION_COLUMNS = (
+    "id", "user_id", "amount", "transaction_type", "description", "payment_method", "created_at",
+)
+REQUEST_COLUMNS = (
+    "id", "user_id", "category", "subcategory", "voice_file_id", "voice_duration", "voice_file_size",
+    "processed_text", "response_text", "status", "cost", "is_free",
+    "processing_started_at", "processing_completed_at", "created_at", "updated_at",
+)
+
+# Доли статусов (SQLAlchemy хранит Enum по именам членов)
+REQUEST_STATUSES = (
+    (RequestStatus.COMPLETED, 0.92),
+    (RequestStatus.FAILED, 0.04),
+    (RequestStatus.PROCESSING, 0.01),
+    (RequestStatus.PENDING, 0.03),
+)
+PAYMENT_STATUSES = (
+    (PaymentStatus.SUCCESS, 0.85),
+    (PaymentStatus.PENDING, 0.05),
+    (PaymentStatus.FAILED, 0.05),
+    (PaymentStatus.CANCELLED, 0.05),
+)
+
+
+def _weighted_choice(rng: random.Random, options: tuple) -> object:
+    point = rng.random()
+    for value, share in options:
+        point -= share
+        if point <= 0:
+            return value
+    return options[-1][0]
+
+
+class SkewModel:
+    """Распределение активности по пользователям и дням."""
+
+    def __init__(
+        self,
+        rng: random.Random,
+        user_ids: range,
+        days: int,
+        user_skew: float,
+        hot_days: int,
+        hot_day_weight: float,
+    ):
+        self.rng = rng
+        self.user_ids = user_ids
+        self.end = datetime.now(timezone.utc)
+        self.start = self.end - timedelta(days=days)
+
+        # Веса Парето: чем меньше user_skew, тем сильнее перекос
+        self._user_cumulative = list(itertools.accumulate(
+            rng.paretovariate(user_skew) for _ in user_ids
+        ))
+
+        day_weights = [1.0] * days
+        for day in rng.sample(range(days), min(hot_days, days)):
+            day_weights[day] = hot_day_weight
+        self._day_cumulative = list(itertools.accumulate(day_weights))
+
+    def user(self) -> int:
+        point = self.rng.random() * self._user_cumulative[-1]
+        return self.user_ids[bisect.bisect_left(self._user_cumulative, point)]
+
+    def timestamp(self) -> datetime:
+        point = self.rng.random() * self._day_cumulative[-1]
+        day = bisect.bisect_left(self._day_cumulative, point)
+        return self.start + timedelta(days=day, seconds=self.rng.random() * 86400)
+
+
+def _batched(rows: Iterator[tuple], size: int) -> Iterator[list[tuple]]:
+    while True:
+        batch = list(itertools.islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+async def _next_id(conn: asyncpg.Connection, table: str) -> int:
+    return await conn.fetchval(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")
+
+
+async def _sync_sequence(conn: asyncpg.Connection, table: str) -> None:
+    """Сдвинуть последовательность id после вставки с явными id."""
+    await conn.execute(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+    )
+
+
+class Generator:
+    def __init__(self, model: SkewModel, rng: random.Random, transaction_ids: Iterator[int]):
+        self.model = model
+        self.rng = rng
+        self.transaction_ids = transaction_ids
+        self.services = list(get_catalog().subcategories.values())
+        self.transactions: list[tuple] = []
+
+    def users(self, telegram_id_base: int) -> Iterator[tuple]:
+        for index, user_id in enumerate(self.model.user_ids):
+            created_at = self.model.start - timedelta(days=self.rng.random() * 30)
+            yield (
+                user_id, telegram_id_base + index, f"seed_{telegram_id_base + index}", "Seed",
+                Decimal("0.00"), True, created_at, created_at,
+            )
+
+    def payments(self, first_id: int, count: int) -> Iterator[tuple]:
+        for payment_id in range(first_id, first_id + count):
+            user_id = self.model.user()
+            created_at = self.model.timestamp()
+            amount = self.rng.choice(PAYMENT_AMOUNTS)
+            method = self.rng.choice(list(PaymentMethod))
+            status = _weighted_choice(self.rng, PAYMENT_STATUSES)
+
+            if status == PaymentStatus.SUCCESS:
+                self.transactions.append((
+                    next(self.transaction_ids), user_id, amount, TransactionType.CREDIT.name,
+                    f"Пополнение через {method.value}", method.value, created_at,
+                ))
+
+            yield (
+                payment_id, user_id, amount, method.name, status.name,
+                f"seed-{payment_id}", created_at, created_at,
+            )
+
+    def requests(self, first_id: int, count: int) -> Iterator[tuple]:
+        for request_id in range(first_id, first_id + count):
+            user_id = self.model.user()
+            created_at = self.model.timestamp()
+            service = self.rng.choice(self.services)
+            category, subcategory, cost = service.category, service.subcategory, service.price
+            duration = min(int(self.rng.lognormvariate(2.7, 0.9)) + 1, service.max_duration)
+            status = _weighted_choice(self.rng, REQUEST_STATUSES)
+            is_free = self.rng.random() < 0.2
+
+            started_at = completed_at = None
+            processed_text = response_text = None
+            if status != RequestStatus.PENDING:
+                started_at = created_at + timedelta(seconds=self.rng.uniform(0.5, 120))
+            if status in (RequestStatus.COMPLETED, RequestStatus.FAILED):
+                completed_at = started_at + timedelta(seconds=duration * self.rng.uniform(0.3, 2.0))
+            if status == RequestStatus.COMPLETED:
+                processed_text = self.rng.choice(MOCK_TEXTS)
+                response_text = f"✅ Обработка завершена.\n\nИсходный текст: {processed_text}"
+
+            if not is_free and status != RequestStatus.FAILED:
+                self.transactions.append((
+                    next(self.transaction_ids), user_id, cost, TransactionType.DEBIT.name,
+                    f"Оплата услуги: {subcategory.value}", None, created_at,
+                ))
+
+            yield (
+                request_id, user_id, category.name, subcategory.name, f"seed_{request_id}",
+                duration, duration * 2000, processed_text, response_text, status.name,
+                Decimal("0.00") if is_free else cost, is_free,
+                started_at, completed_at, created_at, completed_at or started_at or created_at,
+            )
+
+
+async def _copy(
+    conn: asyncpg.Connection,
+    table: str,
+    columns: tuple[str, ...],
+    rows: Iterator[tuple],
+    batch_size: int,
+    generator: Optional[Generator] = None,
+) -> int:
+    """Залить строки пачками; накопленные записи журнала баланса идут следом."""
+    total = 0
+    for batch in _batched(rows, batch_size):
+        await conn.copy_records_to_table(table, records=batch, columns=columns)
+        total += len(batch)
+        if generator and generator.transactions:
+            await conn.copy_records_to_table(
+                "balance_transactions", records=generator.transactions, columns=TRANSACTION_COLUMNS
+            )
+            generator.transactions = []
+    return total
+
+
+async def seed(
+    users: int,
+    requests_per_user: float,
+    payments_per_user: float,
+    days: int,
+    user_skew: float,
+    hot_days: int,
+    hot_day_weight: float,
+    telegram_id_base: int,
+    batch_size: int,
+    seed: int,
+) -> dict:
+    rng = random.Random(seed)
+    conn = await asyncpg.connect(settings.database_url.replace("postgresql+asyncpg", "postgresql"))
+    timings: dict[str, float] = {}
+    counts: dict[str, int] = {}
+
+    try:
+        first_user_id = await _next_id(conn, "users")
+        user_ids = range(first_user_id, first_user_id + users)
+        model = SkewModel(rng, user_ids, days, user_skew, hot_days, hot_day_weight)
+        first_transaction_id = await _next_id(conn, "balance_transactions")
+        transaction_ids = itertools.count(first_transaction_id)
+        generator = Generator(model, rng, transaction_ids)
+
+        started = time.perf_counter()
+        counts["users"] = await _copy(
+            conn, "users", USER_COLUMNS, generator.users(telegram_id_base), batch_size
+        )
+        timings["users"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        counts["payments"] = await _copy(
+            conn, "payments", PAYMENT_COLUMNS,
+            generator.payments(await _next_id(conn, "payments"), int(users * payments_per_user)),
+            batch_size, generator,
+        )
+        timings["payments"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        counts["service_requests"] = await _copy(
+            conn, "service_requests", REQUEST_COLUMNS,
+            generator.requests(await _next_id(conn, "service_requests"), int(users * requests_per_user)),
+            batch_size, generator,
+        )
+        timings["service_requests"] = time.perf_counter() - started
+        counts["balance_transactions"] = next(transaction_ids) - first_transaction_id
+
+        started = time.perf_counter()
+        for table in ("users", "payments", "balance_transactions", "service_requests"):
+            await _sync_sequence(conn, table)
+
+        # Баланс пользователя согласован с журналом операций
+        await conn.execute(
+            """
+            UPDATE users u SET balance = t.balance
+            FROM (
+                SELECT user_id,
+                       SUM(CASE WHEN transaction_type = 'CREDIT' THEN amount ELSE -amount END) AS balance
+                FROM balance_transactions
+                WHERE user_id BETWEEN $1 AND $2
+                GROUP BY user_id
+            ) t
+            WHERE u.id = t.user_id
+            """,
+            user_ids.start, user_ids.stop - 1,
+        )
+        await conn.execute("ANALYZE users, payments, balance_transactions, service_requests")
+        timings["finalize"] = time.perf_counter() - started
+    finally:
+        await conn.close()
+
+    return {
+        "user_id_range": [user_ids.start, user_ids.stop - 1],
+        "telegram_id_base": telegram_id_base,
+        "rows": counts,
+        "seconds": timings,
+        "rows_per_second": {
+            table: counts[table] / timings[table] for table in ("users", "payments", "service_requests")
+            if timings.get(table)
+        },
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk-load skewed synthetic data with COPY")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--requests-per-user", type=float, default=20.0, help="Mean service requests per user")
+    parser.add_argument("--payments-per-user", type=float, default=2.0, help="Mean payments per user")
+    parser.add_argument("--days", type=int, default=180, help="Activity window ending now")
+    parser.add_argument("--user-skew", type=float, default=1.2,
+                        help="Pareto shape of user activity; lower means heavier top users")
+    parser.add_argument("--hot-days", type=int, default=5, help="Days with amplified traffic")
+    parser.add_argument("--hot-day-weight", type=float, default=10.0, help="Traffic multiplier on hot days")
+    parser.add_argument("--telegram-id-base", type=int, default=9_000_000_000,
+                        help="First synthetic telegram_id; keep distinct from real users")
+    parser.add_argument("--batch-size", type=int, default=50000, help="Rows per COPY")
+    parser.add_argument("--seed", type=int, default=42)
+    add_output_argument(parser)
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(seed(
+        users=args.users,
+        requests_per_user=args.requests_per_user,
+        payments_per_user=args.payments_per_user,
+        days=args.days,
+        user_skew=args.user_skew,
+        hot_days=args.hot_days,
+        hot_day_weight=args.hot_day_weight,
+        telegram_id_base=args.telegram_id_base,
+        batch_size=args.batch_size,
+        seed=args.seed,
+    ))
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
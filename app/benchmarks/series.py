@@ -0,0 +1,65 @@
+"""
+Бенчмарк сводки числовых рядов
+"""
+
+import argparse
+import random
+import time
+from typing import Optional
+
+from app.benchmarks.common import add_output_argument, write_report
+from app.processors import get_processor
+
+LABELS = ("продажи", "расходы", "выручка за неделю", "посетители", "заказы по дням")
+
+
+def make_transcripts(count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    transcripts = []
+    for _ in range(count):
+        parts = []
+        for label in rng.sample(LABELS, rng.randint(1, 3)):
+            base = rng.uniform(10, 1000)
+            values = [max(0.0, rng.gauss(base, base * 0.2)) for _ in range(rng.randint(3, 40))]
+            parts.append(f"{label}: " + ", ".join(f"{value:.0f}" for value in values) + ".")
+        transcripts.append(" ".join(parts))
+    return transcripts
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Numeric series summary benchmark")
+    parser.add_argument("--transcripts", type=int, default=5000, help="Synthetic transcripts")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 64, 256],
+                        help="Transcripts per process_batch call")
+    parser.add_argument("--seed", type=int, default=42)
+    add_output_argument(parser)
+    args = parser.parse_args(argv)
+
+    processor = get_processor("statistics")
+    transcripts = make_transcripts(args.transcripts, args.seed)
+
+    started = time.perf_counter()
+    single = [processor.process(text) for text in transcripts]
+    elapsed = time.perf_counter() - started
+    report = {
+        "transcripts": len(transcripts),
+        "process": {"seconds": elapsed, "texts_per_second": len(transcripts) / elapsed},
+        "process_batch": {},
+    }
+
+    for batch_size in args.batch_sizes:
+        started = time.perf_counter()
+        batched = []
+        for offset in range(0, len(transcripts), batch_size):
+            batched.extend(processor.process_batch(transcripts[offset:offset + batch_size]))
+        elapsed = time.perf_counter() - started
+        report["process_batch"][str(batch_size)] = {
+            "seconds": elapsed,
+            "texts_per_second": len(transcripts) / elapsed,
+            "same_as_single": batched == single,
+        }
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
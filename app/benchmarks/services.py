@@ -0,0 +1,167 @@
+"""
+Бенчмарк методов чтения сервисного слоя на засеянных данных
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.benchmarks.common import (
+    add_output_argument, capture_statements, install_statement_counter, summarize, write_report
+)
+from app.database.engine import db_manager
+from app.database.models import Payment, ServiceRequest, User
+from app.services.balance_service import BalanceService
+from app.services.payment_service import PaymentService
+from app.services.statistics_service import StatisticsService
+from app.services.user_service import UserService
+from app.services.voice_service import VoiceService
+
+Case = Callable[[AsyncSession, dict], Awaitable[Any]]
+
+CASES: dict[str, Case] = {
+    "UserService.get_by_id": lambda s, p: UserService(s).get_by_id(p["user_id"]),
+    "UserService.get_by_telegram_id": lambda s, p: UserService(s).get_by_telegram_id(p["telegram_id"]),
+    "BalanceService.get_user_balance": lambda s, p: BalanceService(s).get_user_balance(p["user_id"]),
+    "BalanceService.get_balance_history": lambda s, p: BalanceService(s).get_balance_history(p["user_id"]),
+    "BalanceService.get_user_statistics": lambda s, p: BalanceService(s).get_user_statistics(p["user_id"]),
+    "VoiceService.get_request": lambda s, p: VoiceService(s).get_request(p["request_id"]),
+    "VoiceService.get_user_requests": lambda s, p: VoiceService(s).get_user_requests(p["user_id"]),
+    "VoiceService.get_pending_requests": lambda s, p: VoiceService(s).get_pending_requests(),
+    "PaymentService.get_payment": lambda s, p: PaymentService(s).get_payment(p["payment_id"]),
+    "PaymentService.get_user_payments": lambda s, p: PaymentService(s).get_user_payments(p["user_id"]),
+    "StatisticsService.get_user_statistics": lambda s, p: StatisticsService(s).get_user_statistics(p["user_id"]),
+    "StatisticsService.get_user_recent_requests":
+        lambda s, p: StatisticsService(s).get_user_recent_requests(p["user_id"]),
+    "StatisticsService.get_global_statistics": lambda s, p: StatisticsService(s).get_global_statistics(),
+}
+
+
+async def load_profiles() -> dict[str, dict]:
+    """Параметры вызовов: тяжёлый и случайный пользователь, последние запрос и платёж."""
+    async with db_manager.get_session(read_only=True) as session:
+        heavy_user_id = await session.scalar(
+            select(ServiceRequest.user_id)
+            .group_by(ServiceRequest.user_id)
+            .order_by(func.count().desc())
+            .limit(1)
+        )
+        random_user_id = await session.scalar(select(User.id).order_by(func.random()).limit(1))
+        request_id = await session.scalar(select(func.max(ServiceRequest.id)))
+        payment_id = await session.scalar(select(func.max(Payment.id)))
+
+        profiles = {}
+        for name, user_id in (("heavy", heavy_user_id), ("random", random_user_id)):
+            if user_id is None:
+                continue
+            profiles[name] = {
+                "user_id": user_id,
+                "telegram_id": await session.scalar(select(User.telegram_id).where(User.id == user_id)),
+                "request_id": request_id,
+                "payment_id": payment_id,
+            }
+        return profiles
+
+
+def _plan_summary(plan: dict) -> dict:
+    """Главное из плана: корневой узел, стоимость, время и последовательные сканы."""
+    seq_scans = []
+
+    def walk(node: dict) -> None:
+        if node.get("Node Type") == "Seq Scan":
+            seq_scans.append(node.get("Relation Name"))
+        for child in node.get("Plans", []):
+            walk(child)
+
+    root = plan["Plan"]
+    walk(root)
+    summary = {
+        "node": root.get("Node Type"),
+        "total_cost": root.get("Total Cost"),
+        "seq_scans": seq_scans,
+    }
+    if "Execution Time" in plan:
+        summary["execution_ms"] = plan["Execution Time"]
+    return summary
+
+
+async def explain(statements: list[tuple[str, Any]], analyze: bool) -> list[dict]:
+    options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+    plans = []
+    async with db_manager.get_session(read_only=True) as session:
+        conn = await session.connection()
+        for statement, parameters in statements:
+            result = await conn.exec_driver_sql(f"EXPLAIN ({options}) {statement}", parameters)
+            plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            plans.append({
+                "statement": " ".join(statement.split()),
+                "summary": _plan_summary(plan[0]),
+                "plan": plan[0],
+            })
+    return plans
+
+
+async def run_case(case: Case, params: dict, repeat: int, analyze: bool) -> dict:
+    latencies = []
+    statements: list[tuple[str, Any]] = []
+
+    for attempt in range(repeat + 1):
+        async with db_manager.get_session(read_only=True) as session:
+            with capture_statements() as log:
+                started = time.perf_counter()
+                await case(session, params)
+                elapsed = time.perf_counter() - started
+        # Первый прогон прогревает кэши и пулы соединений
+        if attempt == 0:
+            statements = log
+        else:
+            latencies.append(elapsed)
+
+    return {
+        "latency_ms": summarize(v * 1000 for v in latencies),
+        "statements": len(statements),
+        "plans": await explain(statements, analyze),
+    }
+
+
+async def run_benchmark(repeat: int, analyze: bool, only: Optional[list[str]]) -> dict:
+    db_manager.init_engine()
+    install_statement_counter(db_manager.engine)
+
+    try:
+        profiles = await load_profiles()
+        results: dict[str, dict] = {}
+        for name, case in CASES.items():
+            if only and name not in only:
+                continue
+            results[name] = {
+                profile: await run_case(case, params, repeat, analyze)
+                for profile, params in profiles.items()
+            }
+    finally:
+        await db_manager.close()
+
+    return {"repeat": repeat, "analyze": analyze, "profiles": profiles, "results": results}
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark service read methods on seeded data")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per method and profile")
+    parser.add_argument("--analyze", action="store_true", help="Use EXPLAIN ANALYZE (executes the query)")
+    parser.add_argument("--only", nargs="*", choices=sorted(CASES), help="Run only these methods")
+    add_output_argument(parser)
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_benchmark(args.repeat, args.analyze, args.only))
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
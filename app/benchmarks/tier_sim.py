@@ -0,0 +1,174 @@
+"""
+Симуляция перехода на быстрый уровень распознавания при всплеске
+"""
+
+import argparse
+import heapq
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.benchmarks.admission_sim import Job, generate_jobs
+from app.benchmarks.common import add_output_argument, summarize, write_report
+from app.services.admission import AdmissionPolicy, QueueLoad
+from app.services.recognizer_tiers import RecognizerTier, TierPolicy
+
+ARRIVAL, COMPLETE = 0, 1
+
+
+@dataclass
+class TierSimulationResult:
+    latency: list[float] = field(default_factory=list)
+    spike_latency: list[float] = field(default_factory=list)
+    tiers: dict[str, int] = field(default_factory=dict)
+    switches: int = 0
+    max_queue: int = 0
+
+
+class TierSimulation:
+    def __init__(
+        self,
+        tiers: Optional[TierPolicy],
+        fixed_tier: RecognizerTier,
+        admission: AdmissionPolicy,
+        workers: int,
+        window: float,
+        fast_factor: float,
+        spike: tuple[float, float],
+    ):
+        self.tiers = tiers
+        self.tier = fixed_tier
+        self.admission = admission
+        self.workers = workers
+        self.window = window
+        self.fast_factor = fast_factor
+        self.spike = spike
+
+        self.queue: deque[Job] = deque()
+        self.busy = 0
+        self.completions: deque[tuple[float, float]] = deque()
+        self.result = TierSimulationResult()
+
+    def _load(self, now: float) -> QueueLoad:
+        while self.completions and self.completions[0][0] < now - self.window:
+            self.completions.popleft()
+        processing = [duration for _, duration in self.completions]
+        return QueueLoad(
+            pending=len(self.queue),
+            completed_in_window=len(processing),
+            window_seconds=self.window,
+            avg_processing_seconds=sum(processing) / len(processing) if processing else None,
+        )
+
+    def _select(self, now: float) -> RecognizerTier:
+        if self.tiers is None:
+            return self.tier
+        load = self._load(now)
+        tier = self.tiers.next_tier(self.tier, load, self.admission.estimate_wait(load))
+        if tier != self.tier:
+            self.result.switches += 1
+            self.tier = tier
+        return tier
+
+    def run(self, jobs: list[Job]) -> TierSimulationResult:
+        events: list[tuple[float, int, int, Job, float]] = []
+        sequence = 0
+        for job in jobs:
+            heapq.heappush(events, (job.created_at, sequence, ARRIVAL, job, 0.0))
+            sequence += 1
+
+        while events:
+            now, _, kind, job, duration = heapq.heappop(events)
+            if kind == COMPLETE:
+                self.busy -= 1
+                self.completions.append((now, duration))
+                latency = now - job.created_at
+                self.result.latency.append(latency)
+                if self.spike[0] <= job.created_at < self.spike[1]:
+                    self.result.spike_latency.append(latency)
+            else:
+                self.queue.append(job)
+                self.result.max_queue = max(self.result.max_queue, len(self.queue))
+
+            while self.busy < self.workers and self.queue:
+                started = self.queue.popleft()
+                tier = self._select(now)
+                self.result.tiers[tier.value] = self.result.tiers.get(tier.value, 0) + 1
+                duration = started.service_time * (self.fast_factor if tier == RecognizerTier.FAST else 1.0)
+                self.busy += 1
+                heapq.heappush(events, (now + duration, sequence, COMPLETE, started, duration))
+                sequence += 1
+
+        return self.result
+
+
+def _report(result: TierSimulationResult) -> dict:
+    total = sum(result.tiers.values())
+    return {
+        "latency_s": summarize(result.latency),
+        "spike_latency_s": summarize(result.spike_latency),
+        "fast_share": result.tiers.get(RecognizerTier.FAST.value, 0) / total if total else 0.0,
+        "tier_switches": result.switches,
+        "max_queue": result.max_queue,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Recognizer tier degradation simulation")
+    parser.add_argument("--duration", type=float, default=3600, help="Simulated seconds")
+    parser.add_argument("--rate", type=float, default=0.5, help="Base arrivals per second")
+    parser.add_argument("--spike-start", type=float, default=900)
+    parser.add_argument("--spike-length", type=float, default=600)
+    parser.add_argument("--spike-factor", type=float, default=6.0, help="Arrival rate multiplier in the spike")
+    parser.add_argument("--workers", type=int, default=30, help="Concurrent recognition slots")
+    parser.add_argument("--mean-service", type=float, default=40.0, help="Mean accurate processing time, seconds")
+    parser.add_argument("--service-sigma", type=float, default=0.5, help="Lognormal sigma of processing time")
+    parser.add_argument("--fast-factor", type=float, default=0.35, help="Fast tier time relative to accurate")
+    parser.add_argument("--window", type=float, default=300, help="Throughput window, seconds")
+    parser.add_argument("--seed", type=int, default=42)
+    add_output_argument(parser)
+    args = parser.parse_args(argv)
+
+    policy = TierPolicy.from_settings()
+    modes = (
+        ("accurate_only", None, RecognizerTier.ACCURATE),
+        ("fast_only", None, RecognizerTier.FAST),
+        ("tiers", policy, RecognizerTier.ACCURATE),
+        ("tiers_no_hysteresis", TierPolicy(
+            degrade_wait=policy.degrade_wait,
+            recover_wait=policy.degrade_wait,
+            degrade_pending=policy.degrade_pending,
+            recover_pending=policy.degrade_pending,
+        ), RecognizerTier.ACCURATE),
+    )
+
+    report = {"parameters": vars(args)}
+    for name, tiers, fixed_tier in modes:
+        # Каждый режим получает одинаковый поток запросов
+        jobs = generate_jobs(
+            duration=args.duration,
+            rate=args.rate,
+            spike_start=args.spike_start,
+            spike_length=args.spike_length,
+            spike_factor=args.spike_factor,
+            free_share=0.0,
+            mean_service=args.mean_service,
+            service_sigma=args.service_sigma,
+            seed=args.seed,
+        )
+        result = TierSimulation(
+            tiers=tiers,
+            fixed_tier=fixed_tier,
+            admission=AdmissionPolicy.from_settings(),
+            workers=args.workers,
+            window=args.window,
+            fast_factor=args.fast_factor,
+            spike=(args.spike_start, args.spike_start + args.spike_length),
+        ).run(jobs)
+        report[name] = _report(result)
+
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
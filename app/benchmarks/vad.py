@@ -0,0 +1,97 @@
+"""
+Бенчмарк детектора речи и обрезки тишины
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from app.audio import SAMPLE_RATE, decode_wav
+from app.audio.segment import FRAME_SECONDS
+from app.audio.vad import detect_speech, trim_silence
+from app.benchmarks.common import add_output_argument, summarize, write_report
+from app.config import settings
+from app.testing.audio_samples import synthesize_voice_pcm
+
+
+def synthetic_recordings(count: int, empty: int, seed: int) -> list[tuple[str, np.ndarray]]:
+    """Записи 5-90 с речи с тишиной 0-6 с по краям и записи только с шумом."""
+    rng = random.Random(seed)
+    recordings = []
+    for index in range(count):
+        leading, trailing = rng.uniform(0, 6), rng.uniform(0, 6)
+        duration = rng.uniform(5, 90) + leading + trailing
+        pcm = synthesize_voice_pcm(duration, seed=seed + index, leading_silence=leading, trailing_silence=trailing)
+        recordings.append((f"speech_{index}", np.array(pcm, dtype=np.int16)))
+
+    noise = np.random.default_rng(seed)
+    for index in range(empty):
+        level = rng.uniform(20, 150)
+        samples = noise.normal(0, level, int(rng.uniform(3, 15) * SAMPLE_RATE))
+        recordings.append((f"empty_{index}", samples.astype(np.int16)))
+    return recordings
+
+
+def file_recordings(samples_dir: Path) -> list[tuple[str, np.ndarray]]:
+    return [(path.name, decode_wav(path.read_bytes())) for path in sorted(samples_dir.glob("*.wav"))]
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Voice activity detection benchmark")
+    parser.add_argument("--recordings", type=int, default=20, help="Synthetic speech recordings")
+    parser.add_argument("--empty", type=int, default=5, help="Synthetic noise-only recordings")
+    parser.add_argument("--samples-dir", type=Path, help="Directory with 16-bit WAV files instead of synthetic audio")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed VAD runs per recording")
+    parser.add_argument("--asr-cost", type=float, default=settings.fake_recognizer_cost,
+                        help="Recognizer seconds per audio second, for the compute estimate")
+    parser.add_argument("--seed", type=int, default=42)
+    add_output_argument(parser)
+    args = parser.parse_args(argv)
+
+    if args.samples_dir:
+        recordings = file_recordings(args.samples_dir)
+    else:
+        recordings = synthetic_recordings(args.recordings, args.empty, args.seed)
+
+    frames_per_second = []
+    input_seconds = trimmed_seconds = 0.0
+    reductions = []
+    empty = []
+
+    for name, pcm in recordings:
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            result = detect_speech(pcm, SAMPLE_RATE)
+            trimmed = trim_silence(pcm, result, settings.vad_max_pause, settings.vad_padding)
+        elapsed = (time.perf_counter() - started) / args.repeat
+
+        frames = len(pcm) / (FRAME_SECONDS * SAMPLE_RATE)
+        frames_per_second.append(frames / elapsed if elapsed else 0.0)
+        input_seconds += len(pcm) / SAMPLE_RATE
+
+        if result.speech_seconds < settings.vad_min_speech_seconds:
+            empty.append(name)
+            continue
+        trimmed_seconds += len(trimmed) / SAMPLE_RATE
+        reductions.append(100 * (1 - len(trimmed) / len(pcm)))
+
+    saved = input_seconds - trimmed_seconds
+    write_report({
+        "recordings": len(recordings),
+        "frames_per_second": summarize(frames_per_second),
+        "audio_seconds_per_second": summarize(v * FRAME_SECONDS for v in frames_per_second),
+        "input_seconds": input_seconds,
+        "asr_input_seconds": trimmed_seconds,
+        "asr_input_reduction_pct": 100 * saved / input_seconds if input_seconds else 0.0,
+        "reduction_pct_per_recording": summarize(reductions),
+        "estimated_asr_seconds_saved": saved * args.asr_cost,
+        "empty_recordings": empty,
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Бенчмарк пропускной способности воркера process_voice_message
+"""
+
+import os
+
+# Задачи выполняются in-memory брокером в этом же процессе
+os.environ.setdefault("TASK_BROKER", "memory")
+
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+from typing import Optional
+
+from aiohttp import web
+from sqlalchemy import func, select
+
+from app.benchmarks.common import (
+    add_output_argument, collect_stages, count_statements, install_statement_counter,
+    peak_rss_mb, summarize, write_report
+)
+from app.config import settings
+from app.database.engine import db_manager
+from app.database.models import RequestStatus, ServiceRequest
+from app.services.catalog import get_catalog
+from app.services.user_service import UserService
+from app.services.voice_service import VoiceService
+from app.tasks.broker import broker
+from app.tasks.voice_processing import process_voice_message
+from app.testing.fake_telegram import FakeTelegramServer
+
+
+async def seed_requests(tasks: int, users: int, user_id_base: int, seed: int) -> list[int]:
+    """Создать пользователей и ожидающие запросы, вернуть id запросов."""
+    rng = random.Random(seed)
+    services = list(get_catalog().subcategories.values())
+
+    async with db_manager.get_session() as session:
+        user_service = UserService(session)
+        voice_service = VoiceService(session)
+
+        user_ids = []
+        for index in range(users):
+            telegram_id = user_id_base + index
+            user = await user_service.get_by_telegram_id(telegram_id)
+            if user is None:
+                user = await user_service.create_user({
+                    "telegram_id": telegram_id,
+                    "username": f"bench_{telegram_id}",
+                    "first_name": "Bench",
+                })
+            user_ids.append(user.id)
+
+        request_ids = []
+        for index in range(tasks):
+            service = rng.choice(services)
+            request = await voice_service.create_service_request(
+                user_id=rng.choice(user_ids),
+                category=service.category,
+                subcategory=service.subcategory,
+                voice_file_id=f"bench_{user_id_base}_{index}",
+                # Длительности смещены к коротким, как в реальном трафике
+                voice_duration=min(int(rng.lognormvariate(2.7, 0.9)) + 1, service.max_duration),
+                is_free=rng.random() < 0.2,
+            )
+            request_ids.append(request.id)
+
+    return request_ids
+
+
+async def wait_for_completion(request_ids: list[int], poll_interval: float, timeout: float) -> int:
+    """Ждать, пока все запросы перейдут в COMPLETED/FAILED; вернуть число завершённых."""
+    deadline = time.perf_counter() + timeout
+    finished = 0
+    while time.perf_counter() < deadline:
+        async with db_manager.get_session(read_only=True) as session:
+            finished = await session.scalar(
+                select(func.count())
+                .select_from(ServiceRequest)
+                .where(
+                    ServiceRequest.id.in_(request_ids),
+                    ServiceRequest.status.in_([RequestStatus.COMPLETED, RequestStatus.FAILED]),
+                )
+            )
+        if finished >= len(request_ids):
+            break
+        await asyncio.sleep(poll_interval)
+    return finished
+
+
+async def status_counts(request_ids: list[int]) -> dict[str, int]:
+    async with db_manager.get_session(read_only=True) as session:
+        rows = await session.execute(
+            select(ServiceRequest.status, func.count())
+            .where(ServiceRequest.id.in_(request_ids))
+            .group_by(ServiceRequest.status)
+        )
+        return {status.value: count for status, count in rows.all()}
+
+
+async def run_benchmark(
+    tasks: int,
+    users: int,
+    telegram_port: int,
+    telegram_latency: float,
+    user_id_base: int,
+    seed: int,
+    timeout: float,
+) -> dict:
+    settings.telegram_api_url = f"http://127.0.0.1:{telegram_port}"
+
+    telegram = FakeTelegramServer(latency=telegram_latency, seed=seed)
+    runner = web.AppRunner(telegram.build_app())
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", telegram_port).start()
+
+    db_manager.init_engine()
+    install_statement_counter(db_manager.engine)
+    await broker.startup()
+
+    statements: list[list[int]] = []
+    stages: list[dict[str, list[float]]] = []
+    try:
+        request_ids = await seed_requests(tasks, users, user_id_base, seed)
+
+        started = time.perf_counter()
+        for request_id in request_ids:
+            # Контекст копируется в задачу при постановке, поэтому счётчики
+            # и сборщик этапов относятся к одной задаче
+            with count_statements() as counter, collect_stages() as collector:
+                await process_voice_message.kiq(request_id, settings.bot_token)
+            statements.append(counter)
+            stages.append(collector)
+        enqueued = time.perf_counter() - started
+
+        finished = await wait_for_completion(request_ids, poll_interval=0.2, timeout=timeout)
+        elapsed = time.perf_counter() - started
+        statuses = await status_counts(request_ids)
+    finally:
+        await broker.shutdown()
+        await db_manager.close()
+        await runner.cleanup()
+
+    by_stage: dict[str, list[float]] = defaultdict(list)
+    for collector in stages:
+        for stage, values in collector.items():
+            by_stage[stage].extend(values)
+
+    queue_wait = by_stage.pop("queue_wait", [])
+
+    return {
+        "tasks": tasks,
+        "concurrency": settings.task_max_async_tasks,
+        "recognizer": {
+            "name": settings.recognizer,
+            "cost_per_second": settings.fake_recognizer_cost,
+            "mode": settings.fake_recognizer_mode,
+            "requires_audio": settings.fake_recognizer_requires_audio,
+        },
+        "enqueue_seconds": enqueued,
+        "elapsed_seconds": elapsed,
+        "finished": finished,
+        "statuses": statuses,
+        "tasks_per_second": finished / elapsed if elapsed else 0.0,
+        "queue_wait_ms": summarize(v * 1000 for v in queue_wait),
+        "stage_latency_ms": {
+            stage: summarize(v * 1000 for v in values) for stage, values in sorted(by_stage.items())
+        },
+        "db_statements_per_task": summarize(counter[0] for counter in statements),
+        "telegram_api_calls": dict(telegram.calls),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Throughput benchmark for process_voice_message")
+    parser.add_argument("--tasks", type=int, default=1000, help="Synthetic requests to process")
+    parser.add_argument("--users", type=int, default=100, help="Synthetic users owning the requests")
+    parser.add_argument("--cost", type=float, default=0.05,
+                        help="Fake recognizer work seconds per second of audio")
+    parser.add_argument("--mode", choices=["sleep", "cpu"], default="sleep",
+                        help="Fake recognizer cost model")
+    parser.add_argument("--download", action="store_true",
+                        help="Download the voice file from the fake Bot API before recognition")
+    parser.add_argument("--telegram-port", type=int, default=8081, help="Port for the fake Bot API")
+    parser.add_argument("--telegram-latency", type=float, default=0.0, help="Fake Bot API latency, seconds")
+    parser.add_argument("--user-id-base", type=int, default=int(time.time()) * 1000,
+                        help="First synthetic telegram_id")
+    parser.add_argument("--timeout", type=float, default=3600.0, help="Max seconds to wait for completion")
+    parser.add_argument("--seed", type=int, default=42)
+    add_output_argument(parser)
+    args = parser.parse_args(argv)
+
+    # Распознаватель создаётся при первой задаче, поэтому настройки задаются до запуска
+    settings.recognizer = "fake"
+    settings.fake_recognizer_cost = args.cost
+    settings.fake_recognizer_mode = args.mode
+    settings.fake_recognizer_requires_audio = args.download
+
+    report = asyncio.run(run_benchmark(
+        tasks=args.tasks,
+        users=args.users,
+        telegram_port=args.telegram_port,
+        telegram_latency=args.telegram_latency,
+        user_id_base=args.user_id_base,
+        seed=args.seed,
+        timeout=args.timeout,
+    ))
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
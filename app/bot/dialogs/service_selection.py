@@ -13,9 +13,8 @@ from aiogram_dialog.widgets.kbd import Button, Back, Cancel, Group, Select
 from aiogram_dialog.widgets.common import WhenCondition
 
 from ...states.service import ServiceStates
+from ...services.catalog import get_catalog
 from ...utils import (
-    SERVICE_CATEGORIES, 
-    SERVICE_SUBCATEGORIES, 
     calculate_service_price,
     format_currency,
     validate_voice_duration,
@@ -27,10 +26,10 @@ from ...utils import (
 async def get_categories(**kwargs):
     """Получение списка категорий"""
     categories = []
-    for category_id, category_name in SERVICE_CATEGORIES.items():
+    for category in get_catalog().categories.values():
         categories.append({
-            "id": category_id,
-            "name": category_name
+            "id": category.category.value,
+            "name": category.description
         })
     
     return {"categories": categories}
@@ -41,19 +40,21 @@ async def get_subcategories(**kwargs):
     dialog_manager: DialogManager = kwargs["dialog_manager"]
     selected_category = dialog_manager.dialog_data.get("selected_category")
     
+    catalog = get_catalog()
+    category = catalog.categories.get(selected_category) if selected_category else None
+    
     subcategories = []
-    if selected_category and selected_category in SERVICE_SUBCATEGORIES:
-        for subcat_id, subcat_name in SERVICE_SUBCATEGORIES[selected_category].items():
-            price = calculate_service_price(selected_category, subcat_id)
+    if category:
+        for subcategory in category.subcategories:
             subcategories.append({
-                "id": subcat_id,
-                "name": subcat_name,
-                "price": format_currency(price)
+                "id": subcategory.subcategory.value,
+                "name": subcategory.description,
+                "price": format_currency(subcategory.price)
             })
     
     return {
         "subcategories": subcategories,
-        "category_name": SERVICE_CATEGORIES.get(selected_category, "")
+        "category_name": category.description if category else ""
     }
 
 
@@ -199,8 +200,11 @@ async def get_service_summary(**kwargs):
     if not category or not subcategory:
         return {}
     
-    category_name = SERVICE_CATEGORIES.get(category, "")
-    subcategory_name = SERVICE_SUBCATEGORIES.get(category, {}).get(subcategory, "")
+    catalog = get_catalog()
+    category_info = catalog.categories.get(category)
+    subcategory_info = catalog.subcategories.get(subcategory)
+    category_name = category_info.description if category_info else ""
+    subcategory_name = subcategory_info.description if subcategory_info else ""
     price = calculate_service_price(category, subcategory)
     
     return {
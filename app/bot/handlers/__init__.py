@@ -10,7 +10,8 @@ from .payment import payment_router
 def setup_handlers(dp: Dispatcher):
     """Setup all handlers."""
     dp.include_router(start_router)
-    dp.include_router(registration_router)
     dp.include_router(balance_router)
     dp.include_router(service_router)
-    dp.include_router(payment_router)
\ No newline at end of file
+    dp.include_router(payment_router)
+    # Ловит любые сообщения, поэтому подключается последним
+    dp.include_router(registration_router)
\ No newline at end of file
@@ -7,7 +7,7 @@ from app.services.user_service import UserService
 from app.services.payment_service import PaymentService
 from app.database.engine import db_manager
 
-balance_router = Router()
+balance_router = Router(name="balance")
 
 
 @balance_router.callback_query(F.data == "balance_info")
@@ -45,7 +45,7 @@ async def balance_info_handler(callback: CallbackQuery, user: any):
 async def payment_history_handler(callback: CallbackQuery, user: any):
     """Show user payment history."""
     
-    async with db_manager.get_session() as session:
+    async with db_manager.get_session(read_only=True, user_id=user.id) as session:
         payment_service = PaymentService(session)
         payments = await payment_service.get_user_payments(user.id, limit=10)
     
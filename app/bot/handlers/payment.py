@@ -10,11 +10,11 @@ from app.bot.keyboards.inline import (
 )
 from app.bot.states.payment import PaymentStates
 from app.database.models import PaymentMethod
+from app.services.catalog import get_catalog
 from app.services.payment_service import PaymentService
 from app.database.engine import db_manager
-from app.config import settings
 
-payment_router = Router()
+payment_router = Router(name="payment")
 
 
 @payment_router.callback_query(F.data == "payment_start")
@@ -23,7 +23,7 @@ async def payment_start_handler(callback: CallbackQuery, state: FSMContext):
     
     payment_text = (
         "💳 <b>Пополнение баланса</b>\n\n"
-        f"💰 Стоимость одного запроса: {settings.service_cost} ₽\n\n"
+        f"💰 Стоимость одного запроса: от {get_catalog().min_price()} ₽\n\n"
         "Выберите сумму для пополнения:"
     )
     
@@ -112,7 +112,7 @@ async def method_selected_handler(callback: CallbackQuery, state: FSMContext, us
     
     await state.update_data(method=method, amount=amount)
     
-    async with db_manager.get_session() as session:
+    async with db_manager.get_session(user_id=user.id) as session:
         payment_service = PaymentService(session)
         
         try:
@@ -182,7 +182,7 @@ async def check_payment_handler(callback: CallbackQuery, user: any):
     
     payment_id = int(callback.data.split("_")[2])
     
-    async with db_manager.get_session() as session:
+    async with db_manager.get_session(user_id=user.id) as session:
         payment_service = PaymentService(session)
         
         payment = await payment_service.get_payment(payment_id)
@@ -226,7 +226,7 @@ async def back_to_amounts_handler(callback: CallbackQuery, state: FSMContext):
     
     payment_text = (
         "💳 <b>Пополнение баланса</b>\n\n"
-        f"💰 Стоимость одного запроса: {settings.service_cost} ₽\n\n"
+        f"💰 Стоимость одного запроса: от {get_catalog().min_price()} ₽\n\n"
         "Выберите сумму для пополнения:"
     )
     
@@ -3,7 +3,7 @@ from aiogram.types import Message
 
 from app.services.user_service import UserService
 
-registration_router = Router()
+registration_router = Router(name="registration")
 
 
 @registration_router.message()
@@ -3,6 +3,7 @@ from aiogram.types import CallbackQuery, Message
 from aiogram.fsm.context import FSMContext
 from decimal import Decimal
 from datetime import datetime, timedelta
+from typing import Optional
 import logging
 
 from app.bot.keyboards.inline import (
@@ -11,19 +12,87 @@ from app.bot.keyboards.inline import (
     get_main_menu_keyboard,
     get_service_confirmation_keyboard
 )
+from app.audio import QualityIssue, assess_quality, decode_audio
 from app.bot.states.service import ServiceStates
 from app.database.models import ServiceCategory, ServiceSubcategory
 from app.services.user_service import UserService
+from app.services.admission import AdmissionController, AdmissionDecision, AdmissionVerdict
+from app.services.catalog import get_catalog
 from app.services.voice_service import VoiceService
 from app.services.balance_service import BalanceService
 from app.database.engine import db_manager
+from app.monitoring.metrics import AUDIO_QUALITY_REJECTIONS
+from app.tasks.scheduling import task_priority
 from app.tasks.voice_processing import process_voice_message
 from app.config import settings
 
-service_router = Router()
+service_router = Router(name="service")
 logger = logging.getLogger(__name__)
 
 
+def _format_eta(seconds: float) -> str:
+    """Human-readable wait estimate."""
+    if seconds < 60:
+        return "меньше минуты"
+    return f"~{round(seconds / 60)} мин."
+
+
+def _admission_text(decision: AdmissionDecision, selection_kept: bool = False) -> str:
+    """Message for a request that was not admitted."""
+    if decision.verdict == AdmissionVerdict.REJECT:
+        return (
+            "❌ <b>Бесплатные запросы временно не принимаются</b>\n\n"
+            f"Сейчас высокая нагрузка, ожидание: {_format_eta(decision.eta_seconds)}\n\n"
+            "💎 Пополните баланс для приоритетного доступа или попробуйте позже."
+        )
+    if selection_kept:
+        retry = "Отправьте голосовое сообщение ещё раз через несколько минут — услуга остаётся выбранной"
+    else:
+        retry = "Попробуйте отправить запрос через несколько минут"
+    return (
+        "⏳ <b>Сервис сейчас перегружен</b>\n\n"
+        f"Ожидаемое время обработки: {_format_eta(decision.eta_seconds)}\n\n"
+        f"{retry}, оплата не списана."
+    )
+
+
+QUALITY_TEXTS = {
+    QualityIssue.SILENT: (
+        "🔇 <b>Запись слишком тихая</b>\n\n"
+        "В сообщении почти нет звука. Запишите его ещё раз ближе к микрофону — оплата не списана."
+    ),
+    QualityIssue.CLIPPED: (
+        "📢 <b>Запись перегружена</b>\n\n"
+        "Звук искажён из-за слишком высокой громкости. Запишите сообщение ещё раз "
+        "чуть дальше от микрофона — оплата не списана."
+    ),
+    QualityIssue.BROKEN: (
+        "❌ <b>Не удалось прочитать запись</b>\n\n"
+        "Файл повреждён или пуст. Отправьте голосовое сообщение ещё раз — оплата не списана."
+    ),
+}
+
+
+async def _precheck_audio(message: Message) -> Optional[QualityIssue]:
+    """Check the start of the recording before charging; errors let the request through."""
+    try:
+        data = await message.bot.download(message.voice)
+        pcm = await decode_audio(data.read(), max_seconds=settings.quality_check_seconds)
+    except ValueError as e:
+        # ffmpeg could not decode the file
+        logger.info(f"Voice {message.voice.file_id} is not decodable: {e}")
+        return QualityIssue.BROKEN
+    except Exception as e:
+        logger.warning(f"Audio quality pre-check skipped: {e}")
+        return None
+
+    _, issue = assess_quality(pcm, settings.quality_min_rms_dbfs, settings.quality_max_clipping_ratio)
+    if issue == QualityIssue.SILENT and message.voice.duration > settings.quality_check_seconds:
+        # Only the start was checked; speech may begin later, the worker checks the whole file
+        return None
+    return issue
+
+
 @service_router.callback_query(F.data == "service_start")
 async def service_start_handler(callback: CallbackQuery, state: FSMContext):
     """Start service usage."""
@@ -50,8 +119,7 @@ async def category_selected_handler(callback: CallbackQuery, state: FSMContext):
 
     await state.update_data(category=category)
 
-    voice_service = VoiceService(None)
-    category_desc = voice_service.get_category_description(category)
+    category_desc = get_catalog().category(category).description
 
     subcategory_text = (
         f"🎨 <b>Категория:</b> {category_desc}\n\n"
@@ -75,16 +143,13 @@ async def subcategory_selected_handler(callback: CallbackQuery, state: FSMContex
 
     await state.update_data(subcategory=subcategory)
 
-    # Check if user can use the service
-    async with db_manager.get_session() as session:
-        user_service = UserService(session)
-        can_use_free = await user_service.can_use_free_service(user)
-        time_until_free = await user_service.get_time_until_free_usage(user)
-
-        voice_service = VoiceService(session)
-        subcategory_desc = voice_service.get_subcategory_description(subcategory)
+    service = get_catalog().subcategory(subcategory)
+    subcategory_desc = service.description
+    service_cost = service.price
 
-    service_cost = Decimal(str(settings.service_cost))
+    # Check if user can use the service
+    can_use_free = await UserService.can_use_free_service(user, service_cost)
+    time_until_free = await UserService.get_time_until_free_usage(user)
 
     if user.balance >= service_cost:
         # User can pay
@@ -93,7 +158,7 @@ async def subcategory_selected_handler(callback: CallbackQuery, state: FSMContex
             f"💰 <b>Стоимость:</b> {service_cost} ₽\n"
             f"💳 <b>Ваш баланс:</b> {user.balance} ₽\n\n"
             "📤 Пришлите голосовое сообщение для обработки\n"
-            f"⏱ Максимальная длительность: {settings.max_voice_duration} сек."
+            f"⏱ Максимальная длительность: {service.max_duration} сек."
         )
     elif can_use_free:
         # User can use free service
@@ -102,7 +167,7 @@ async def subcategory_selected_handler(callback: CallbackQuery, state: FSMContex
             f"🎁 <b>Бесплатное использование</b>\n"
             f"💳 <b>Ваш баланс:</b> {user.balance} ₽\n\n"
             "📤 Пришлите голосовое сообщение для обработки\n"
-            f"⏱ Максимальная длительность: {settings.max_voice_duration} сек.\n\n"
+            f"⏱ Максимальная длительность: {service.max_duration} сек.\n\n"
             f"ℹ️ Следующее бесплатное использование будет доступно через {settings.free_usage_hours} часов"
         )
     else:
@@ -132,11 +197,27 @@ async def subcategory_selected_handler(callback: CallbackQuery, state: FSMContex
         await callback.answer()
         return
 
+    # Check queue load before the user records anything
+    async with db_manager.get_session(read_only=True) as session:
+        decision = await AdmissionController(session).check(is_free=user.balance < service_cost)
+
+    if not decision.admitted:
+        await callback.message.edit_text(
+            _admission_text(decision),
+            reply_markup=get_main_menu_keyboard()
+        )
+        await state.clear()
+        await callback.answer()
+        return
+
+    if decision.eta_seconds:
+        cost_text += f"\n\n⏳ Ожидаемое время обработки: {_format_eta(decision.eta_seconds)}"
+
     await callback.message.edit_text(
         cost_text,
         reply_markup=get_service_confirmation_keyboard()
     )
-    await state.set_state(ServiceStates.waiting_voice)
+    await state.set_state(ServiceStates.waiting_for_voice_message)
     await callback.answer()
 
 
@@ -144,9 +225,15 @@ async def subcategory_selected_handler(callback: CallbackQuery, state: FSMContex
 async def service_confirm_handler(callback: CallbackQuery, state: FSMContext):
     """Confirm service usage."""
 
+    data = await state.get_data()
+    subcategory = data.get('subcategory')
+    max_duration = (
+        get_catalog().max_duration(subcategory) if subcategory else settings.max_voice_duration
+    )
+
     confirm_text = (
         "🎙 <b>Отправьте голосовое сообщение</b>\n\n"
-        f"⏱ Максимальная длительность: {settings.max_voice_duration} сек.\n"
+        f"⏱ Максимальная длительность: {max_duration} сек.\n"
         f"📁 Поддерживаемые форматы: {', '.join(settings.supported_formats)}\n"
         f"📏 Максимальный размер: {settings.max_file_size // (1024 * 1024)} МБ\n\n"
         "💡 Для лучшего результата говорите четко и медленно"
@@ -176,6 +263,8 @@ async def service_cancel_handler(callback: CallbackQuery, state: FSMContext):
 async def voice_message_handler(message: Message, state: FSMContext, user: any):
     """Handle voice message."""
 
+    # Set when the user may resend the voice for the same selection
+    keep_state = False
     try:
         # Get state data
         data = await state.get_data()
@@ -190,11 +279,13 @@ async def voice_message_handler(message: Message, state: FSMContext, user: any):
             await state.clear()
             return
 
+        service = get_catalog().subcategory(subcategory)
+
         # Check voice duration
-        if message.voice.duration > settings.max_voice_duration:
+        if message.voice.duration > service.max_duration:
             await message.answer(
                 f"❌ <b>Голосовое сообщение слишком длинное</b>\n\n"
-                f"Максимальная длительность: {settings.max_voice_duration} сек.\n"
+                f"Максимальная длительность: {service.max_duration} сек.\n"
                 f"Ваше сообщение: {message.voice.duration} сек.\n\n"
                 "Пожалуйста, отправьте более короткое сообщение."
             )
@@ -210,12 +301,33 @@ async def voice_message_handler(message: Message, state: FSMContext, user: any):
             )
             return
 
-        async with db_manager.get_session() as session:
+        if settings.quality_check_enabled:
+            issue = await _precheck_audio(message)
+            if issue is not None:
+                AUDIO_QUALITY_REJECTIONS.labels("handler", issue.value).inc()
+                # The user re-records the voice for the same service
+                keep_state = True
+                await message.answer(QUALITY_TEXTS[issue], reply_markup=get_main_menu_keyboard())
+                return
+
+        async with db_manager.get_session(user_id=user.id) as session:
             user_service = UserService(session)
             balance_service = BalanceService(session)
 
-            service_cost = Decimal(str(settings.service_cost))
-            can_use_free = await user_service.can_use_free_service(user)
+            service_cost = service.price
+            previous_free_usage = user.last_free_usage
+            can_use_free = await user_service.can_use_free_service(user, service_cost)
+
+            # Load may have changed since the subcategory was chosen; check before charging
+            decision = await AdmissionController(session).check(is_free=user.balance < service_cost)
+            if not decision.admitted:
+                # A deferred request keeps the selection so the user can resend the voice later
+                keep_state = decision.verdict == AdmissionVerdict.DEFER
+                await message.answer(
+                    _admission_text(decision, selection_kept=keep_state),
+                    reply_markup=get_main_menu_keyboard()
+                )
+                return
 
             # Check payment again
             if user.balance >= service_cost:
@@ -225,7 +337,7 @@ async def voice_message_handler(message: Message, state: FSMContext, user: any):
                 logger.info(f"User {user.id} used paid service for {service_cost}")
             elif can_use_free:
                 # Mark free usage
-                await user_service.mark_free_usage(user)
+                await user_service.mark_free_usage(user.id)
                 payment_type = "free"
                 logger.info(f"User {user.id} used free service")
             else:
@@ -237,31 +349,33 @@ async def voice_message_handler(message: Message, state: FSMContext, user: any):
                 await state.clear()
                 return
 
-        # Send processing message
-        processing_msg = await message.answer(
-            "⏳ <b>Обрабатываем ваше сообщение...</b>\n\n"
-            "🎙 Анализируем голосовое сообщение\n"
-            "⚡ Это может занять до минуты\n\n"
-            "Пожалуйста, подождите..."
-        )
+            # Processing message; the worker edits it with queue position and stages
+            processing_msg = await message.answer(
+                "⏳ <b>Обрабатываем ваше сообщение...</b>\n\n"
+                "🎙 Анализируем голосовое сообщение\n"
+                "⚡ Это может занять до минуты\n\n"
+                "Пожалуйста, подождите..."
+            )
 
-        # Start voice processing task
-        task_data = {
-            "user_id": user.id,
-            "telegram_user_id": user.telegram_id,
-            "file_id": message.voice.file_id,
-            "file_unique_id": message.voice.file_unique_id,
-            "duration": message.voice.duration,
-            "file_size": message.voice.file_size,
-            "category": category.value,
-            "subcategory": subcategory.value,
-            "payment_type": payment_type,
-            "processing_msg_id": processing_msg.message_id,
-            "chat_id": message.chat.id
-        }
-
-        # Send to queue
-        await process_voice_message.kiq(**task_data)
+            priority = task_priority(message.voice.duration)
+            voice_service = VoiceService(session)
+            service_request = await voice_service.create_service_request(
+                user_id=user.id,
+                category=category,
+                subcategory=subcategory,
+                voice_file_id=message.voice.file_id,
+                voice_duration=message.voice.duration,
+                is_free=payment_type == "free",
+                chat_id=message.chat.id,
+                progress_message_id=processing_msg.message_id,
+                priority=priority,
+                previous_free_usage=previous_free_usage if payment_type == "free" else None
+            )
+
+        # Send to queue; shorter recordings get higher priority
+        await process_voice_message.kicker().with_labels(priority=priority).kiq(
+            service_request.id, message.bot.token
+        )
 
         logger.info(f"Voice processing task queued for user {user.id}")
 
@@ -273,7 +387,8 @@ async def voice_message_handler(message: Message, state: FSMContext, user: any):
             reply_markup=get_main_menu_keyboard()
         )
     finally:
-        await state.clear()
+        if not keep_state:
+            await state.clear()
 
 
 @service_router.message(ServiceStates.waiting_for_voice_message, ~F.voice)
@@ -5,7 +5,7 @@ from aiogram.types import Message, CallbackQuery
 from app.bot.keyboards.inline import get_main_menu_keyboard
 from app.services.user_service import UserService
 
-start_router = Router()
+start_router = Router(name="start")
 
 
 @start_router.message(CommandStart())
@@ -1,11 +1,18 @@
+from functools import lru_cache
+from typing import Optional
+
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from decimal import Decimal
 
-from app.database.models import ServiceCategory, ServiceSubcategory, PaymentMethod
-from app.services.voice_service import VoiceService
+from app.database.models import ServiceCategory, PaymentMethod
+from app.services.catalog import Catalog, get_catalog
 
+# Клавиатуры — неизменяемые модели aiogram, поэтому один экземпляр
+# безопасно отдаётся во все обработчики. Функции _build_* строят
+# клавиатуру заново, get_* возвращают закэшированную.
 
-def get_main_menu_keyboard() -> InlineKeyboardMarkup:
+
+def _build_main_menu_keyboard() -> InlineKeyboardMarkup:
     """Основное меню."""
     return InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text="🎯 Использовать сервис", callback_data="service_start")],
@@ -16,16 +23,13 @@ def get_main_menu_keyboard() -> InlineKeyboardMarkup:
     ])
 
 
-def get_service_categories_keyboard() -> InlineKeyboardMarkup:
+def _build_service_categories_keyboard(catalog: Catalog) -> InlineKeyboardMarkup:
     """Клавиатура выбора категорий услуг."""
-    voice_service = VoiceService(None)  # Для получения описаний
-    
     buttons = []
-    for category in ServiceCategory:
-        description = voice_service.get_category_description(category)
+    for category in catalog.categories.values():
         buttons.append([InlineKeyboardButton(
-            text=description,
-            callback_data=f"category_{category.value}"
+            text=category.description,
+            callback_data=f"category_{category.category.value}"
         )])
     
     buttons.append([InlineKeyboardButton(text="🔙 Назад", callback_data="back_to_main")])
@@ -33,17 +37,13 @@ def get_service_categories_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
-def get_service_subcategories_keyboard(category: ServiceCategory) -> InlineKeyboardMarkup:
+def _build_service_subcategories_keyboard(catalog: Catalog, category: ServiceCategory) -> InlineKeyboardMarkup:
     """Клавиатура выбора подкатегорий."""
-    voice_service = VoiceService(None)
-    subcategories = voice_service.get_subcategories_by_category(category)
-    
     buttons = []
-    for subcategory in subcategories:
-        description = voice_service.get_subcategory_description(subcategory)
+    for subcategory in catalog.category(category).subcategories:
         buttons.append([InlineKeyboardButton(
-            text=description,
-            callback_data=f"subcategory_{subcategory.value}"
+            text=subcategory.description,
+            callback_data=f"subcategory_{subcategory.subcategory.value}"
         )])
     
     buttons.append([InlineKeyboardButton(text="🔙 К категориям", callback_data="back_to_categories")])
@@ -51,7 +51,7 @@ def get_service_subcategories_keyboard(category: ServiceCategory) -> InlineKeybo
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
-def get_payment_amounts_keyboard() -> InlineKeyboardMarkup:
+def _build_payment_amounts_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура выбора сумм для пополнения."""
     amounts = [100, 300, 500, 1000, 2000]
     
@@ -68,7 +68,7 @@ def get_payment_amounts_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
-def get_payment_methods_keyboard(amount: Decimal) -> InlineKeyboardMarkup:
+def _build_payment_methods_keyboard(amount: Decimal | str) -> InlineKeyboardMarkup:
     """Клавиатура выбора способов оплаты."""
     buttons = [
         [InlineKeyboardButton(
@@ -85,7 +85,7 @@ def get_payment_methods_keyboard(amount: Decimal) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
-def get_balance_keyboard(user_balance: Decimal) -> InlineKeyboardMarkup:
+def _build_balance_keyboard(user_balance: Decimal) -> InlineKeyboardMarkup:
     """Клавиатура для управления балансом."""
     buttons = [
         [InlineKeyboardButton(text="💳 Пополнить баланс", callback_data="payment_start")],
@@ -103,7 +103,7 @@ def get_balance_keyboard(user_balance: Decimal) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
-def get_service_confirmation_keyboard() -> InlineKeyboardMarkup:
+def _build_service_confirmation_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура подтверждения использования сервиса."""
     return InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text="✅ Подтвердить", callback_data="service_confirm")],
@@ -112,16 +112,96 @@ def get_service_confirmation_keyboard() -> InlineKeyboardMarkup:
     ])
 
 
-def get_back_to_categories_keyboard() -> InlineKeyboardMarkup:
+def _build_back_to_categories_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура возврата к категориям."""
     return InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text="🔙 К категориям", callback_data="service_start")]
     ])
 
 
-def get_history_keyboard() -> InlineKeyboardMarkup:
+def _build_history_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для истории запросов."""
     return InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text="🔄 Обновить", callback_data="history_refresh")],
         [InlineKeyboardButton(text="🔙 Главное меню", callback_data="back_to_main")]
-    ])
\ No newline at end of file
+    ])
+
+
+# Статические клавиатуры строятся один раз при импорте
+MAIN_MENU_KEYBOARD = _build_main_menu_keyboard()
+PAYMENT_AMOUNTS_KEYBOARD = _build_payment_amounts_keyboard()
+BALANCE_KEYBOARD = _build_balance_keyboard(Decimal("0"))
+BALANCE_KEYBOARD_WITH_SERVICE = _build_balance_keyboard(Decimal("1"))
+SERVICE_CONFIRMATION_KEYBOARD = _build_service_confirmation_keyboard()
+BACK_TO_CATEGORIES_KEYBOARD = _build_back_to_categories_keyboard()
+HISTORY_KEYBOARD = _build_history_keyboard()
+
+# Клавиатуры, зависящие от каталога услуг; пересобираются rebuild_keyboards()
+_categories_keyboard: Optional[InlineKeyboardMarkup] = None
+_subcategories_keyboards: dict[ServiceCategory, InlineKeyboardMarkup] = {}
+
+
+def rebuild_keyboards(catalog: Optional[Catalog] = None) -> None:
+    """Пересобрать клавиатуры каталога (при старте и после изменения каталога)."""
+    global _categories_keyboard, _subcategories_keyboards
+    catalog = catalog or get_catalog()
+    # Новые объекты подменяются целиком, читатели видят либо старый, либо новый набор
+    _subcategories_keyboards = {
+        category: _build_service_subcategories_keyboard(catalog, category) for category in catalog.categories
+    }
+    _categories_keyboard = _build_service_categories_keyboard(catalog)
+
+
+def get_main_menu_keyboard() -> InlineKeyboardMarkup:
+    """Основное меню."""
+    return MAIN_MENU_KEYBOARD
+
+
+def get_service_categories_keyboard() -> InlineKeyboardMarkup:
+    """Клавиатура выбора категорий услуг."""
+    if _categories_keyboard is None:
+        rebuild_keyboards()
+    return _categories_keyboard
+
+
+def get_service_subcategories_keyboard(category: ServiceCategory) -> InlineKeyboardMarkup:
+    """Клавиатура выбора подкатегорий."""
+    if _categories_keyboard is None:
+        rebuild_keyboards()
+    return _subcategories_keyboards[category]
+
+
+def get_payment_amounts_keyboard() -> InlineKeyboardMarkup:
+    """Клавиатура выбора сумм для пополнения."""
+    return PAYMENT_AMOUNTS_KEYBOARD
+
+
+def get_payment_methods_keyboard(amount: Decimal) -> InlineKeyboardMarkup:
+    """Клавиатура выбора способов оплаты."""
+    # Ключ — строка: Decimal("100") == Decimal("100.00"), но callback_data у них разные
+    return _payment_methods_keyboard(str(amount))
+
+
+@lru_cache(maxsize=256)
+def _payment_methods_keyboard(amount: str) -> InlineKeyboardMarkup:
+    return _build_payment_methods_keyboard(amount)
+
+
+def get_balance_keyboard(user_balance: Decimal) -> InlineKeyboardMarkup:
+    """Клавиатура для управления балансом."""
+    return BALANCE_KEYBOARD_WITH_SERVICE if user_balance > 0 else BALANCE_KEYBOARD
+
+
+def get_service_confirmation_keyboard() -> InlineKeyboardMarkup:
+    """Клавиатура подтверждения использования сервиса."""
+    return SERVICE_CONFIRMATION_KEYBOARD
+
+
+def get_back_to_categories_keyboard() -> InlineKeyboardMarkup:
+    """Клавиатура возврата к категориям."""
+    return BACK_TO_CATEGORIES_KEYBOARD
+
+
+def get_history_keyboard() -> InlineKeyboardMarkup:
+    """Клавиатура для истории запросов."""
+    return HISTORY_KEYBOARD
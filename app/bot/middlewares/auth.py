@@ -45,6 +45,8 @@ class AuthMiddleware(BaseMiddleware):
                     'last_name': getattr(event.from_user, 'last_name', None),
                 }
                 user = await user_service.create_user(user_data)
+                # Следующие чтения пользователя не должны уйти в отстающую реплику
+                await db_manager.mark_user_write(user.id)
             
             # Добавляем пользователя в данные для обработчика
             data['user'] = user
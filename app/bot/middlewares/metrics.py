@@ -0,0 +1,121 @@
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramAPIError, TelegramNetworkError, TelegramServerError
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import TelegramObject, Update
+
+from app.monitoring.metrics import (
+    HANDLER_LATENCY, HTTP_CLIENT_LATENCY, MIDDLEWARE_LATENCY, UPDATE_LATENCY, http_status_class
+)
+
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    """Outer middleware: полное время обработки апдейта."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        event_type = event.event_type if isinstance(event, Update) else type(event).__name__
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            UPDATE_LATENCY.labels(event_type).observe(time.perf_counter() - started)
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """Inner middleware: время обработчика с метками роутера и функции.
+
+    Регистрируется последним, чтобы оборачивать только сам обработчик.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        router = data.get("event_router")
+        handler_object = data.get("handler")
+        router_name = router.name if router else "unknown"
+        handler_name = getattr(getattr(handler_object, "callback", None), "__name__", "unknown")
+
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            HANDLER_LATENCY.labels(router_name, handler_name).observe(time.perf_counter() - started)
+
+
+class TimedMiddleware(BaseMiddleware):
+    """Обёртка, замеряющая собственное время middleware без нижележащих обработчиков."""
+
+    def __init__(self, middleware: BaseMiddleware, name: str | None = None):
+        self.middleware = middleware
+        self.name = name or type(middleware).__name__
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        downstream = 0.0
+
+        async def timed_handler(event: TelegramObject, data: Dict[str, Any]) -> Any:
+            nonlocal downstream
+            started = time.perf_counter()
+            try:
+                return await handler(event, data)
+            finally:
+                downstream += time.perf_counter() - started
+
+        started = time.perf_counter()
+        try:
+            return await self.middleware(timed_handler, event, data)
+        finally:
+            own_time = time.perf_counter() - started - downstream
+            MIDDLEWARE_LATENCY.labels(self.name).observe(max(own_time, 0.0))
+
+
+class TelegramMetricsMiddleware(BaseRequestMiddleware):
+    """Middleware сессии бота: время запросов к Bot API.
+
+    Метки те же, что у httpx-клиентов воркера: метод API и класс ответа.
+    """
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot,
+        method: TelegramMethod[TelegramType],
+    ):
+        api_method = getattr(method, "__api_method__", type(method).__name__)
+        status = http_status_class(200)
+        started = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        except TelegramNetworkError:
+            status = "error"
+            raise
+        except TelegramServerError:
+            status = http_status_class(500)
+            raise
+        except TelegramAPIError:
+            # Ошибки запроса: неверные параметры, доступ, flood control
+            status = http_status_class(400)
+            raise
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            HTTP_CLIENT_LATENCY.labels("telegram", api_method, status).observe(
+                time.perf_counter() - started
+            )
@@ -0,0 +1,52 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import TelegramObject, Update
+from opentelemetry.trace import SpanKind
+
+from app.monitoring.tracing import tracer
+
+
+class UpdateTracingMiddleware(BaseMiddleware):
+    """Outer middleware: корневой спан на каждый апдейт."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, Update):
+            return await handler(event, data)
+
+        with tracer.start_as_current_span(
+            f"telegram.update {event.event_type}",
+            kind=SpanKind.SERVER,
+            attributes={"telegram.update_id": event.update_id},
+        ) as span:
+            user = data.get("event_from_user")
+            if user is not None:
+                span.set_attribute("telegram.user_id", user.id)
+            return await handler(event, data)
+
+
+class TelegramTracingMiddleware(BaseRequestMiddleware):
+    """Middleware сессии бота: спан на каждый вызов Bot API."""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot,
+        method: TelegramMethod[TelegramType],
+    ):
+        api_method = getattr(method, "__api_method__", type(method).__name__)
+        with tracer.start_as_current_span(
+            f"http telegram {api_method}",
+            kind=SpanKind.CLIENT,
+            attributes={"peer.service": "telegram", "telegram.method": api_method},
+        ):
+            # Исключения записываются в спан самим start_as_current_span
+            return await make_request(bot, method)
@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from pydantic import Field
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # Получаем путь к корню проекта (на уровень выше от app/)
@@ -21,6 +21,7 @@ class Settings(BaseSettings):
     webhook_path: str = Field(default="/webhook", description="Webhook path")
     webapp_host: str = Field(default="0.0.0.0", description="Webapp host")
     webapp_port: int = Field(default=8000, description="Webapp port")
+    telegram_api_url: str = Field(default="https://api.telegram.org", description="Telegram Bot API server base URL")
 
     # Database Configuration
     db_host: str = Field(default="localhost", description="Database host")
@@ -28,6 +29,10 @@ class Settings(BaseSettings):
     db_name: str = Field(..., description="Database name")
     db_user: str = Field(..., description="Database user")
     db_password: str = Field(..., description="Database password")
+    db_replica_urls: str = Field(default="", description="Comma-separated read replica DSNs")
+    db_replica_max_lag: float = Field(default=5.0, description="Max replica lag in seconds before reads go to primary")
+    db_replica_lag_check_interval: float = Field(default=10.0, description="Replica lag check interval in seconds")
+    db_read_your_writes_seconds: float = Field(default=10.0, description="Window after a user's write when their reads use primary")
 
     # Redis Configuration
     redis_host: str = Field(default="localhost", description="Redis host")
@@ -48,6 +53,106 @@ class Settings(BaseSettings):
     service_cost: float = Field(default=10.0, description="Service cost per use")
     free_usage_hours: int = Field(default=24, description="Hours between free uses")
     max_voice_duration: int = Field(default=300, description="Max voice message duration")
+    max_file_size: int = Field(default=20 * 1024 * 1024, description="Max voice file size in bytes")
+    supported_formats: list[str] = Field(default=["ogg", "oga", "opus"], description="Supported voice formats")
+
+    # Admission Control
+    admission_enabled: bool = Field(default=True, description="Check queue load before accepting voice requests")
+    admission_window_seconds: float = Field(default=300.0, description="Window for measuring worker throughput")
+    admission_cache_seconds: float = Field(default=2.0, description="How long a queue load reading is reused")
+    admission_free_defer_wait: float = Field(default=300.0, description="Estimated wait above which free requests are deferred")
+    admission_free_reject_wait: float = Field(default=900.0, description="Estimated wait above which free requests are rejected")
+    admission_free_max_in_flight: int = Field(default=50, description="Max queued or running free requests")
+    admission_paid_max_in_flight: int = Field(default=1000, description="Max queued or running paid requests")
+    admission_min_throughput: float = Field(default=0.05, description="Throughput floor in requests/sec for the wait estimate")
+    admission_default_processing_seconds: float = Field(default=40.0, description="Processing time assumed before any completions")
+
+    # Service Catalog
+    catalog_source: str = Field(default="file", description="Catalog source: file or db")
+    catalog_file: str = Field(
+        default=str(BASE_DIR / "app" / "data" / "service_catalog.json"),
+        description="Catalog JSON file"
+    )
+    catalog_reload_interval: float = Field(default=30.0, description="Catalog version check interval in seconds")
+
+    # Task Queue
+    task_broker: str = Field(default="rabbitmq", description="Task broker: rabbitmq or memory")
+    task_max_async_tasks: int = Field(default=30, description="Concurrent tasks for the in-memory broker")
+    task_prefetch: int = Field(default=10, description="RabbitMQ prefetch per worker; keep low so priorities take effect")
+
+    # Scheduling
+    scheduling_enabled: bool = Field(default=True, description="Prioritize voice tasks by recording duration")
+    scheduling_queue: str = Field(default="voice_priority", description="RabbitMQ exchange and priority queue used when scheduling is enabled")
+    scheduling_duration_buckets: str = Field(
+        default="15,30,60,120",
+        description="Comma-separated duration bucket limits in seconds; shorter buckets get higher priority"
+    )
+    scheduling_max_wait: float = Field(default=600.0, description="Pending seconds after which a request gets top priority")
+    scheduling_sweep_interval: float = Field(default=30.0, description="Starved request check interval in seconds")
+
+    # Progress Updates
+    progress_edit_interval: float = Field(default=3.0, description="Min seconds between edits of one progress message")
+    progress_queue_interval: float = Field(default=10.0, description="Queue position refresh interval in seconds (0 disables)")
+    progress_queue_limit: int = Field(default=500, description="Pending requests shown their queue position per refresh")
+
+    # Recognition
+    recognizer: str = Field(default="mock", description="Speech recognizer: mock, fake or fake_fast")
+    fake_recognizer_cost: float = Field(default=0.05, description="Fake recognizer work seconds per second of audio")
+    fake_recognizer_mode: str = Field(default="sleep", description="Fake recognizer cost model: sleep or cpu")
+    fake_fast_recognizer_cost: float = Field(default=0.015, description="Work seconds per second of audio for the fake_fast recognizer")
+    fake_recognizer_requires_audio: bool = Field(default=False, description="Download the voice file before fake recognition")
+    recognition_chunk_seconds: float = Field(default=30.0, description="Max chunk length for parallel recognition (0 disables)")
+    recognition_chunk_overlap: float = Field(default=1.0, description="Chunk overlap in seconds when no pause is found")
+    recognition_processes: int = Field(default=0, description="Worker process pool size for CPU-bound work (0 means CPU count)")
+    recognition_streaming: bool = Field(default=True, description="Show partial transcripts in the progress message")
+    ffmpeg_path: str = Field(default="ffmpeg", description="ffmpeg binary used to decode voice messages")
+
+    # Recognizer Tiers
+    tier_fast_recognizer: str = Field(default="", description="Recognizer for new tasks under backlog (empty disables degradation)")
+    tier_degrade_wait: float = Field(default=300.0, description="Estimated queue wait above which new tasks use the fast tier")
+    tier_recover_wait: float = Field(default=120.0, description="Estimated queue wait below which the accurate tier is restored")
+    tier_degrade_pending: int = Field(default=200, description="Pending requests above which new tasks use the fast tier")
+    tier_recover_pending: int = Field(default=50, description="Pending requests below which the accurate tier is restored")
+
+    # Shadow Traffic
+    shadow_sample_rate: float = Field(default=0.0, description="Share of completed requests re-run through candidate engines (0 disables)")
+    shadow_recognizer: str = Field(default="", description="Candidate recognizer compared with the primary one")
+    shadow_processors: str = Field(default="", description="Comma-separated primary:candidate processor keys, e.g. 'statistics:statistics_next'")
+    shadow_queue: str = Field(default="voice_shadow", description="RabbitMQ exchange and queue of the shadow worker")
+    shadow_max_async_tasks: int = Field(default=2, description="Concurrent shadow tasks for the in-memory broker")
+
+    # Language Identification
+    recognition_languages: str = Field(default="ru", description="Comma-separated languages with an optional recognizer (e.g. 'ru,en:fake'); the first is the default")
+    language_id_seconds: float = Field(default=5.0, description="Seconds from the start of speech transcribed to identify the language")
+    language_id_min_confidence: float = Field(default=0.6, description="Less confident guesses fall back to the default language")
+    language_id_recognizer: str = Field(default="", description="Fast recognizer for the identification pass (empty: the default language recognizer)")
+
+    # Audio Quality Check
+    quality_check_enabled: bool = Field(default=True, description="Reject silent, clipped or broken recordings before charging")
+    quality_check_seconds: float = Field(default=10.0, description="Seconds decoded from the start of the recording before charging")
+    quality_min_rms_dbfs: float = Field(default=-55.0, description="Recordings quieter than this RMS level are treated as silent")
+    quality_max_clipping_ratio: float = Field(default=0.05, description="Recordings with a larger share of clipped samples are rejected")
+
+    # Voice Activity Detection
+    vad_enabled: bool = Field(default=True, description="Trim silence before recognition")
+    vad_min_speech_seconds: float = Field(default=0.3, description="Recordings with less detected speech are treated as empty")
+    vad_max_pause: float = Field(default=0.5, description="Pauses inside speech are shortened to this many seconds")
+    vad_padding: float = Field(default=0.1, description="Audio kept around each speech segment in seconds")
+
+    # Response Cache
+    processor_batch_window: float = Field(default=0.01, description="Seconds concurrent texts wait to be summarized together by batching processors (0 disables)")
+    response_cache_enabled: bool = Field(default=True, description="Reuse processor responses for identical transcripts")
+    response_cache_size: int = Field(default=1024, description="Responses kept in worker memory")
+    response_cache_ttl: int = Field(default=86400, description="Cached response lifetime in seconds")
+
+    # Monitoring
+    metrics_enabled: bool = Field(default=True, description="Expose Prometheus metrics")
+    metrics_port: int = Field(default=9100, description="Bot metrics HTTP port")
+    worker_metrics_port: int = Field(default=9101, description="Worker metrics HTTP port")
+    shadow_metrics_port: int = Field(default=9102, description="Shadow worker metrics HTTP port")
+    tracing_exporter: str = Field(default="none", description="Span exporter: none, stdout or file")
+    tracing_file: str = Field(default="traces.jsonl", description="Span output file for the file exporter")
+    tracing_sample_ratio: float = Field(default=1.0, description="Fraction of new traces to sample")
 
     # Environment
     environment: str = Field(default="development", description="Environment")
@@ -57,10 +162,50 @@ class Settings(BaseSettings):
     secret_key: str = Field(..., description="Secret key for encryption")
     jwt_secret: str = Field(..., description="JWT secret key")
 
+    @model_validator(mode="after")
+    def check_recognition_chunks(self) -> "Settings":
+        if 0 < self.recognition_chunk_seconds <= self.recognition_chunk_overlap:
+            raise ValueError("recognition_chunk_overlap must be shorter than recognition_chunk_seconds")
+        return self
+
+    @model_validator(mode="after")
+    def check_recognition_languages(self) -> "Settings":
+        if not self.language_recognizers:
+            raise ValueError("recognition_languages must list at least one language")
+        return self
+
     @property
     def database_url(self) -> str:
         return f"postgresql+asyncpg://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
 
+    @property
+    def replica_database_urls(self) -> list[str]:
+        return [url.strip() for url in self.db_replica_urls.split(",") if url.strip()]
+
+    @property
+    def language_recognizers(self) -> dict[str, str]:
+        """Язык → имя распознавателя, в порядке настройки (первый — язык по умолчанию)."""
+        recognizers = {}
+        for item in self.recognition_languages.split(","):
+            language, _, name = item.strip().partition(":")
+            if language:
+                recognizers[language.strip()] = name.strip() or self.recognizer
+        return recognizers
+
+    @property
+    def shadow_processor_pairs(self) -> dict[str, str]:
+        """Ключ основного обработчика → ключ кандидата."""
+        pairs = {}
+        for item in self.shadow_processors.split(","):
+            primary, _, candidate = item.strip().partition(":")
+            if primary.strip() and candidate.strip():
+                pairs[primary.strip()] = candidate.strip()
+        return pairs
+
+    @property
+    def default_language(self) -> str:
+        return next(iter(self.language_recognizers))
+
     @property
     def redis_url(self) -> str:
         return f"redis://{self.redis_host}:{self.redis_port}/{self.redis_db}"
@@ -1,52 +1,239 @@
+import asyncio
+import logging
+import math
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
+import redis.asyncio as redis
+from sqlalchemy import TextClause, event, text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 )
+from sqlalchemy.orm import Session
 
 from app.config import settings
+from app.monitoring.metrics import DB_REPLICA_LAG, instrument_engine
+from app.monitoring.tracing import trace_engine
+
+logger = logging.getLogger(__name__)
+
+# Отставание реплики в секундах; на primary (не в recovery) всегда 0
+REPLICATION_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_is_in_recovery() "
+    "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "ELSE 0 END"
+)
+# Отметка недавней записи пользователя, общая для бота и воркеров
+RECENT_WRITE_KEY = "db:recent_write:{user_id}"
+
+
+class RoutingSession(Session):
+    """Сессия, которая отмечает в info факт записи в базу."""
+
+
+@event.listens_for(RoutingSession, "before_flush")
+def _mark_flush_writes(session, flush_context, instances):
+    if session.new or session.dirty or session.deleted:
+        session.info["has_writes"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_statement_writes(orm_execute_state):
+    # Любой не-SELECT, включая session.execute(text(...)), считается записью
+    statement = orm_execute_state.statement
+    if orm_execute_state.is_select:
+        return
+    if isinstance(statement, TextClause) and statement.text.lstrip().upper().startswith("SELECT"):
+        return
+    orm_execute_state.session.info["has_writes"] = True
 
 
 class DatabaseManager:
     def __init__(self):
         self.engine: AsyncEngine | None = None
         self.session_factory: async_sessionmaker[AsyncSession] | None = None
-    
-    def init_engine(self) -> AsyncEngine:
-        self.engine = create_async_engine(
-            settings.database_url,
+
+        self.replica_engines: list[AsyncEngine] = []
+        self.replica_session_factories: list[async_sessionmaker[AsyncSession]] = []
+        self.replica_lag: dict[int, float] = {}
+
+        self._replica_cursor = 0
+        self._recent_writes: dict[int, float] = {}
+        self._redis: Optional[redis.Redis] = None
+
+    @staticmethod
+    def _create_engine(url: str, role: str) -> AsyncEngine:
+        # Локальные базы SQLite в тестах работают без пула соединений
+        pool_options = {} if url.startswith("sqlite") else {"pool_size": 20, "max_overflow": 30}
+        engine = create_async_engine(
+            url,
             echo=settings.debug,
-            pool_size=20,
-            max_overflow=30,
             pool_pre_ping=True,
+            **pool_options,
         )
-        
-        self.session_factory = async_sessionmaker(
-            bind=self.engine,
+        instrument_engine(engine, role)
+        trace_engine(engine)
+        return engine
+
+    @staticmethod
+    def _create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+        return async_sessionmaker(
+            bind=engine,
             class_=AsyncSession,
+            sync_session_class=RoutingSession,
             expire_on_commit=False,
         )
-        
+
+    def init_engine(self) -> AsyncEngine:
+        self.engine = self._create_engine(settings.database_url, "primary")
+        self.session_factory = self._create_session_factory(self.engine)
+
+        self.replica_engines = [
+            self._create_engine(url, "replica") for url in settings.replica_database_urls
+        ]
+        self.replica_session_factories = [
+            self._create_session_factory(engine) for engine in self.replica_engines
+        ]
+        # До первой успешной проверки реплика не получает чтений
+        self.replica_lag = {index: math.inf for index in range(len(self.replica_engines))}
+
         return self.engine
-    
+
+    def _get_redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.from_url(settings.redis_url)
+        return self._redis
+
+    async def mark_user_write(self, user_id: int) -> None:
+        """Отметить запись пользователя, чтобы его чтения шли в primary.
+
+        Отметка хранится в памяти процесса и в Redis: запись, сделанная
+        воркером (например, возврат оплаты), видна и боту.
+        """
+        now = time.monotonic()
+        self._recent_writes[user_id] = now
+        if self.replica_engines:
+            try:
+                await self._get_redis().set(
+                    RECENT_WRITE_KEY.format(user_id=user_id), "1",
+                    px=max(1, int(settings.db_read_your_writes_seconds * 1000))
+                )
+            except redis.RedisError as e:
+                logger.warning(f"Recent write mark for user {user_id} not stored: {e}")
+
+        # Периодически чистим устаревшие отметки
+        if len(self._recent_writes) > 10_000:
+            cutoff = now - settings.db_read_your_writes_seconds
+            self._recent_writes = {
+                uid: ts for uid, ts in self._recent_writes.items() if ts > cutoff
+            }
+
+    async def has_recent_write(self, user_id: Optional[int]) -> bool:
+        """Была ли у пользователя запись в пределах окна read-your-writes."""
+        if user_id is None:
+            return False
+        written_at = self._recent_writes.get(user_id)
+        if written_at is not None and time.monotonic() - written_at < settings.db_read_your_writes_seconds:
+            return True
+        try:
+            return bool(await self._get_redis().exists(RECENT_WRITE_KEY.format(user_id=user_id)))
+        except redis.RedisError as e:
+            # Без Redis не знаем о чужих записях: читаем из primary
+            logger.warning(f"Recent write check for user {user_id} failed: {e}")
+            return True
+
+    def _healthy_replicas(self) -> list[int]:
+        return [
+            index for index, lag in self.replica_lag.items()
+            if lag <= settings.db_replica_max_lag
+        ]
+
+    async def _pick_session_factory(
+        self,
+        read_only: bool,
+        user_id: Optional[int]
+    ) -> tuple[async_sessionmaker[AsyncSession], bool]:
+        """Выбрать фабрику сессий: (фабрика, это реплика)."""
+        if not read_only:
+            return self.session_factory, False
+
+        healthy = self._healthy_replicas()
+        if not healthy or await self.has_recent_write(user_id):
+            return self.session_factory, False
+
+        # Round-robin по синхронным репликам
+        index = healthy[self._replica_cursor % len(healthy)]
+        self._replica_cursor += 1
+        return self.replica_session_factories[index], True
+
     @asynccontextmanager
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
+    async def get_session(
+        self,
+        read_only: bool = False,
+        user_id: Optional[int] = None
+    ) -> AsyncGenerator[AsyncSession, None]:
+        """Получить сессию.
+
+        read_only=True направляет сессию в реплику, если она есть и не отстаёт,
+        а у пользователя user_id не было недавних записей.
+        """
         if self.session_factory is None:
             raise RuntimeError("Database not initialized. Call init_engine() first.")
-        
-        async with self.session_factory() as session:
+
+        factory, is_replica = await self._pick_session_factory(read_only, user_id)
+
+        async with factory() as session:
+            session.info["replica"] = is_replica
             try:
                 yield session
                 await session.commit()
             except Exception:
                 await session.rollback()
                 raise
-    
+
+            if user_id is not None and session.info.get("has_writes"):
+                await self.mark_user_write(user_id)
+
+    async def check_replication_lag(self) -> dict[int, float]:
+        """Проверить отставание реплик; недоступная реплика получает inf."""
+        for index, engine in enumerate(self.replica_engines):
+            try:
+                async with engine.connect() as connection:
+                    lag = (await connection.execute(REPLICATION_LAG_QUERY)).scalar()
+                self.replica_lag[index] = float(lag or 0)
+            except Exception as e:
+                logger.warning(f"Replica {index} lag check failed: {e}")
+                self.replica_lag[index] = math.inf
+
+            DB_REPLICA_LAG.labels(str(index)).set(self.replica_lag[index])
+            if self.replica_lag[index] > settings.db_replica_max_lag:
+                logger.warning(
+                    f"Replica {index} lag {self.replica_lag[index]:.1f}s exceeds "
+                    f"{settings.db_replica_max_lag}s, routing reads to primary"
+                )
+
+        return dict(self.replica_lag)
+
+    def get_replication_lag(self) -> dict[int, float]:
+        """Последнее измеренное отставание реплик в секундах."""
+        return dict(self.replica_lag)
+
+    async def monitor_replication_lag(self, interval: float) -> None:
+        """Фоновая проверка отставания реплик."""
+        while True:
+            await self.check_replication_lag()
+            await asyncio.sleep(interval)
+
     async def close(self):
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+        for engine in self.replica_engines:
+            await engine.dispose()
         if self.engine:
             await self.engine.dispose()
 
 
 # Global database manager instance
-db_manager = DatabaseManager()
\ No newline at end of file
+db_manager = DatabaseManager()
@@ -162,9 +162,22 @@ class ServiceRequest(Base):
     voice_file_unique_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     voice_duration: Mapped[int] = mapped_column()  # Duration in seconds
     voice_file_size: Mapped[Optional[int]] = mapped_column(nullable=True)  # File size in bytes
+    # Speech left after silence trimming and the audio the recognizer did not have to process
+    speech_duration: Mapped[Optional[float]] = mapped_column(nullable=True)  # Seconds
+    asr_seconds_saved: Mapped[Optional[float]] = mapped_column(nullable=True)
+    # Language the request was recognized in (ISO 639-1)
+    language: Mapped[Optional[str]] = mapped_column(String(8), nullable=True)
+    # Recognizer tier chosen by load: accurate or fast
+    recognizer_tier: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
+
+    # Chat and "processing" message edited with progress updates
+    chat_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    progress_message_id: Mapped[Optional[int]] = mapped_column(nullable=True)
 
     processed_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     response_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Response served from cache, the processor did not run
+    response_cached: Mapped[bool] = mapped_column(Boolean, default=False)
 
     status: Mapped[RequestStatus] = mapped_column(
         SQLEnum(RequestStatus),
@@ -176,6 +189,13 @@ class ServiceRequest(Base):
         default=Decimal("0.00")
     )
     is_free: Mapped[bool] = mapped_column(Boolean, default=False)
+    # User's free usage time before this request took it, restored on refusal or failure
+    previous_free_usage: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True
+    )
+    # Task priority in the queue (see app/tasks/scheduling.py)
+    priority: Mapped[int] = mapped_column(default=0)
 
     processing_started_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True),
@@ -200,6 +220,37 @@ class ServiceRequest(Base):
     user: Mapped[User] = relationship(back_populates="service_requests")
 
 
+# Candidate engine run on a sampled request next to the primary one
+class ShadowResult(Base):
+    __tablename__ = "shadow_results"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    request_id: Mapped[int] = mapped_column(ForeignKey("service_requests.id"), index=True)
+
+    kind: Mapped[str] = mapped_column(String(16))  # recognizer or processor
+    primary_engine: Mapped[str] = mapped_column(String(64))
+    candidate_engine: Mapped[str] = mapped_column(String(64))
+
+    # Timings are empty for the engine that failed
+    primary_seconds: Mapped[Optional[float]] = mapped_column(nullable=True)
+    primary_cpu_seconds: Mapped[Optional[float]] = mapped_column(nullable=True)
+    candidate_seconds: Mapped[Optional[float]] = mapped_column(nullable=True)
+    candidate_cpu_seconds: Mapped[Optional[float]] = mapped_column(nullable=True)
+
+    # Agreement with the primary output; empty if either engine failed
+    exact_match: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    similarity: Mapped[Optional[float]] = mapped_column(nullable=True)  # 0..1
+    word_error_rate: Mapped[Optional[float]] = mapped_column(nullable=True)  # Recognizers only
+    candidate_output: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        index=True
+    )
+
+
 class Statistics(Base):
     __tablename__ = "statistics"
 
@@ -225,3 +276,38 @@ class Statistics(Base):
         DateTime(timezone=True),
         server_default=func.now()
     )
+
+
+class CatalogCategory(Base):
+    __tablename__ = "catalog_categories"
+
+    category: Mapped[ServiceCategory] = mapped_column(SQLEnum(ServiceCategory), primary_key=True)
+    description: Mapped[str] = mapped_column(String(255))
+    position: Mapped[int] = mapped_column(default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
+
+
+class CatalogSubcategory(Base):
+    __tablename__ = "catalog_subcategories"
+
+    subcategory: Mapped[ServiceSubcategory] = mapped_column(SQLEnum(ServiceSubcategory), primary_key=True)
+    category: Mapped[ServiceCategory] = mapped_column(
+        SQLEnum(ServiceCategory),
+        ForeignKey("catalog_categories.category")
+    )
+    description: Mapped[str] = mapped_column(String(255))
+    price: Mapped[Decimal] = mapped_column(Numeric(precision=10, scale=2))
+    max_duration: Mapped[int] = mapped_column()  # Seconds
+    processor: Mapped[str] = mapped_column(String(50))
+    position: Mapped[int] = mapped_column(default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
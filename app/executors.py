@@ -0,0 +1,31 @@
+"""
+Пул процессов воркера для CPU-задач (распознавание фрагментов, тяжёлые обработчики)
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.config import settings
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Пул процессов, создаётся при первом обращении."""
+    global _pool
+    if _pool is None:
+        # spawn: дочерние процессы не наследуют event loop и соединения воркера
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.recognition_processes or os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_process_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -4,6 +4,9 @@ from contextlib import asynccontextmanager
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.session.base import BaseSession
+from aiogram.client.telegram import TelegramAPIServer
 from aiogram.enums import ParseMode
 from aiogram_dialog import setup_dialogs
 from loguru import logger
@@ -11,32 +14,55 @@ from loguru import logger
 from app.config import settings
 from app.database.engine import db_manager
 from app.bot.handlers import setup_handlers
+from app.bot.keyboards.inline import rebuild_keyboards
 from app.bot.middlewares.auth import AuthMiddleware
+from app.bot.middlewares.metrics import (
+    HandlerMetricsMiddleware, TelegramMetricsMiddleware, TimedMiddleware, UpdateMetricsMiddleware
+)
 from app.bot.middlewares.throttling import ThrottlingMiddleware
+from app.bot.middlewares.tracing import TelegramTracingMiddleware, UpdateTracingMiddleware
+from app.monitoring.metrics import start_metrics_server
+from app.monitoring.tracing import setup_tracing, shutdown_tracing
+from app.services.catalog import catalog_manager
 
 
-async def setup_bot() -> tuple[Bot, Dispatcher]:
+async def setup_bot(session: BaseSession | None = None) -> tuple[Bot, Dispatcher]:
     """Setup bot and dispatcher with all components."""
     
+    # Custom Bot API server (e.g. the local fake from app.testing.fake_telegram)
+    if session is None and settings.telegram_api_url != "https://api.telegram.org":
+        session = AiohttpSession(api=TelegramAPIServer.from_base(settings.telegram_api_url))
+    
     # Initialize bot
     bot = Bot(
         token=settings.bot_token,
+        session=session,
         default=DefaultBotProperties(
             parse_mode=ParseMode.HTML
         )
     )
     
+    bot.session.middleware(TelegramMetricsMiddleware())
+    bot.session.middleware(TelegramTracingMiddleware())
+    
     # Initialize dispatcher
     dp = Dispatcher()
     
     # Setup middlewares
-    dp.message.middleware(ThrottlingMiddleware())
-    dp.callback_query.middleware(ThrottlingMiddleware())
-    dp.message.middleware(AuthMiddleware())
-    dp.callback_query.middleware(AuthMiddleware())
+    dp.update.outer_middleware(UpdateMetricsMiddleware())
+    dp.update.outer_middleware(UpdateTracingMiddleware())
+    dp.message.middleware(TimedMiddleware(ThrottlingMiddleware()))
+    dp.callback_query.middleware(TimedMiddleware(ThrottlingMiddleware()))
+    dp.message.middleware(TimedMiddleware(AuthMiddleware()))
+    dp.callback_query.middleware(TimedMiddleware(AuthMiddleware()))
+    # Замер обработчиков регистрируется последним, ближе всего к хендлеру
+    dp.message.middleware(HandlerMetricsMiddleware())
+    dp.callback_query.middleware(HandlerMetricsMiddleware())
     
     # Setup handlers
     setup_handlers(dp)
+    rebuild_keyboards()
+    catalog_manager.add_listener(rebuild_keyboards)
     
     # Setup dialogs
     setup_dialogs(dp)
@@ -49,7 +75,10 @@ async def setup_database():
     """Initialize database connection."""
     try:
         db_manager.init_engine()
-        logger.info("Database connection initialized")
+        logger.info(
+            f"Database connection initialized "
+            f"({len(db_manager.replica_engines)} read replicas)"
+        )
     except Exception as e:
         logger.error(f"Database initialization failed: {e}")
         raise
@@ -58,14 +87,29 @@ async def setup_database():
 @asynccontextmanager
 async def lifespan():
     """Application lifespan context manager."""
+    lag_monitor = None
+    catalog_watcher = None
     try:
         # Startup
         await setup_database()
+        await catalog_manager.load()
+        catalog_watcher = asyncio.create_task(
+            catalog_manager.watch(settings.catalog_reload_interval)
+        )
+        if db_manager.replica_engines:
+            lag_monitor = asyncio.create_task(
+                db_manager.monitor_replication_lag(settings.db_replica_lag_check_interval)
+            )
         logger.info("Application started")
         yield
     finally:
         # Shutdown
+        if lag_monitor:
+            lag_monitor.cancel()
+        if catalog_watcher:
+            catalog_watcher.cancel()
         await db_manager.close()
+        shutdown_tracing()
         logger.info("Application shutdown")
 
 
@@ -78,6 +122,10 @@ async def main():
     
     logger.info("Starting Voice Service Bot...")
     
+    if settings.metrics_enabled:
+        start_metrics_server(settings.metrics_port)
+    setup_tracing("voice-bot")
+    
     async with lifespan():
         bot, dp = await setup_bot()
         
@@ -0,0 +1,37 @@
+"""
+Мониторинг: метрики и трассировка
+"""
+
+from .metrics import (
+    start_metrics_server,
+    instrument_engine,
+    track_stage,
+    observe_queue_wait,
+    observe_first_output,
+    http_metrics_hooks,
+)
+from .tracing import (
+    tracer,
+    setup_tracing,
+    shutdown_tracing,
+    inject_context,
+    extract_context,
+    trace_engine,
+)
+from .http import http_client_hooks
+
+__all__ = [
+    "start_metrics_server",
+    "instrument_engine",
+    "track_stage",
+    "observe_queue_wait",
+    "observe_first_output",
+    "http_metrics_hooks",
+    "tracer",
+    "setup_tracing",
+    "shutdown_tracing",
+    "inject_context",
+    "extract_context",
+    "trace_engine",
+    "http_client_hooks",
+]
@@ -0,0 +1,16 @@
+"""
+Инструментирование исходящих HTTP-клиентов
+"""
+
+from app.monitoring.metrics import http_metrics_hooks
+from app.monitoring.tracing import http_tracing_hooks
+
+
+def http_client_hooks(service: str) -> dict:
+    """Event hooks для httpx.AsyncClient: метрики и трассировка."""
+    tracing_hooks = http_tracing_hooks(service)
+    metrics_hooks = http_metrics_hooks(service)
+    return {
+        "request": tracing_hooks["request"] + metrics_hooks["request"],
+        "response": metrics_hooks["response"] + tracing_hooks["response"],
+    }
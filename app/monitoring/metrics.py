@@ -0,0 +1,229 @@
+"""
+Метрики Prometheus для бота и воркера
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Бакеты для быстрых операций (обработчики, запросы в БД, HTTP)
+FAST_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Бакеты для ожидания в очереди и этапов обработки голосовых
+SLOW_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+# Сырые длительности этапов текущего контекста для бенчмарков (None — не собираем)
+stage_durations: ContextVar[Optional[dict[str, list[float]]]] = ContextVar("stage_durations", default=None)
+
+# Бот
+UPDATE_LATENCY = Histogram(
+    "bot_update_duration_seconds",
+    "Full update processing time including middlewares",
+    ["event_type"],
+    buckets=FAST_BUCKETS,
+)
+HANDLER_LATENCY = Histogram(
+    "bot_handler_duration_seconds",
+    "Handler execution time",
+    ["router", "handler"],
+    buckets=FAST_BUCKETS,
+)
+MIDDLEWARE_LATENCY = Histogram(
+    "bot_middleware_duration_seconds",
+    "Middleware own time excluding downstream handlers",
+    ["middleware"],
+    buckets=FAST_BUCKETS,
+)
+
+# База данных
+DB_QUERIES = Counter(
+    "db_queries_total",
+    "Executed SQL statements",
+    ["role", "statement"],
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time",
+    ["role", "statement"],
+    buckets=FAST_BUCKETS,
+)
+DB_REPLICA_LAG = Gauge(
+    "db_replica_lag_seconds",
+    "Last measured replication lag",
+    ["replica"],
+)
+
+# Брокер и задачи
+BROKER_PUBLISH_LATENCY = Histogram(
+    "broker_publish_duration_seconds",
+    "Time to publish a task to the broker",
+    ["task"],
+    buckets=FAST_BUCKETS,
+)
+TASK_QUEUE_WAIT = Histogram(
+    "task_queue_wait_seconds",
+    "Time from request creation to processing start",
+    ["task"],
+    buckets=SLOW_BUCKETS,
+)
+TASK_STAGE_LATENCY = Histogram(
+    "task_stage_duration_seconds",
+    "Task processing time per stage",
+    ["task", "stage"],
+    buckets=SLOW_BUCKETS,
+)
+TASK_FIRST_OUTPUT = Histogram(
+    "task_first_output_seconds",
+    "Time from processing start to the first text shown to the user",
+    ["task"],
+    buckets=SLOW_BUCKETS,
+)
+RESPONSE_CACHE_LOOKUPS = Counter(
+    "response_cache_lookups_total",
+    "Processor response cache lookups by the tier that answered (miss if none)",
+    ["tier"],
+)
+AUDIO_QUALITY_REJECTIONS = Counter(
+    "audio_quality_rejections_total",
+    "Recordings rejected by the audio quality check",
+    ["stage", "issue"],
+)
+LANGUAGE_DETECTIONS = Counter(
+    "language_detections_total",
+    "Requests routed to a recognizer by the detected language",
+    ["language"],
+)
+RECOGNIZER_TIER_REQUESTS = Counter(
+    "recognizer_tier_requests_total",
+    "Requests recognized by each recognizer tier",
+    ["tier"],
+)
+RECOGNIZER_TIER_SWITCHES = Counter(
+    "recognizer_tier_switches_total",
+    "Recognizer tier changes by the tier switched to",
+    ["tier"],
+)
+SHADOW_RUNS = Counter(
+    "shadow_runs_total",
+    "Candidate engine runs on shadow traffic",
+    ["kind", "outcome"],
+)
+
+# Внешние HTTP-сервисы: method — метод API (sendMessage, request-payment),
+# status — класс ответа (2xx, 4xx, 5xx) или error, если ответа нет
+HTTP_CLIENT_LATENCY = Histogram(
+    "http_client_duration_seconds",
+    "Outbound HTTP request time",
+    ["service", "method", "status"],
+    buckets=FAST_BUCKETS,
+)
+
+_STATEMENT_KINDS = {"SELECT", "INSERT", "UPDATE", "DELETE"}
+
+
+def start_metrics_server(port: int) -> None:
+    """Запустить HTTP-эндпоинт /metrics."""
+    start_http_server(port)
+    logger.info(f"Metrics endpoint listening on :{port}")
+
+
+def statement_kind(statement: str) -> str:
+    """Тип SQL-выражения для метки метрики."""
+    head = statement.lstrip().split(None, 1)
+    kind = head[0].upper() if head else ""
+    return kind if kind in _STATEMENT_KINDS else "OTHER"
+
+
+def instrument_engine(engine: AsyncEngine, role: str) -> None:
+    """Считать количество и длительность запросов движка."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+        kind = statement_kind(statement)
+        DB_QUERIES.labels(role, kind).inc()
+        DB_QUERY_LATENCY.labels(role, kind).observe(elapsed)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        started = conn.info.get("query_started_at") if conn is not None else None
+        if started:
+            started.pop()
+
+
+@contextmanager
+def track_stage(task: str, stage: str) -> Iterator[None]:
+    """Замерить длительность этапа задачи."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        TASK_STAGE_LATENCY.labels(task, stage).observe(elapsed)
+        collector = stage_durations.get()
+        if collector is not None:
+            collector.setdefault(stage, []).append(elapsed)
+
+
+def observe_queue_wait(task: str, created_at: Optional[datetime], started_at: datetime) -> None:
+    """Записать время ожидания в очереди (created_at → processing_started_at)."""
+    if created_at is None:
+        return
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    if started_at.tzinfo is None:
+        started_at = started_at.replace(tzinfo=timezone.utc)
+    wait = max((started_at - created_at).total_seconds(), 0.0)
+    TASK_QUEUE_WAIT.labels(task).observe(wait)
+    collector = stage_durations.get()
+    if collector is not None:
+        collector.setdefault("queue_wait", []).append(wait)
+
+
+def observe_first_output(task: str, seconds: float) -> None:
+    """Записать время до первого текста, показанного пользователю (частичного или итогового)."""
+    TASK_FIRST_OUTPUT.labels(task).observe(seconds)
+    collector = stage_durations.get()
+    if collector is not None:
+        collector.setdefault("first_output", []).append(seconds)
+
+
+def http_api_method(path: str) -> str:
+    """Метод API по пути запроса: последний сегмент, скачивание файла Bot API — file."""
+    if path.startswith("/file/"):
+        return "file"
+    return path.rstrip("/").rsplit("/", 1)[-1] or "/"
+
+
+def http_status_class(status_code: int) -> str:
+    return f"{status_code // 100}xx"
+
+
+def http_metrics_hooks(service: str) -> dict:
+    """Event hooks httpx.AsyncClient для замера исходящих запросов."""
+
+    async def on_request(request):
+        request.extensions["metrics_started_at"] = time.perf_counter()
+
+    async def on_response(response):
+        started = response.request.extensions.get("metrics_started_at")
+        if started is None:
+            return
+        HTTP_CLIENT_LATENCY.labels(
+            service, http_api_method(response.request.url.path), http_status_class(response.status_code)
+        ).observe(time.perf_counter() - started)
+
+    return {"request": [on_request], "response": [on_response]}
@@ -0,0 +1,138 @@
+"""
+Трассировка запросов: апдейт Telegram → брокер → воркер
+"""
+
+import logging
+import os
+import sys
+from typing import Any, Mapping, Optional
+
+from opentelemetry import context as otel_context
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+from app.monitoring.metrics import statement_kind
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("voice_service")
+
+# Длина SQL в атрибутах спана
+MAX_STATEMENT_LENGTH = 500
+
+
+def tracing_enabled() -> bool:
+    return settings.tracing_exporter != "none"
+
+
+def setup_tracing(service_name: str) -> None:
+    """Настроить провайдер трассировки с экспортом в stdout или файл."""
+    if not tracing_enabled():
+        return
+
+    if settings.tracing_exporter == "file":
+        out = open(settings.tracing_file, "a", encoding="utf-8")
+    else:
+        out = sys.stdout
+
+    exporter = ConsoleSpanExporter(
+        service_name=service_name,
+        out=out,
+        formatter=lambda span: span.to_json(indent=None) + os.linesep,
+    )
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    logger.info(
+        f"Tracing enabled: exporter={settings.tracing_exporter}, "
+        f"sample_ratio={settings.tracing_sample_ratio}"
+    )
+
+
+def shutdown_tracing() -> None:
+    """Сбросить буфер спанов при остановке процесса."""
+    provider = trace.get_tracer_provider()
+    if isinstance(provider, TracerProvider):
+        provider.shutdown()
+
+
+def inject_context(carrier: dict, context: Optional[otel_context.Context] = None) -> dict:
+    """Записать контекст трассировки (traceparent) в carrier."""
+    propagate.inject(carrier, context=context)
+    return carrier
+
+
+def extract_context(carrier: Mapping[str, Any]) -> otel_context.Context:
+    """Восстановить контекст трассировки из carrier."""
+    return propagate.extract({key: str(value) for key, value in carrier.items()})
+
+
+def end_span(span: trace.Span, error: Optional[BaseException] = None) -> None:
+    """Завершить спан, отметив ошибку при необходимости."""
+    if error is not None:
+        span.record_exception(error)
+        span.set_status(Status(StatusCode.ERROR, str(error)))
+    span.end()
+
+
+def trace_engine(engine: AsyncEngine) -> None:
+    """Создавать спан на каждый SQL-запрос движка."""
+    if not tracing_enabled():
+        return
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        span = tracer.start_span(
+            f"db {statement_kind(statement)}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": "postgresql",
+                "db.statement": statement[:MAX_STATEMENT_LENGTH],
+            },
+        )
+        conn.info.setdefault("trace_spans", []).append(span)
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("trace_spans")
+        if spans:
+            spans.pop().end()
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        spans = conn.info.get("trace_spans") if conn is not None else None
+        if spans:
+            end_span(spans.pop(), exception_context.original_exception)
+
+
+def http_tracing_hooks(service: str) -> dict:
+    """Event hooks httpx.AsyncClient: спан на исходящий запрос."""
+
+    async def on_request(request):
+        request.extensions["trace_span"] = tracer.start_span(
+            f"http {service} {request.method}",
+            kind=SpanKind.CLIENT,
+            attributes={"http.method": request.method, "peer.service": service},
+        )
+
+    async def on_response(response):
+        span = response.request.extensions.pop("trace_span", None)
+        if span is None:
+            return
+        span.set_attribute("http.status_code", response.status_code)
+        if response.status_code >= 400:
+            span.set_status(Status(StatusCode.ERROR))
+        span.end()
+
+    return {"request": [on_request], "response": [on_response]}
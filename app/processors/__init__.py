@@ -0,0 +1,24 @@
+"""
+Обработчики распознанного текста по подкатегориям
+"""
+
+from . import artistic, business, numbers  # noqa: F401  регистрация обработчиков
+from .base import BaseProcessor, DefaultProcessor, ProcessorProfile
+from .registry import (
+    get_processor,
+    register_processor,
+    registered_keys,
+    run_processor,
+    setup_processors,
+)
+
+__all__ = [
+    "BaseProcessor",
+    "DefaultProcessor",
+    "ProcessorProfile",
+    "get_processor",
+    "register_processor",
+    "registered_keys",
+    "run_processor",
+    "setup_processors",
+]
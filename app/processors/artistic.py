@@ -0,0 +1,67 @@
+"""
+Обработчики художественной категории
+"""
+
+import re
+
+from app.processors.base import BaseProcessor
+from app.processors.registry import register_processor
+
+
+@register_processor
+class DialogsProcessor(BaseProcessor):
+    key = "dialogs"
+
+    def process(self, text: str) -> str:
+        return f"🎭 Художественная интерпретация диалога:\n\n" \
+               f"Ваше сообщение преобразовано в красивый диалог:\n" \
+               f"— {text}\n— Замечательно! Давайте это обсудим подробнее."
+
+
+@register_processor
+class NatureProcessor(BaseProcessor):
+    key = "nature"
+
+    def process(self, text: str) -> str:
+        return f"🌿 Природное описание:\n\n" \
+               f"Ваши слова звучат как шёпот леса: '{text}'\n" \
+               f"Словно ветер несёт эти мысли через поля и луга..."
+
+
+@register_processor
+class MusicProcessor(BaseProcessor):
+    """Ритм фразы по числу слогов (гласных) в словах."""
+
+    key = "music"
+
+    def setup(self) -> None:
+        self._vowels = re.compile(r"[аеёиоуыэюяaeiouy]", re.IGNORECASE)
+        self._words = re.compile(r"\w+")
+
+    def process(self, text: str) -> str:
+        syllables = [len(self._vowels.findall(word)) or 1 for word in self._words.findall(text)]
+        total = sum(syllables)
+        if total >= 24:
+            tempo = "Allegro — быстрый, живой темп"
+        elif total >= 12:
+            tempo = "Moderato — умеренный темп"
+        else:
+            tempo = "Adagio — медленный, спокойный темп"
+        pattern = " ".join("♪" * count for count in syllables[:16])
+
+        return f"🎵 Музыкальная интерпретация:\n\n" \
+               f"Ритмический рисунок: {pattern}\n" \
+               f"Слогов: {total}\n" \
+               f"Темп: {tempo}\n\n" \
+               f"Текст: {text}"
+
+
+@register_processor
+class PoetryProcessor(BaseProcessor):
+    key = "poetry"
+
+    def process(self, text: str) -> str:
+        return f"📜 Поэтическая обработка:\n\n" \
+               f"Из ваших слов родились строки:\n" \
+               f"'{text[:30]}...'\n" \
+               f"Как музыка души, что сердце трогает..."
@@ -0,0 +1,47 @@
+"""
+Базовый интерфейс обработчика распознанного текста
+"""
+
+from abc import ABC, abstractmethod
+from enum import Enum
+
+
+class ProcessorProfile(str, Enum):
+    """Где выполнять обработчик."""
+
+    INLINE = "inline"  # Дёшево: прямо в event loop воркера
+    THREAD = "thread"  # Блокирующий ввод-вывод или код, отпускающий GIL
+    PROCESS = "process"  # CPU-нагрузка на Python: пул процессов
+
+
+class BaseProcessor(ABC):
+    """Обработчик подкатегории: распознанный текст → ответ пользователю.
+
+    Экземпляр создаётся один раз на процесс, setup() готовит тяжёлые ресурсы
+    (регулярные выражения, словари). При изменении результата обработки
+    поднимается version — по ней инвалидируются сохранённые ответы.
+    """
+
+    key: str = "default"
+    version: str = "1"
+    profile: ProcessorProfile = ProcessorProfile.INLINE
+    # process_batch векторный: одновременные запросы воркера собираются в пачку
+    batched: bool = False
+
+    def setup(self) -> None:
+        """Подготовить ресурсы обработчика."""
+
+    @abstractmethod
+    def process(self, text: str) -> str:
+        """Сформировать ответ по распознанному тексту."""
+
+    def process_batch(self, texts: list[str]) -> list[str]:
+        """Ответы для пачки текстов; векторные обработчики считают её за один проход."""
+        return [self.process(text) for text in texts]
+
+
+class DefaultProcessor(BaseProcessor):
+    """Ответ для обработчиков, которых нет в реестре."""
+
+    def process(self, text: str) -> str:
+        return f"✅ Обработка завершена.\n\nИсходный текст: {text}"
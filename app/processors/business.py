@@ -0,0 +1,86 @@
+"""
+Обработчики деловой категории
+"""
+
+import re
+
+from app.processors.base import BaseProcessor
+from app.processors.registry import register_processor
+
+# Отрасли права и слова, по которым они узнаются
+LAW_AREAS = {
+    "Гражданский кодекс РФ (договоры и обязательства)": ("договор", "обязательств", "сделк", "поставк", "подряд"),
+    "Жилищный кодекс РФ": ("аренд", "квартир", "жиль", "жилищ", "коммунальн"),
+    "Трудовой кодекс РФ": ("работ", "зарплат", "увольнен", "отпуск", "трудов"),
+    "Семейный кодекс РФ": ("брак", "развод", "алимент", "наследств"),
+    "Кодекс об административных правонарушениях": ("штраф", "нарушени", "протокол"),
+    "Закон «О защите прав потребителей»": ("возврат", "товар", "гаранти", "магазин", "покупк"),
+}
+
+
+@register_processor
+class AgreementsProcessor(BaseProcessor):
+    key = "agreements"
+
+    def process(self, text: str) -> str:
+        return f"🤝 Структурированное деловое предложение:\n\n" \
+               f"ПРЕДМЕТ: Обсуждение проекта\n" \
+               f"СОДЕРЖАНИЕ: {text}\n" \
+               f"СЛЕДУЮЩИЕ ШАГИ: Организация встречи и подготовка документов"
+
+
+@register_processor
+class LawsProcessor(BaseProcessor):
+    """Подбор отраслей права по ключевым словам."""
+
+    key = "laws"
+
+    def setup(self) -> None:
+        self._areas = [
+            (area, re.compile(r"\b(?:" + "|".join(stems) + r")\w*", re.IGNORECASE))
+            for area, stems in LAW_AREAS.items()
+        ]
+
+    def process(self, text: str) -> str:
+        found = []
+        for area, pattern in self._areas:
+            matches = {match.lower() for match in pattern.findall(text)}
+            if matches:
+                found.append(f"• {area}: {', '.join(sorted(matches))}")
+
+        if not found:
+            return f"⚖️ Правовой анализ:\n\n" \
+                   f"Явных правовых вопросов не найдено.\n" \
+                   f"Исходный текст: {text}"
+        return f"⚖️ Правовой анализ:\n\n" \
+               f"Применимые нормы:\n" + "\n".join(found) + \
+               f"\n\nРекомендация: уточните детали у юриста."
+
+
+@register_processor
+class PresentationsProcessor(BaseProcessor):
+    key = "presentations"
+
+    def process(self, text: str) -> str:
+        return f"📊 Структура для презентации:\n\n" \
+               f"1. Введение: {text[:50]}...\n" \
+               f"2. Основная часть: Развитие темы\n" \
+               f"3. Заключение: Выводы и предложения"
+
+
+@register_processor
+class NegotiationsProcessor(BaseProcessor):
+    """План переговоров: тезисы по предложениям сообщения."""
+
+    key = "negotiations"
+
+    def setup(self) -> None:
+        self._sentences = re.compile(r"(?<=[.!?])\s+")
+
+    def process(self, text: str) -> str:
+        points = [sentence.strip() for sentence in self._sentences.split(text) if sentence.strip()]
+        agenda = "\n".join(f"{index}. {point}" for index, point in enumerate(points, start=1))
+        return f"🤝 План переговоров:\n\n" \
+               f"ПОВЕСТКА:\n{agenda}\n\n" \
+               f"ПОЗИЦИЯ: Зафиксировать интересы сторон по каждому пункту\n" \
+               f"ИТОГ: Протокол договорённостей и сроки"
@@ -0,0 +1,92 @@
+"""
+Кэш ответов обработчиков: LRU в памяти воркера и Redis, ключ включает версию обработчика
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import redis.asyncio as redis
+
+from app.config import settings
+from app.database.models import ServiceSubcategory
+from app.monitoring.metrics import RESPONSE_CACHE_LOOKUPS
+from app.processors.base import BaseProcessor
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "response"
+
+
+def response_key(text: str, subcategory: ServiceSubcategory, processor: BaseProcessor) -> str:
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{KEY_PREFIX}:{processor.key}:{processor.version}:{subcategory.value}:{digest}"
+
+
+class ResponseCache:
+    """Двухуровневый кэш: LRU в памяти и Redis, оба с TTL."""
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._client: Optional[redis.Redis] = None
+
+    def _get_client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.from_url(settings.redis_url, decode_responses=True)
+        return self._client
+
+    def _get_local(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: str) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[str]:
+        value = self._get_local(key)
+        if value is not None:
+            RESPONSE_CACHE_LOOKUPS.labels("memory").inc()
+            return value
+
+        try:
+            value = await self._get_client().get(key)
+        except redis.RedisError as e:
+            # Кэш необязателен: при недоступном Redis просто обрабатываем заново
+            logger.warning(f"Response cache read failed: {e}")
+            value = None
+
+        if value is None:
+            RESPONSE_CACHE_LOOKUPS.labels("miss").inc()
+            return None
+        RESPONSE_CACHE_LOOKUPS.labels("redis").inc()
+        self._set_local(key, value)
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        self._set_local(key, value)
+        try:
+            await self._get_client().set(key, value, ex=self.ttl)
+        except redis.RedisError as e:
+            logger.warning(f"Response cache write failed: {e}")
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+response_cache = ResponseCache(settings.response_cache_size, settings.response_cache_ttl)
@@ -0,0 +1,81 @@
+"""
+Обработчики категории «Числа»
+"""
+
+from app.processors.base import BaseProcessor
+from app.processors.registry import register_processor
+from app.text import (
+    calculate, extract_phones, extract_series, format_phone, format_quantity, normalize_numbers,
+    render_summary, summarize_batch,
+)
+
+
+@register_processor
+class PhoneNumbersProcessor(BaseProcessor):
+    key = "phone_numbers"
+    version = "2"
+
+    def process(self, text: str) -> str:
+        phones = extract_phones(text)
+        if phones:
+            return f"📞 Найденные контакты:\n\n" + \
+                   "\n".join([f"• {format_phone(phone.e164)}" for phone in phones])
+        return f"📞 В сообщении не найдено номеров телефонов.\n" \
+               f"Исходный текст: {text}"
+
+
+@register_processor
+class RoutesProcessor(BaseProcessor):
+    key = "routes"
+    version = "2"
+
+    def process(self, text: str) -> str:
+        return f"🗺️ Анализ маршрута:\n\n" \
+               f"Описание: {normalize_numbers(text)}\n" \
+               f"Рекомендуемый транспорт: Общественный транспорт\n" \
+               f"Примерное время: 30-45 минут"
+
+
+@register_processor
+class StatisticsProcessor(BaseProcessor):
+    """Сводка по числовым рядам сообщения (NumPy, пачкой)."""
+
+    key = "statistics"
+    version = "3"
+    batched = True
+
+    def process(self, text: str) -> str:
+        return self.process_batch([text])[0]
+
+    def process_batch(self, texts: list[str]) -> list[str]:
+        per_text = [extract_series(normalize_numbers(text)) for text in texts]
+        summaries = iter(summarize_batch([series for items in per_text for series in items]))
+
+        responses = []
+        for text, items in zip(texts, per_text):
+            if not items:
+                responses.append(f"📈 В сообщении не найдено чисел.\n"
+                                 f"Исходный текст: {text}")
+                continue
+            blocks = [render_summary(next(summaries)) for _ in items]
+            responses.append(f"📈 Статистическая сводка:\n\n" + "\n\n".join(blocks))
+        return responses
+
+
+@register_processor
+class CalculationsProcessor(BaseProcessor):
+    """Вычисление выражений: числа словами, проценты, рубли и единицы."""
+
+    key = "calculations"
+    version = "3"
+
+    def process(self, text: str) -> str:
+        lines = []
+        for calculation in calculate(text):
+            result = format_quantity(calculation.result) if calculation.result else calculation.error
+            lines.append(f"• {calculation.source} = {result}")
+
+        if not lines:
+            return f"🧮 В сообщении не найдено вычислений.\n" \
+                   f"Исходный текст: {text}"
+        return f"🧮 Результаты вычислений:\n\n" + "\n".join(lines)
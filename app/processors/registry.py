@@ -0,0 +1,110 @@
+"""
+Реестр обработчиков по ключу из каталога услуг (SubcategoryInfo.processor)
+"""
+
+import asyncio
+import logging
+
+from app.config import settings
+from app.executors import get_process_pool
+from app.processors.base import BaseProcessor, DefaultProcessor, ProcessorProfile
+
+logger = logging.getLogger(__name__)
+
+_registry: dict[str, type[BaseProcessor]] = {}
+# Экземпляры процесса: ресурсы готовятся один раз
+_instances: dict[str, BaseProcessor] = {}
+# Тексты, ждущие общей пачки, по ключу обработчика
+_batches: dict[str, list[tuple[str, asyncio.Future]]] = {}
+_flush_tasks: set[asyncio.Task] = set()
+
+
+def register_processor(cls: type[BaseProcessor]) -> type[BaseProcessor]:
+    """Декоратор: зарегистрировать обработчик под его ключом."""
+    if cls.key in _registry:
+        raise ValueError(f"Duplicate processor key: {cls.key}")
+    _registry[cls.key] = cls
+    return cls
+
+
+def registered_keys() -> list[str]:
+    return sorted(_registry)
+
+
+def get_processor(key: str) -> BaseProcessor:
+    """Экземпляр обработчика процесса; неизвестный ключ — обработчик по умолчанию."""
+    processor = _instances.get(key)
+    if processor is None:
+        cls = _registry.get(key)
+        if cls is None:
+            logger.warning(f"Unknown processor {key}, using default")
+            cls = DefaultProcessor
+        processor = cls()
+        processor.setup()
+        _instances[key] = processor
+    return processor
+
+
+def setup_processors() -> None:
+    """Подготовить все зарегистрированные обработчики при старте воркера."""
+    for key in _registry:
+        get_processor(key)
+
+
+def _process_in_child(key: str, method: str, argument):
+    """Выполняется в дочернем процессе пула."""
+    import app.processors  # noqa: F401  регистрация обработчиков при spawn
+
+    return getattr(get_processor(key), method)(argument)
+
+
+async def _execute(key: str, method: str, argument):
+    """Вызвать process или process_batch там, где указывает профиль обработчика."""
+    processor = get_processor(key)
+    if processor.profile == ProcessorProfile.INLINE:
+        return getattr(processor, method)(argument)
+    if processor.profile == ProcessorProfile.THREAD:
+        return await asyncio.to_thread(getattr(processor, method), argument)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), _process_in_child, key, method, argument)
+
+
+async def _flush_batch(key: str) -> None:
+    """Через окно накопления обработать пачку одним вызовом process_batch."""
+    await asyncio.sleep(settings.processor_batch_window)
+    batch = _batches.pop(key)
+    try:
+        responses = await _execute(key, "process_batch", [text for text, _ in batch])
+    except Exception as e:
+        responses = [e] * len(batch)
+    for (_, future), response in zip(batch, responses):
+        if future.done():
+            continue
+        if isinstance(response, Exception):
+            future.set_exception(response)
+        else:
+            future.set_result(response)
+
+
+async def _run_batched(key: str, text: str) -> str:
+    future = asyncio.get_running_loop().create_future()
+    batch = _batches.get(key)
+    if batch is None:
+        batch = _batches[key] = []
+        task = asyncio.create_task(_flush_batch(key))
+        _flush_tasks.add(task)
+        task.add_done_callback(_flush_tasks.discard)
+    batch.append((text, future))
+    return await future
+
+
+async def run_processor(key: str, text: str) -> str:
+    """Выполнить обработчик там, где указывает его профиль.
+
+    Тексты для обработчиков с векторным process_batch, пришедшие
+    в пределах processor_batch_window, обрабатываются одной пачкой.
+    """
+    if get_processor(key).batched and settings.processor_batch_window > 0:
+        return await _run_batched(key, text)
+    return await _execute(key, "process", text)
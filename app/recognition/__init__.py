@@ -0,0 +1,114 @@
+"""
+Распознавание речи
+"""
+
+from typing import TYPE_CHECKING, Optional
+
+from app.config import settings
+
+from .base import BaseRecognizer
+from .chunked import ChunkedRecognizer
+from .fake import FakeRecognizer
+from .language import LanguageGuess, identify_text
+from .mock import MockRecognizer
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Распознаватели процесса по (языку, быстрый уровень); создаются при первом запросе
+_recognizers: dict[tuple[str, bool], BaseRecognizer] = {}
+_language_id_recognizer: Optional[BaseRecognizer] = None
+
+
+def create_recognizer(name: str, language: Optional[str] = None) -> BaseRecognizer:
+    """Создать распознаватель по имени из настроек."""
+    if name == "mock":
+        recognizer = MockRecognizer()
+    elif name in ("fake", "fake_fast"):
+        cost = settings.fake_recognizer_cost if name == "fake" else settings.fake_fast_recognizer_cost
+        recognizer = FakeRecognizer(
+            cost_per_second=cost,
+            mode=settings.fake_recognizer_mode,
+            requires_audio=settings.fake_recognizer_requires_audio,
+        )
+    else:
+        raise ValueError(f"Unknown recognizer: {name}")
+    # По имени распознаватель пересоздаётся в дочерних процессах
+    recognizer.name = name
+    recognizer.language = language
+    return recognizer
+
+
+def get_recognizer(language: Optional[str] = None, fast: bool = False) -> BaseRecognizer:
+    """Распознаватель процесса для языка (по умолчанию — первого из настроек).
+
+    fast — быстрый уровень (tier_fast_recognizer) вместо распознавателя
+    языка. Создаётся при первом обращении, поэтому воркер загружает
+    только модели, которые ему встретились. Распознаватели с поддержкой
+    PCM оборачиваются в ChunkedRecognizer, если включено распознавание
+    по фрагментам.
+    """
+    language = language or settings.default_language
+    recognizer = _recognizers.get((language, fast))
+    if recognizer is None:
+        name = settings.language_recognizers.get(language)
+        if name is None:
+            raise ValueError(f"No recognizer configured for language: {language}")
+        if fast and settings.tier_fast_recognizer:
+            name = settings.tier_fast_recognizer
+        recognizer = create_recognizer(name, language)
+        if settings.recognition_chunk_seconds > 0 and recognizer.supports_pcm:
+            recognizer = ChunkedRecognizer(
+                recognizer,
+                max_chunk_seconds=settings.recognition_chunk_seconds,
+                overlap_seconds=settings.recognition_chunk_overlap,
+            )
+        _recognizers[language, fast] = recognizer
+    return recognizer
+
+
+def language_id_enabled() -> bool:
+    """Определять язык нужно, только если настроено больше одного."""
+    return len(settings.language_recognizers) > 1
+
+
+def _get_language_id_recognizer(fast: bool) -> BaseRecognizer:
+    global _language_id_recognizer
+    if not settings.language_id_recognizer:
+        return get_recognizer(fast=fast)
+    if _language_id_recognizer is None:
+        _language_id_recognizer = create_recognizer(settings.language_id_recognizer)
+    return _language_id_recognizer
+
+
+async def detect_language(pcm: "np.ndarray", sample_rate: int, fast: bool = False) -> str:
+    """Язык записи по первому проходу распознавания её начала.
+
+    Без отдельного language_id_recognizer первый проход делает
+    распознаватель языка по умолчанию того же уровня. Неуверенный
+    результат и распознаватели без поддержки PCM дают язык по умолчанию.
+    """
+    languages = settings.language_recognizers
+    recognizer = _get_language_id_recognizer(fast)
+    if not recognizer.supports_pcm:
+        return settings.default_language
+
+    head = pcm[:int(settings.language_id_seconds * sample_rate)]
+    guess = identify_text(await recognizer.recognize_samples(head, sample_rate), languages)
+    if guess is None or guess.confidence < settings.language_id_min_confidence:
+        return settings.default_language
+    return guess.language
+
+
+__all__ = [
+    "BaseRecognizer",
+    "ChunkedRecognizer",
+    "FakeRecognizer",
+    "LanguageGuess",
+    "MockRecognizer",
+    "create_recognizer",
+    "detect_language",
+    "get_recognizer",
+    "identify_text",
+    "language_id_enabled",
+]
@@ -0,0 +1,42 @@
+"""
+Базовый интерфейс распознавания речи
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class BaseRecognizer(ABC):
+    """Распознаватель речи: голосовое сообщение → текст."""
+
+    name: str = "base"
+    # Нужно ли скачивать файл перед распознаванием
+    requires_audio: bool = True
+    # Умеет ли распознавать декодированный PCM (нужно для распознавания по фрагментам)
+    supports_pcm: bool = False
+    # Язык распознавания (None — распознаватель не привязан к языку)
+    language: Optional[str] = None
+
+    @abstractmethod
+    async def recognize(self, audio: Optional[bytes], duration: int) -> str:
+        """Распознать речь. audio — содержимое файла или None, если не требуется."""
+
+    def recognize_pcm(self, pcm: "np.ndarray", sample_rate: int) -> str:
+        """Синхронно распознать фрагмент int16 PCM; выполняется в пуле процессов."""
+        raise NotImplementedError(f"{self.name} recognizer does not support PCM input")
+
+    async def recognize_samples(self, pcm: "np.ndarray", sample_rate: int) -> str:
+        """Распознать уже декодированную запись, не блокируя event loop."""
+        return await asyncio.to_thread(self.recognize_pcm, pcm, sample_rate)
+
+    async def recognize_stream(self, audio: Optional[bytes], duration: int) -> AsyncIterator[str]:
+        """Частичные результаты: каждый — текст, распознанный к этому моменту; последний — итоговый."""
+        yield await self.recognize(audio, duration)
+
+    async def stream_samples(self, pcm: "np.ndarray", sample_rate: int) -> AsyncIterator[str]:
+        """Частичные результаты для декодированной записи."""
+        yield await self.recognize_samples(pcm, sample_rate)
@@ -0,0 +1,104 @@
+"""
+Распознавание длинных записей по фрагментам в пуле процессов
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import AsyncIterator, Optional
+
+import numpy as np
+
+from app.audio import SAMPLE_RATE, decode_audio, split_on_silence, stitch_transcripts
+from app.executors import get_process_pool
+from app.recognition.base import BaseRecognizer
+
+# Распознаватели дочернего процесса по (имени, языку), создаются при первом фрагменте
+_process_recognizers: dict[tuple[str, Optional[str]], BaseRecognizer] = {}
+
+
+def _recognize_chunk(recognizer_name: str, language: Optional[str], pcm: np.ndarray, sample_rate: int) -> str:
+    """Выполняется в дочернем процессе."""
+    recognizer = _process_recognizers.get((recognizer_name, language))
+    if recognizer is None:
+        from app.recognition import create_recognizer
+
+        recognizer = create_recognizer(recognizer_name, language)
+        _process_recognizers[recognizer_name, language] = recognizer
+    return recognizer.recognize_pcm(pcm, sample_rate)
+
+
+class ChunkedRecognizer(BaseRecognizer):
+    """Обёртка над распознавателем с поддержкой PCM: фрагменты распознаются параллельно."""
+
+    name = "chunked"
+    requires_audio = True
+    supports_pcm = True
+
+    def __init__(
+        self,
+        inner: BaseRecognizer,
+        max_chunk_seconds: float,
+        overlap_seconds: float,
+        executor: Optional[Executor] = None,
+    ):
+        if not inner.supports_pcm:
+            raise ValueError(f"{inner.name} recognizer does not support PCM input")
+        self.inner = inner
+        self.language = inner.language
+        self.max_chunk_seconds = max_chunk_seconds
+        self.overlap_seconds = overlap_seconds
+        self.executor = executor
+
+    async def recognize(self, audio: Optional[bytes], duration: int) -> str:
+        if audio is None:
+            return await self.inner.recognize(audio, duration)
+        return await self.recognize_samples(await decode_audio(audio, SAMPLE_RATE), SAMPLE_RATE)
+
+    async def recognize_stream(self, audio: Optional[bytes], duration: int) -> AsyncIterator[str]:
+        if audio is None:
+            yield await self.inner.recognize(audio, duration)
+            return
+        async for text in self.stream_samples(await decode_audio(audio, SAMPLE_RATE), SAMPLE_RATE):
+            yield text
+
+    def recognize_pcm(self, pcm: np.ndarray, sample_rate: int) -> str:
+        return self.inner.recognize_pcm(pcm, sample_rate)
+
+    async def recognize_samples(self, pcm: np.ndarray, sample_rate: int) -> str:
+        text = ""
+        async for text in self.stream_samples(pcm, sample_rate):
+            pass
+        return text
+
+    async def stream_samples(self, pcm: np.ndarray, sample_rate: int) -> AsyncIterator[str]:
+        """Частичные результаты по мере готовности фрагментов.
+
+        Фрагменты распознаются параллельно, а текст отдаётся для непрерывного
+        начала записи, поэтому показанный результат не меняется задним числом.
+        """
+        chunks = split_on_silence(
+            pcm,
+            sample_rate,
+            max_chunk_seconds=self.max_chunk_seconds,
+            overlap_seconds=self.overlap_seconds,
+        )
+
+        loop = asyncio.get_running_loop()
+        executor = self.executor or get_process_pool()
+        futures = [
+            loop.run_in_executor(
+                executor, _recognize_chunk,
+                self.inner.name, self.inner.language, pcm[chunk.start:chunk.end], sample_rate
+            )
+            for chunk in chunks
+        ]
+
+        texts: list[str] = []
+        try:
+            for future in futures:
+                texts.append(await future)
+                yield stitch_transcripts(chunks[:len(texts)], texts)
+        finally:
+            # Генератор закрыт раньше времени — не тратим пул на ненужные фрагменты
+            for future in futures:
+                future.cancel()
@@ -0,0 +1,56 @@
+"""
+Детерминированный распознаватель для бенчмарков
+"""
+
+import asyncio
+import time
+import zlib
+from typing import TYPE_CHECKING, Optional
+
+from app.recognition.base import BaseRecognizer
+from app.recognition.mock import MOCK_TEXTS
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class FakeRecognizer(BaseRecognizer):
+    """Стоимость пропорциональна длительности записи, текст зависит только от входа.
+
+    mode="sleep" — ожидание без нагрузки (внешний сервис распознавания),
+    mode="cpu" — занятый цикл в event loop (локальная модель в процессе воркера).
+    """
+
+    name = "fake"
+    supports_pcm = True
+
+    def __init__(self, cost_per_second: float, mode: str = "sleep", requires_audio: bool = False):
+        if mode not in ("sleep", "cpu"):
+            raise ValueError(f"Unknown fake recognizer mode: {mode}")
+        self.cost_per_second = cost_per_second
+        self.mode = mode
+        self.requires_audio = requires_audio
+
+    async def recognize(self, audio: Optional[bytes], duration: int) -> str:
+        cost = self.cost_per_second * duration
+        if self.mode == "sleep":
+            await asyncio.sleep(cost)
+        else:
+            _busy_wait(cost)
+
+        checksum = zlib.crc32(audio) if audio else duration
+        return MOCK_TEXTS[checksum % len(MOCK_TEXTS)]
+
+    def recognize_pcm(self, pcm: "np.ndarray", sample_rate: int) -> str:
+        cost = self.cost_per_second * len(pcm) / sample_rate
+        if self.mode == "sleep":
+            time.sleep(cost)
+        else:
+            _busy_wait(cost)
+        return MOCK_TEXTS[zlib.crc32(pcm.tobytes()) % len(MOCK_TEXTS)]
+
+
+def _busy_wait(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
@@ -0,0 +1,75 @@
+"""
+Определение языка по короткому тексту первого прохода распознавания
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Collection, NamedTuple, Optional
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+# Логарифм вероятности буквы вне алфавита языка относительно буквы алфавита
+FOREIGN_LETTER_PENALTY = math.log(1000)
+# Служебное слово языка делает его примерно в e^3 раз вероятнее
+WORD_BONUS = 3.0
+
+_RUSSIAN = "абвгдеёжзийклмнопрстуфхцчшщъыьэюя"
+
+
+class LanguageProfile(NamedTuple):
+    alphabet: frozenset[str]
+    words: frozenset[str]
+
+
+def _profile(alphabet: str, words: str) -> LanguageProfile:
+    return LanguageProfile(frozenset(alphabet), frozenset(words.split()))
+
+
+LANGUAGES = {
+    "ru": _profile(_RUSSIAN, "и в не на что это как я с он а по мне нужно если но"),
+    "uk": _profile(
+        "абвгґдеєжзиіїйклмнопрстуфхцчшщьюя",
+        "і та що це як й у з мені він але треба якщо",
+    ),
+    "be": _profile(
+        "абвгдеёжзійклмнопрстуўфхцчшыьэюя",
+        "і ў што гэта як з мне ён але трэба калі",
+    ),
+    "kk": _profile(_RUSSIAN + "әғқңөұүһі", "және бұл мен бір деп үшін жоқ бар сіз керек егер"),
+    "en": _profile("abcdefghijklmnopqrstuvwxyz", "the and is to of a in that it you i for this we"),
+    "de": _profile(
+        "abcdefghijklmnopqrstuvwxyzäöüß",
+        "und der die das ist nicht ich du zu ein mit es sie wir was wie",
+    ),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class LanguageGuess:
+    language: str
+    confidence: float  # Вероятность лучшего языка среди кандидатов
+
+
+def identify_text(text: str, languages: Optional[Collection[str]] = None) -> Optional[LanguageGuess]:
+    """Язык текста среди languages (по умолчанию — все из LANGUAGES); None, если букв нет."""
+    candidates = [language for language in LANGUAGES if languages is None or language in languages]
+    words = WORD_PATTERN.findall(text.lower())
+    letters = Counter("".join(words))
+    if not candidates or not letters:
+        return None
+
+    total = sum(letters.values())
+    scores = {}
+    for language in candidates:
+        profile = LANGUAGES[language]
+        foreign = sum(count for letter, count in letters.items() if letter not in profile.alphabet)
+        scores[language] = (
+            -total * math.log(len(profile.alphabet))
+            - foreign * FOREIGN_LETTER_PENALTY
+            + WORD_BONUS * sum(word in profile.words for word in words)
+        )
+
+    best = max(candidates, key=scores.__getitem__)
+    weights = sum(math.exp(score - scores[best]) for score in scores.values())
+    return LanguageGuess(best, 1.0 / weights)
@@ -0,0 +1,28 @@
+"""
+Имитация распознавания речи (поведение по умолчанию)
+"""
+
+import asyncio
+import random
+from typing import Optional
+
+from app.recognition.base import BaseRecognizer
+
+MOCK_TEXTS = (
+    "Привет, как дела? Хотел обсудить новый проект.",
+    "Нужно организовать встречу на следующей неделе.",
+    "Расскажи про погоду и планы на выходные.",
+    "Помоги разобраться с документами и договором.",
+    "Номер телефона: 8-800-123-45-67, адрес улица Ленина дом 15.",
+)
+
+
+class MockRecognizer(BaseRecognizer):
+    """Случайная задержка 20-60 секунд и случайный текст."""
+
+    name = "mock"
+    requires_audio = False
+
+    async def recognize(self, audio: Optional[bytes], duration: int) -> str:
+        await asyncio.sleep(random.randint(20, 60))
+        return random.choice(MOCK_TEXTS)
@@ -0,0 +1,169 @@
+"""
+Контроль допуска голосовых запросов по нагрузке очереди
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from enum import Enum
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database.models import RequestStatus, ServiceRequest
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionVerdict(str, Enum):
+    ADMIT = "admit"
+    DEFER = "defer"  # Не принимаем сейчас, пользователь может повторить позже
+    REJECT = "reject"
+
+
+@dataclass(frozen=True)
+class QueueLoad:
+    pending: int = 0
+    in_flight_free: int = 0  # PENDING + PROCESSING
+    in_flight_paid: int = 0
+    completed_in_window: int = 0
+    window_seconds: float = 300.0
+    avg_processing_seconds: Optional[float] = None
+
+    @property
+    def throughput(self) -> float:
+        """Завершённых запросов в секунду за окно."""
+        return self.completed_in_window / self.window_seconds if self.window_seconds else 0.0
+
+
+@dataclass(frozen=True)
+class AdmissionDecision:
+    verdict: AdmissionVerdict
+    eta_seconds: float
+    load: QueueLoad = field(repr=False)
+    reason: Optional[str] = None
+
+    @property
+    def admitted(self) -> bool:
+        return self.verdict == AdmissionVerdict.ADMIT
+
+
+@dataclass(frozen=True)
+class AdmissionPolicy:
+    """Пороговые правила допуска; не зависит от БД, используется и в симуляции."""
+
+    free_defer_wait: float
+    free_reject_wait: float
+    free_max_in_flight: int
+    paid_max_in_flight: int
+    min_throughput: float
+    default_processing_seconds: float
+
+    @classmethod
+    def from_settings(cls) -> "AdmissionPolicy":
+        return cls(
+            free_defer_wait=settings.admission_free_defer_wait,
+            free_reject_wait=settings.admission_free_reject_wait,
+            free_max_in_flight=settings.admission_free_max_in_flight,
+            paid_max_in_flight=settings.admission_paid_max_in_flight,
+            min_throughput=settings.admission_min_throughput,
+            default_processing_seconds=settings.admission_default_processing_seconds,
+        )
+
+    def estimate_wait(self, load: QueueLoad) -> float:
+        """Ожидаемое время до результата: очередь / пропускная способность + своя обработка."""
+        processing = load.avg_processing_seconds or self.default_processing_seconds
+        throughput = max(load.throughput, self.min_throughput)
+        return load.pending / throughput + processing
+
+    def decide(self, load: QueueLoad, is_free: bool) -> AdmissionDecision:
+        eta = self.estimate_wait(load)
+
+        if is_free:
+            if eta > self.free_reject_wait:
+                return AdmissionDecision(AdmissionVerdict.REJECT, eta, load, "free_wait")
+            if load.in_flight_free >= self.free_max_in_flight:
+                return AdmissionDecision(AdmissionVerdict.DEFER, eta, load, "free_cap")
+            if eta > self.free_defer_wait:
+                return AdmissionDecision(AdmissionVerdict.DEFER, eta, load, "free_wait")
+        elif load.in_flight_paid >= self.paid_max_in_flight:
+            return AdmissionDecision(AdmissionVerdict.DEFER, eta, load, "paid_cap")
+
+        return AdmissionDecision(AdmissionVerdict.ADMIT, eta, load)
+
+
+# Кэш нагрузки процесса: при всплеске не читаем очередь на каждый апдейт
+_load_cache: Optional[tuple[float, QueueLoad]] = None
+
+
+class AdmissionController:
+    def __init__(self, session: AsyncSession, policy: Optional[AdmissionPolicy] = None):
+        self.session = session
+        self.policy = policy or AdmissionPolicy.from_settings()
+
+    async def get_load(self) -> QueueLoad:
+        """Текущая нагрузка очереди (кэшируется на admission_cache_seconds)."""
+        global _load_cache
+        now = time.monotonic()
+        if _load_cache and now - _load_cache[0] < settings.admission_cache_seconds:
+            return _load_cache[1]
+
+        load = await self._read_load()
+        _load_cache = (now, load)
+        return load
+
+    async def _read_load(self) -> QueueLoad:
+        window = settings.admission_window_seconds
+
+        rows = await self.session.execute(
+            select(ServiceRequest.status, ServiceRequest.is_free, func.count())
+            .where(ServiceRequest.status.in_([RequestStatus.PENDING, RequestStatus.PROCESSING]))
+            .group_by(ServiceRequest.status, ServiceRequest.is_free)
+        )
+        pending = in_flight_free = in_flight_paid = 0
+        for status, is_free, count in rows.all():
+            if status == RequestStatus.PENDING:
+                pending += count
+            if is_free:
+                in_flight_free += count
+            else:
+                in_flight_paid += count
+
+        completed, avg_processing = (await self.session.execute(
+            select(
+                func.count(),
+                func.avg(func.extract(
+                    "epoch",
+                    ServiceRequest.processing_completed_at - ServiceRequest.processing_started_at
+                ))
+            )
+            .where(
+                ServiceRequest.status == RequestStatus.COMPLETED,
+                ServiceRequest.processing_completed_at >= func.now() - timedelta(seconds=window)
+            )
+        )).one()
+
+        return QueueLoad(
+            pending=pending,
+            in_flight_free=in_flight_free,
+            in_flight_paid=in_flight_paid,
+            completed_in_window=completed,
+            window_seconds=window,
+            avg_processing_seconds=float(avg_processing) if avg_processing is not None else None,
+        )
+
+    async def check(self, is_free: bool) -> AdmissionDecision:
+        """Решение о допуске запроса выбранного тарифа."""
+        if not settings.admission_enabled:
+            return AdmissionDecision(AdmissionVerdict.ADMIT, 0.0, QueueLoad())
+
+        decision = self.policy.decide(await self.get_load(), is_free)
+        if not decision.admitted:
+            logger.info(
+                f"Admission {decision.verdict.value} ({decision.reason}): "
+                f"free={is_free}, eta={decision.eta_seconds:.0f}s, pending={decision.load.pending}"
+            )
+        return decision
@@ -155,7 +155,7 @@ class BalanceService:
             return False
 
     async def get_balance_history(self, user_id: int, limit: int = 10) -> list[BalanceTransaction]:
-        """Получить историю операций с балансом"""
+        """Получить историю операций с балансом (только чтение, допускает реплику)"""
         try:
             result = await self.session.execute(
                 select(BalanceTransaction)
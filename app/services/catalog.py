@@ -0,0 +1,252 @@
+"""
+Каталог услуг из JSON-файла или таблиц catalog_*, с перезагрузкой по версии в Redis
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Optional
+
+import redis.asyncio as redis
+from sqlalchemy import delete, select
+
+from app.config import settings
+from app.database.engine import db_manager
+from app.database.models import CatalogCategory, CatalogSubcategory, ServiceCategory, ServiceSubcategory
+
+logger = logging.getLogger(__name__)
+
+# Ключ Redis с версией каталога; меняется при каждой публикации
+CATALOG_VERSION_KEY = "catalog:version"
+
+
+@dataclass(frozen=True, slots=True)
+class SubcategoryInfo:
+    subcategory: ServiceSubcategory
+    category: ServiceCategory
+    description: str
+    price: Decimal
+    max_duration: int
+    processor: str
+
+
+@dataclass(frozen=True, slots=True)
+class CategoryInfo:
+    category: ServiceCategory
+    description: str
+    subcategories: tuple[SubcategoryInfo, ...]
+
+
+@dataclass(frozen=True)
+class Catalog:
+    version: str
+    categories: Mapping[ServiceCategory, CategoryInfo]
+    subcategories: Mapping[ServiceSubcategory, SubcategoryInfo]
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], version: str = "") -> "Catalog":
+        """Собрать каталог из описания формата app/data/service_catalog.json."""
+        categories: dict[ServiceCategory, CategoryInfo] = {}
+        subcategories: dict[ServiceSubcategory, SubcategoryInfo] = {}
+
+        for category_data in data["categories"]:
+            category = ServiceCategory(category_data["id"])
+            items = []
+            for item in category_data["subcategories"]:
+                subcategory = ServiceSubcategory(item["id"])
+                info = SubcategoryInfo(
+                    subcategory=subcategory,
+                    category=category,
+                    description=item["description"],
+                    price=Decimal(str(item.get("price", settings.service_cost))),
+                    max_duration=int(item.get("max_duration", settings.max_voice_duration)),
+                    processor=item.get("processor", subcategory.value),
+                )
+                if subcategory in subcategories:
+                    raise ValueError(f"Duplicate subcategory in catalog: {subcategory.value}")
+                subcategories[subcategory] = info
+                items.append(info)
+
+            categories[category] = CategoryInfo(
+                category=category,
+                description=category_data["description"],
+                subcategories=tuple(items),
+            )
+
+        return cls(
+            version=version,
+            categories=MappingProxyType(categories),
+            subcategories=MappingProxyType(subcategories),
+        )
+
+    def category(self, category: ServiceCategory) -> CategoryInfo:
+        return self.categories[category]
+
+    def subcategory(self, subcategory: ServiceSubcategory) -> SubcategoryInfo:
+        return self.subcategories[subcategory]
+
+    def price(self, subcategory: ServiceSubcategory) -> Decimal:
+        return self.subcategories[subcategory].price
+
+    def max_duration(self, subcategory: ServiceSubcategory) -> int:
+        return self.subcategories[subcategory].max_duration
+
+    def min_price(self) -> Decimal:
+        return min(info.price for info in self.subcategories.values())
+
+
+def load_from_file(path: Path) -> dict[str, Any]:
+    """Описание каталога из JSON-файла."""
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+async def load_from_db() -> dict[str, Any]:
+    """Описание каталога из таблиц catalog_categories и catalog_subcategories."""
+    if not db_manager.engine:
+        db_manager.init_engine()
+    async with db_manager.get_session(read_only=True) as session:
+        categories = (await session.execute(
+            select(CatalogCategory).order_by(CatalogCategory.position)
+        )).scalars().all()
+        subcategories = (await session.execute(
+            select(CatalogSubcategory).order_by(CatalogSubcategory.position)
+        )).scalars().all()
+
+    return {
+        "categories": [
+            {
+                "id": category.category.value,
+                "description": category.description,
+                "subcategories": [
+                    {
+                        "id": item.subcategory.value,
+                        "description": item.description,
+                        "price": str(item.price),
+                        "max_duration": item.max_duration,
+                        "processor": item.processor,
+                    }
+                    for item in subcategories
+                    if item.category == category.category
+                ],
+            }
+            for category in categories
+        ]
+    }
+
+
+class CatalogManager:
+    """Текущий каталог процесса и его перезагрузка по версии в Redis."""
+
+    def __init__(self):
+        # Каталог из файла доступен сразу после импорта; load() может заменить его данными из БД
+        self._catalog = Catalog.from_dict(load_from_file(Path(settings.catalog_file)))
+        self._listeners: list[Callable[[Catalog], None]] = []
+
+    @property
+    def catalog(self) -> Catalog:
+        return self._catalog
+
+    def add_listener(self, listener: Callable[[Catalog], None]) -> None:
+        """Вызывать listener после каждой замены каталога."""
+        self._listeners.append(listener)
+
+    async def load(self, version: str = "") -> Catalog:
+        """Загрузить каталог из настроенного источника и атомарно подменить текущий."""
+        if settings.catalog_source == "db":
+            data = await load_from_db()
+        else:
+            data = load_from_file(Path(settings.catalog_file))
+
+        catalog = Catalog.from_dict(data, version)
+        self._catalog = catalog
+        for listener in self._listeners:
+            listener(catalog)
+
+        logger.info(f"Service catalog loaded (version {version or 'initial'}, "
+                    f"{len(catalog.subcategories)} subcategories)")
+        return catalog
+
+    async def publish(self) -> int:
+        """Сообщить всем процессам, что каталог изменился."""
+        client = redis.from_url(settings.redis_url)
+        try:
+            return await client.incr(CATALOG_VERSION_KEY)
+        finally:
+            await client.aclose()
+
+    async def watch(self, interval: float) -> None:
+        """Перечитывать каталог, когда меняется версия в Redis."""
+        client = redis.from_url(settings.redis_url, decode_responses=True)
+        try:
+            while True:
+                try:
+                    version = await client.get(CATALOG_VERSION_KEY) or ""
+                    if version != self._catalog.version:
+                        await self.load(version)
+                except Exception as e:
+                    # Остаёмся на текущем каталоге до следующей попытки
+                    logger.warning(f"Catalog reload failed: {e}")
+                await asyncio.sleep(interval)
+        finally:
+            await client.aclose()
+
+
+catalog_manager = CatalogManager()
+
+
+def get_catalog() -> Catalog:
+    """Текущий каталог услуг."""
+    return catalog_manager.catalog
+
+
+async def import_file_to_db(path: Path) -> None:
+    """Записать каталог из JSON-файла в таблицы catalog_* (полная замена)."""
+    catalog = Catalog.from_dict(load_from_file(path))
+    if not db_manager.engine:
+        db_manager.init_engine()
+
+    async with db_manager.get_session() as session:
+        await session.execute(delete(CatalogSubcategory))
+        await session.execute(delete(CatalogCategory))
+        position = 0
+        for category_position, category in enumerate(catalog.categories.values()):
+            session.add(CatalogCategory(
+                category=category.category,
+                description=category.description,
+                position=category_position,
+            ))
+            for service in category.subcategories:
+                session.add(CatalogSubcategory(
+                    subcategory=service.subcategory,
+                    category=service.category,
+                    description=service.description,
+                    price=service.price,
+                    max_duration=service.max_duration,
+                    processor=service.processor,
+                    position=position,
+                ))
+                position += 1
+
+
+async def _run_command(command: str, path: Path) -> None:
+    if command == "import":
+        await import_file_to_db(path)
+        await db_manager.close()
+    version = await catalog_manager.publish()
+    print(f"Catalog version published: {version}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Service catalog maintenance")
+    parser.add_argument("command", choices=["publish", "import"],
+                        help="publish: notify all processes to reload; import: load the file into DB, then publish")
+    parser.add_argument("--file", type=Path, default=Path(settings.catalog_file))
+    args = parser.parse_args()
+    asyncio.run(_run_command(args.command, args.file))
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.models import Payment, PaymentMethod, PaymentStatus, User
 from app.config import settings
+from app.monitoring.http import http_client_hooks
 
 
 class PaymentService:
@@ -48,7 +49,7 @@ class PaymentService:
             return False
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with httpx.AsyncClient(event_hooks=http_client_hooks("yoomoney")) as client:
                 response = await client.post(
                     "https://api.yoomoney.ru/api/request-payment",
                     headers={
@@ -131,7 +132,7 @@ class PaymentService:
             return PaymentStatus.FAILED
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with httpx.AsyncClient(event_hooks=http_client_hooks("yoomoney")) as client:
                 response = await client.post(
                     "https://api.yoomoney.ru/api/process-payment",
                     headers={
@@ -162,7 +163,7 @@ class PaymentService:
         user_id: int, 
         limit: int = 10
     ) -> list[Payment]:
-        """Получить платежи пользователя."""
+        """Получить платежи пользователя (только чтение, допускает реплику)."""
         result = await self.session.execute(
             select(Payment)
             .where(Payment.user_id == user_id)
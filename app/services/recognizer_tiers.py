@@ -0,0 +1,79 @@
+"""
+Переход на быстрый уровень распознавания при росте очереди, с гистерезисом порогов
+"""
+
+import logging
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.monitoring.metrics import RECOGNIZER_TIER_SWITCHES
+from app.services.admission import AdmissionController, QueueLoad
+
+logger = logging.getLogger(__name__)
+
+
+class RecognizerTier(str, Enum):
+    ACCURATE = "accurate"
+    FAST = "fast"
+
+
+@dataclass(frozen=True)
+class TierPolicy:
+    """Пороги с гистерезисом; не зависит от БД, используется и в симуляции."""
+
+    degrade_wait: float
+    recover_wait: float
+    degrade_pending: int
+    recover_pending: int
+
+    def __post_init__(self):
+        if self.recover_wait > self.degrade_wait or self.recover_pending > self.degrade_pending:
+            raise ValueError("Tier recover thresholds must not exceed degrade thresholds")
+
+    @classmethod
+    def from_settings(cls) -> "TierPolicy":
+        return cls(
+            degrade_wait=settings.tier_degrade_wait,
+            recover_wait=settings.tier_recover_wait,
+            degrade_pending=settings.tier_degrade_pending,
+            recover_pending=settings.tier_recover_pending,
+        )
+
+    def next_tier(self, current: RecognizerTier, load: QueueLoad, wait: float) -> RecognizerTier:
+        """Уровень для следующей задачи: переход на быстрый по любому порогу, возврат — по обоим."""
+        if current == RecognizerTier.ACCURATE:
+            if wait > self.degrade_wait or load.pending > self.degrade_pending:
+                return RecognizerTier.FAST
+        elif wait < self.recover_wait and load.pending < self.recover_pending:
+            return RecognizerTier.ACCURATE
+        return current
+
+
+class TierController:
+    """Текущий уровень процесса воркера; нагрузка читается с кэшем AdmissionController."""
+
+    def __init__(self, policy: Optional[TierPolicy] = None):
+        self.policy = policy or TierPolicy.from_settings()
+        self.tier = RecognizerTier.ACCURATE
+
+    async def select(self, session: AsyncSession) -> RecognizerTier:
+        """Уровень распознавания для новой задачи."""
+        if not settings.tier_fast_recognizer:
+            return RecognizerTier.ACCURATE
+
+        admission = AdmissionController(session)
+        load = await admission.get_load()
+        wait = admission.policy.estimate_wait(load)
+        tier = self.policy.next_tier(self.tier, load, wait)
+        if tier != self.tier:
+            RECOGNIZER_TIER_SWITCHES.labels(tier.value).inc()
+            logger.info(f"Recognizer tier {self.tier.value} -> {tier.value}: wait={wait:.0f}s, pending={load.pending}")
+            self.tier = tier
+        return tier
+
+
+tier_controller = TierController()
@@ -0,0 +1,148 @@
+"""
+Теневые прогоны: сравнение кандидата с основным движком и отчёт (python -m app.services.shadow --hours 24)
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import timedelta
+from difflib import SequenceMatcher
+from typing import Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.engine import db_manager
+from app.database.models import ShadowResult
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Доля ошибок по словам (замены, вставки, удаления) относительно reference."""
+    expected, actual = reference.lower().split(), hypothesis.lower().split()
+    if not expected:
+        return float(bool(actual))
+    # Расстояние Левенштейна по словам, одна строка таблицы
+    previous = list(range(len(actual) + 1))
+    for row, word in enumerate(expected, 1):
+        current = [row]
+        for column, other in enumerate(actual, 1):
+            current.append(min(
+                previous[column] + 1,
+                current[column - 1] + 1,
+                previous[column - 1] + (word != other),
+            ))
+        previous = current
+    return previous[-1] / len(expected)
+
+
+def text_similarity(primary: str, candidate: str) -> float:
+    """Доля совпадающих символов двух ответов, 0..1."""
+    return SequenceMatcher(None, primary, candidate, autojunk=False).ratio()
+
+
+@dataclass(frozen=True, slots=True)
+class ShadowSummary:
+    kind: str
+    primary_engine: str
+    candidate_engine: str
+    runs: int
+    errors: int
+    primary_p50: Optional[float]
+    primary_p95: Optional[float]
+    candidate_p50: Optional[float]
+    candidate_p95: Optional[float]
+    primary_cpu: Optional[float]  # Среднее на запрос, секунды
+    candidate_cpu: Optional[float]
+    exact_match: Optional[float]  # Доля запросов
+    similarity: Optional[float]
+    word_error_rate: Optional[float]
+
+    @property
+    def speedup(self) -> Optional[float]:
+        """Во сколько раз кандидат быстрее основного по медиане."""
+        if not self.candidate_p50 or self.primary_p50 is None:
+            return None
+        return self.primary_p50 / self.candidate_p50
+
+
+class ShadowService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add_results(self, results: list[ShadowResult]) -> None:
+        self.session.add_all(results)
+        await self.session.flush()
+
+    async def get_summaries(self, period: timedelta) -> list[ShadowSummary]:
+        """Сводка по парам «основной — кандидат» за период."""
+        def percentile(q: float, column):
+            return func.percentile_cont(q).within_group(column)
+
+        rows = await self.session.execute(
+            select(
+                ShadowResult.kind,
+                ShadowResult.primary_engine,
+                ShadowResult.candidate_engine,
+                func.count(),
+                func.count(ShadowResult.error),
+                percentile(0.5, ShadowResult.primary_seconds),
+                percentile(0.95, ShadowResult.primary_seconds),
+                percentile(0.5, ShadowResult.candidate_seconds),
+                percentile(0.95, ShadowResult.candidate_seconds),
+                func.avg(ShadowResult.primary_cpu_seconds),
+                func.avg(ShadowResult.candidate_cpu_seconds),
+                func.avg(case((ShadowResult.exact_match, 1.0), (~ShadowResult.exact_match, 0.0))),
+                func.avg(ShadowResult.similarity),
+                func.avg(ShadowResult.word_error_rate),
+            )
+            .where(ShadowResult.created_at >= func.now() - period)
+            .group_by(ShadowResult.kind, ShadowResult.primary_engine, ShadowResult.candidate_engine)
+            .order_by(ShadowResult.kind, ShadowResult.primary_engine, ShadowResult.candidate_engine)
+        )
+        return [
+            ShadowSummary(*row[:5], *(None if value is None else float(value) for value in row[5:]))
+            for row in rows.all()
+        ]
+
+
+def _seconds(value: Optional[float]) -> str:
+    return "—" if value is None else f"{value:.3f}s"
+
+
+def _share(value: Optional[float]) -> str:
+    return "—" if value is None else f"{value:.1%}"
+
+
+def format_summary(summary: ShadowSummary) -> str:
+    speedup = f"{summary.speedup:.2f}x" if summary.speedup else "—"
+    lines = [
+        f"[{summary.kind}] {summary.primary_engine} -> {summary.candidate_engine}: "
+        f"{summary.runs} runs, {summary.errors} errors",
+        f"  latency p50/p95: primary {_seconds(summary.primary_p50)}/{_seconds(summary.primary_p95)}, "
+        f"candidate {_seconds(summary.candidate_p50)}/{_seconds(summary.candidate_p95)}, speedup {speedup}",
+        f"  cpu per request: primary {_seconds(summary.primary_cpu)}, candidate {_seconds(summary.candidate_cpu)}",
+        f"  agreement: exact {_share(summary.exact_match)}, similarity {_share(summary.similarity)}",
+    ]
+    if summary.word_error_rate is not None:
+        lines[-1] += f", WER {_share(summary.word_error_rate)}"
+    return "\n".join(lines)
+
+
+async def _report(hours: float) -> None:
+    db_manager.init_engine()
+    async with db_manager.get_session(read_only=True) as session:
+        summaries = await ShadowService(session).get_summaries(timedelta(hours=hours))
+    await db_manager.close()
+
+    if not summaries:
+        print(f"No shadow results in the last {hours:g} h")
+    for summary in summaries:
+        print(format_summary(summary))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Shadow traffic report: candidate engines against the primary ones")
+    parser.add_argument("--hours", type=float, default=24.0, help="Report period")
+    args = parser.parse_args()
+    asyncio.run(_report(args.hours))
@@ -58,9 +58,11 @@ class UserService:
         return result.rowcount > 0 > 0
     
     @staticmethod
-    async def can_use_free_service(user: User) -> bool:
+    async def can_use_free_service(user: User, service_cost: Optional[Decimal] = None) -> bool:
         """Проверить, может ли пользователь использовать бесплатную услугу."""
-        if user.balance >= Decimal(str(settings.service_cost)):
+        if service_cost is None:
+            service_cost = Decimal(str(settings.service_cost))
+        if user.balance >= service_cost:
             return False  # Если есть баланс, не используем бесплатную услугу
         
         if not user.last_free_usage:
@@ -92,6 +94,18 @@ class UserService:
         )
         return result.rowcount > 0
     
+    async def reset_free_usage(self, user_id: int, previous: Optional[datetime]) -> bool:
+        """Вернуть бесплатное использование, если запрос не был выполнен.
+
+        previous — время прошлого бесплатного использования до этого запроса.
+        """
+        result = await self.session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(last_free_usage=previous)
+        )
+        return result.rowcount > 0
+    
     async def deduct_balance(self, user_id: int, amount: Decimal) -> bool:
         """Списать средства с баланса."""
         result = await self.session.execute(
@@ -1,14 +1,14 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import select, update
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.models import (
     ServiceRequest, RequestStatus, ServiceCategory, ServiceSubcategory, User
 )
-from app.config import settings
+from app.services.catalog import get_catalog
 
 
 class VoiceService:
@@ -22,11 +22,15 @@ class VoiceService:
         subcategory: ServiceSubcategory,
         voice_file_id: str,
         voice_duration: int,
-        is_free: bool = False
+        is_free: bool = False,
+        chat_id: Optional[int] = None,
+        progress_message_id: Optional[int] = None,
+        priority: int = 0,
+        previous_free_usage: Optional[datetime] = None
     ) -> ServiceRequest:
         """Создать запрос на обработку голосового сообщения."""
         
-        cost = Decimal("0.00") if is_free else Decimal(str(settings.service_cost))
+        cost = Decimal("0.00") if is_free else get_catalog().price(subcategory)
         
         service_request = ServiceRequest(
             user_id=user_id,
@@ -36,6 +40,10 @@ class VoiceService:
             voice_duration=voice_duration,
             cost=cost,
             is_free=is_free,
+            chat_id=chat_id,
+            progress_message_id=progress_message_id,
+            priority=priority,
+            previous_free_usage=previous_free_usage,
             status=RequestStatus.PENDING
         )
         
@@ -52,12 +60,49 @@ class VoiceService:
         )
         return result.scalar_one_or_none()
     
+    async def claim_request(self, request_id: int) -> Optional[ServiceRequest]:
+        """Атомарно перевести запрос из PENDING в PROCESSING.
+
+        None, если запрос не найден или уже взят другим воркером
+        (например, после переотправки с повышенным приоритетом).
+        """
+        now = datetime.utcnow()
+        result = await self.session.execute(
+            update(ServiceRequest)
+            .where(
+                ServiceRequest.id == request_id,
+                ServiceRequest.status == RequestStatus.PENDING
+            )
+            .values(status=RequestStatus.PROCESSING, processing_started_at=now, updated_at=now)
+            .returning(ServiceRequest)
+        )
+        return result.scalar_one_or_none()
+    
+    async def promote_starved_requests(self, max_wait: float, priority: int) -> list[int]:
+        """Поднять приоритет запросам, ожидающим дольше max_wait секунд; вернуть их id."""
+        result = await self.session.execute(
+            update(ServiceRequest)
+            .where(
+                ServiceRequest.status == RequestStatus.PENDING,
+                ServiceRequest.priority < priority,
+                ServiceRequest.created_at < func.now() - timedelta(seconds=max_wait)
+            )
+            .values(priority=priority)
+            .returning(ServiceRequest.id)
+        )
+        return list(result.scalars().all())
+    
     async def update_request_status(
         self,
         request_id: int,
         status: RequestStatus,
         processed_text: Optional[str] = None,
-        response_text: Optional[str] = None
+        response_text: Optional[str] = None,
+        speech_duration: Optional[float] = None,
+        asr_seconds_saved: Optional[float] = None,
+        response_cached: Optional[bool] = None,
+        language: Optional[str] = None,
+        recognizer_tier: Optional[str] = None
     ) -> bool:
         """Обновить статус запроса."""
         
@@ -77,6 +122,19 @@ class VoiceService:
         if response_text is not None:
             update_data['response_text'] = response_text
         
+        if speech_duration is not None:
+            update_data['speech_duration'] = speech_duration
+            update_data['asr_seconds_saved'] = asr_seconds_saved
+        
+        if response_cached is not None:
+            update_data['response_cached'] = response_cached
+        
+        if language is not None:
+            update_data['language'] = language
+        
+        if recognizer_tier is not None:
+            update_data['recognizer_tier'] = recognizer_tier
+        
         result = await self.session.execute(
             update(ServiceRequest)
             .where(ServiceRequest.id == request_id)
@@ -90,7 +148,7 @@ class VoiceService:
         user_id: int,
         limit: int = 10
     ) -> list[ServiceRequest]:
-        """Получить запросы пользователя."""
+        """Получить запросы пользователя (только чтение, допускает реплику)."""
         result = await self.session.execute(
             select(ServiceRequest)
             .where(ServiceRequest.user_id == user_id)
@@ -108,64 +166,3 @@ class VoiceService:
             .limit(limit)
         )
         return result.scalars().all()
-    
-    @staticmethod
-    def get_category_description(category: ServiceCategory) -> str:
-        """Получить описание категории."""
-        descriptions = {
-            ServiceCategory.ARTISTIC: "🎨 Художественная обработка",
-            ServiceCategory.BUSINESS: "💼 Бизнес-обработка", 
-            ServiceCategory.NUMBERS: "🔢 Обработка цифр и данных"
-        }
-        return descriptions.get(category, "Неизвестная категория")
-    
-    @staticmethod
-    def get_subcategory_description(subcategory: ServiceSubcategory) -> str:
-        """Получить описание подкатегории."""
-        descriptions = {
-            # Artistic
-            ServiceSubcategory.DIALOGS: "💬 Диалоги и разговоры",
-            ServiceSubcategory.NATURE: "🌿 Природа и окружающая среда",
-            ServiceSubcategory.MUSIC: "🎵 Музыка и звуки",
-            ServiceSubcategory.POETRY: "📜 Поэзия и литература",
-            
-            # Business
-            ServiceSubcategory.AGREEMENTS: "🤝 Договоры и соглашения",
-            ServiceSubcategory.LAWS: "⚖️ Законы и правила",
-            ServiceSubcategory.PRESENTATIONS: "📊 Презентации и отчёты",
-            ServiceSubcategory.NEGOTIATIONS: "💰 Переговоры и сделки",
-            
-            # Numbers
-            ServiceSubcategory.ROUTES: "🗺️ Маршруты и направления",
-            ServiceSubcategory.PHONE_NUMBERS: "📞 Номера телефонов",
-            ServiceSubcategory.STATISTICS: "📈 Статистика и аналитика",
-            ServiceSubcategory.CALCULATIONS: "🧮 Расчёты и вычисления"
-        }
-        return descriptions.get(subcategory, "Неизвестная подкатегория")
-    
-    @staticmethod
-    def get_subcategories_by_category(
-            category: ServiceCategory
-    ) -> list[ServiceSubcategory]:
-        """Получить подкатегории для категории."""
-        mapping = {
-            ServiceCategory.ARTISTIC: [
-                ServiceSubcategory.DIALOGS,
-                ServiceSubcategory.NATURE,
-                ServiceSubcategory.MUSIC,
-                ServiceSubcategory.POETRY
-            ],
-            ServiceCategory.BUSINESS: [
-                ServiceSubcategory.AGREEMENTS,
-                ServiceSubcategory.LAWS,
-                ServiceSubcategory.PRESENTATIONS,
-                ServiceSubcategory.NEGOTIATIONS
-            ],
-            ServiceCategory.NUMBERS: [
-                ServiceSubcategory.ROUTES,
-                ServiceSubcategory.PHONE_NUMBERS,
-                ServiceSubcategory.STATISTICS,
-                ServiceSubcategory.CALCULATIONS
-            ]
-        }
-        return mapping.get(category, [])
\ No newline at end of file
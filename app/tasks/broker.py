@@ -1,27 +1,237 @@
-from taskiq import AsyncBroker
+import asyncio
+import time
+from typing import Any, TypeVar
+
+from opentelemetry import context as otel_context
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind
+from taskiq import (
+    AsyncBroker, InMemoryBroker, TaskiqEvents, TaskiqMessage, TaskiqMiddleware, TaskiqResult, TaskiqState
+)
 from taskiq_aio_pika import AioPikaBroker
 
 from app.config import settings
+from app.database.engine import db_manager
+from app.executors import shutdown_process_pool
+from app.monitoring.metrics import BROKER_PUBLISH_LATENCY, start_metrics_server
+from app.monitoring.tracing import (
+    end_span, extract_context, inject_context, setup_tracing, shutdown_tracing, tracer
+)
+from app.processors import setup_processors
+from app.processors.cache import response_cache
+from app.services.catalog import catalog_manager
+from app.tasks.progress import progress_notifier, watch_queue_positions
+from app.tasks.scheduling import scheduling_policy
+
+T = TypeVar("T")
+
+# У taskiq нет хука ошибки отправки: при сбое kick post_send не вызывается.
+# Публикации, не завершённые за это время, считаются неудачными и удаляются
+PUBLISH_TIMEOUT = 60.0
+
+
+def shadow_enabled() -> bool:
+    return settings.shadow_sample_rate > 0 and bool(settings.shadow_recognizer or settings.shadow_processor_pairs)
+
+
+def create_broker() -> AsyncBroker:
+    """Создать брокер: RabbitMQ в проде, in-memory для нагрузочных тестов."""
+    if settings.task_broker == "memory":
+        return InMemoryBroker(max_async_tasks=settings.task_max_async_tasks)
+    if not settings.scheduling_enabled:
+        return AioPikaBroker(settings.rabbitmq_url, qos=settings.task_prefetch)
+    # Приоритетная очередь: короткие записи обрабатываются первыми.
+    # x-max-priority нельзя добавить к уже объявленной очереди (PRECONDITION_FAILED),
+    # поэтому у неё своё имя. Старую очередь taskiq дочищает воркер
+    # с SCHEDULING_ENABLED=false, после чего её можно удалить.
+    return AioPikaBroker(
+        settings.rabbitmq_url,
+        qos=settings.task_prefetch,
+        exchange_name=settings.scheduling_queue,
+        queue_name=settings.scheduling_queue,
+        max_priority=scheduling_policy.max_priority,
+    )
+
 
-# Создаём брокер для RabbitMQ
-broker = AioPikaBroker(settings.rabbitmq_url)
+def create_shadow_broker() -> AsyncBroker:
+    """Брокер теневых прогонов: своя очередь и отдельный воркер, основной трафик не ждёт."""
+    # Без теневых прогонов очередь в RabbitMQ не нужна
+    if settings.task_broker == "memory" or not shadow_enabled():
+        return InMemoryBroker(max_async_tasks=settings.shadow_max_async_tasks)
+    # Своя точка обмена: очереди привязаны к ней по «#» и иначе получали бы чужие задачи
+    return AioPikaBroker(
+        settings.rabbitmq_url,
+        qos=1,
+        exchange_name=settings.shadow_queue,
+        queue_name=settings.shadow_queue,
+    )
 
 
-# В TaskIQ используется startup/shutdown через декораторы задач
-async def startup_hook():
-    """Функция запуска брокера"""
+broker = create_broker()
+shadow_broker = create_shadow_broker()
+
+
+async def startup_hook(state: TaskiqState):
+    """Функция запуска воркера"""
+    if settings.metrics_enabled:
+        start_metrics_server(settings.worker_metrics_port)
+    setup_tracing("voice-worker")
+    if not db_manager.engine:
+        db_manager.init_engine()
+    if db_manager.replica_engines:
+        # Без проверки отставания реплики не получают чтений воркера
+        state.lag_monitor = asyncio.create_task(
+            db_manager.monitor_replication_lag(settings.db_replica_lag_check_interval)
+        )
+    await catalog_manager.load()
+    setup_processors()
+    state.catalog_watcher = asyncio.create_task(
+        catalog_manager.watch(settings.catalog_reload_interval)
+    )
+    if settings.scheduling_enabled:
+        from app.tasks.voice_processing import watch_starved_requests
+
+        state.starvation_watcher = asyncio.create_task(
+            watch_starved_requests(settings.bot_token, settings.scheduling_sweep_interval)
+        )
+    if settings.progress_queue_interval > 0:
+        state.queue_position_watcher = asyncio.create_task(
+            watch_queue_positions(settings.bot_token, settings.progress_queue_interval)
+        )
+    if shadow_enabled():
+        # Воркер только публикует теневые задачи
+        await shadow_broker.startup()
     print("TaskIQ broker started successfully")
 
 
-async def shutdown_hook():
-    """Функция остановки брокера"""
+async def shutdown_hook(state: TaskiqState):
+    """Функция остановки воркера"""
+    for name in ("lag_monitor", "catalog_watcher", "starvation_watcher", "queue_position_watcher"):
+        watcher = getattr(state, name, None)
+        if watcher:
+            watcher.cancel()
+    await progress_notifier.close()
+    await response_cache.close()
+    if shadow_enabled():
+        await shadow_broker.shutdown()
+    shutdown_process_pool()
+    shutdown_tracing()
     print("TaskIQ broker shut down")
 
 
-# Или можно использовать middleware
-class BrokerMiddleware:
-    async def pre_send(self, message):
-        pass
+async def shadow_startup_hook(state: TaskiqState):
+    """Запуск теневого воркера: ему нужны каталог и обработчики, но не фоновые проверки очереди."""
+    if settings.metrics_enabled:
+        start_metrics_server(settings.shadow_metrics_port)
+    setup_tracing("voice-shadow-worker")
+    if not db_manager.engine:
+        db_manager.init_engine()
+    await catalog_manager.load()
+    setup_processors()
+    state.catalog_watcher = asyncio.create_task(
+        catalog_manager.watch(settings.catalog_reload_interval)
+    )
+    print("Shadow broker started successfully")
+
+
+async def shadow_shutdown_hook(state: TaskiqState):
+    """Остановка теневого воркера"""
+    watcher = getattr(state, "catalog_watcher", None)
+    if watcher:
+        watcher.cancel()
+    await db_manager.close()
+    shutdown_process_pool()
+    shutdown_tracing()
+    print("Shadow broker shut down")
+
+
+def pop_stale_publishes(pending: dict[str, tuple[float, T]], now: float) -> list[T]:
+    """Убрать публикации старше PUBLISH_TIMEOUT; словарь упорядочен по времени начала."""
+    stale = []
+    for task_id, (started, value) in list(pending.items()):
+        if now - started < PUBLISH_TIMEOUT:
+            break
+        del pending[task_id]
+        stale.append(value)
+    return stale
+
+
+class BrokerMiddleware(TaskiqMiddleware):
+    """Замер времени публикации задач в брокер."""
+
+    def __init__(self):
+        super().__init__()
+        self._publish_started: dict[str, tuple[float, None]] = {}
+
+    async def pre_send(self, message: TaskiqMessage) -> TaskiqMessage:
+        now = time.perf_counter()
+        pop_stale_publishes(self._publish_started, now)
+        self._publish_started[message.task_id] = (now, None)
+        return message
+
+    async def post_send(self, message: TaskiqMessage) -> None:
+        entry = self._publish_started.pop(message.task_id, None)
+        if entry is not None:
+            BROKER_PUBLISH_LATENCY.labels(message.task_name).observe(
+                time.perf_counter() - entry[0]
+            )
+
+
+class TracingMiddleware(TaskiqMiddleware):
+    """Передача контекста трассировки через labels сообщения.
+
+    При публикации создаётся спан producer, и его контекст (traceparent)
+    записывается в labels. Воркер продолжает трассу спаном consumer.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._publish_spans: dict[str, tuple[float, trace.Span]] = {}
+        self._execute_spans: dict[str, tuple[trace.Span, object]] = {}
+
+    async def pre_send(self, message: TaskiqMessage) -> TaskiqMessage:
+        now = time.perf_counter()
+        for span in pop_stale_publishes(self._publish_spans, now):
+            end_span(span, TimeoutError("Publish did not complete"))
+        span = tracer.start_span(f"publish {message.task_name}", kind=SpanKind.PRODUCER)
+        span.set_attribute("messaging.message_id", message.task_id)
+        inject_context(message.labels, trace.set_span_in_context(span))
+        self._publish_spans[message.task_id] = (now, span)
+        return message
+
+    async def post_send(self, message: TaskiqMessage) -> None:
+        entry = self._publish_spans.pop(message.task_id, None)
+        if entry is not None:
+            entry[1].end()
+
+    async def pre_execute(self, message: TaskiqMessage) -> TaskiqMessage:
+        span = tracer.start_span(
+            f"process {message.task_name}",
+            context=extract_context(message.labels),
+            kind=SpanKind.CONSUMER,
+        )
+        span.set_attribute("messaging.message_id", message.task_id)
+        token = otel_context.attach(trace.set_span_in_context(span))
+        self._execute_spans[message.task_id] = (span, token)
+        return message
+
+    async def on_error(self, message: TaskiqMessage, result: TaskiqResult[Any], exception: BaseException) -> None:
+        entry = self._execute_spans.get(message.task_id)
+        if entry is not None:
+            entry[0].record_exception(exception)
+
+    async def post_execute(self, message: TaskiqMessage, result: TaskiqResult[Any]) -> None:
+        entry = self._execute_spans.pop(message.task_id, None)
+        if entry is None:
+            return
+        span, token = entry
+        otel_context.detach(token)
+        end_span(span)
+
 
-    async def post_send(self, message):
-        pass
+broker.add_middlewares(BrokerMiddleware(), TracingMiddleware())
+broker.add_event_handler(TaskiqEvents.WORKER_STARTUP, startup_hook)
+broker.add_event_handler(TaskiqEvents.WORKER_SHUTDOWN, shutdown_hook)
+shadow_broker.add_middlewares(TracingMiddleware())
+shadow_broker.add_event_handler(TaskiqEvents.WORKER_STARTUP, shadow_startup_hook)
+shadow_broker.add_event_handler(TaskiqEvents.WORKER_SHUTDOWN, shadow_shutdown_hook)
@@ -0,0 +1,293 @@
+"""
+Прогресс обработки запроса в сообщении пользователя: этапы и позиция в очереди с троттлингом правок
+"""
+
+import asyncio
+import html
+import logging
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+import httpx
+import redis.asyncio as redis
+from sqlalchemy import select
+
+from app.config import settings
+from app.database.engine import db_manager
+from app.database.models import RequestStatus, ServiceRequest
+from app.monitoring.http import http_client_hooks
+
+logger = logging.getLogger(__name__)
+
+# Ключ Redis, которым воркеры делят обновление позиций в очереди
+QUEUE_POSITIONS_LOCK_KEY = "progress:queue_positions"
+# Отметка о начале обработки сообщения и блокировка на время правки позиции
+STAGE_MARKER_KEY = "progress:stage:{chat_id}:{message_id}"
+QUEUE_EDIT_LOCK_KEY = "progress:queue_edit:{chat_id}:{message_id}"
+STAGE_MARKER_TTL = 3600
+QUEUE_EDIT_LOCK_TTL = 10  # Больше таймаута запроса к Bot API
+# Сколько сообщений держать в памяти, прежде чем чистить неактивные
+PRUNE_THRESHOLD = 10000
+# Сколько последних символов частичного текста показывать (лимит сообщения — 4096)
+TRANSCRIPT_PREVIEW_CHARS = 3000
+
+
+class ProgressStage(str, Enum):
+    QUEUED = "queued"
+    DOWNLOADING = "downloading"
+    RECOGNIZING = "recognizing"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+STAGE_TEXTS = {
+    ProgressStage.QUEUED: "⏳ <b>Запрос в очереди</b>\n\n📍 Позиция: {position}\n\nПожалуйста, подождите...",
+    ProgressStage.DOWNLOADING: "📥 <b>Загружаем голосовое сообщение...</b>",
+    ProgressStage.RECOGNIZING: "🎙 <b>Распознаём речь...</b>",
+    ProgressStage.PROCESSING: "✍️ <b>Обрабатываем текст...</b>",
+    ProgressStage.COMPLETED: "✅ <b>Готово!</b> Результат — в следующем сообщении.",
+    ProgressStage.FAILED: "❌ <b>Не удалось обработать сообщение</b>\n\nПопробуйте ещё раз позже.",
+}
+
+
+def render_progress(stage: ProgressStage, position: Optional[int] = None, transcript: Optional[str] = None) -> str:
+    """Текст сообщения о прогрессе для этапа, с распознанным к этому моменту текстом."""
+    text = STAGE_TEXTS[stage].format(position=position)
+    if transcript:
+        if len(transcript) > TRANSCRIPT_PREVIEW_CHARS:
+            transcript = "…" + transcript[-TRANSCRIPT_PREVIEW_CHARS:]
+        text += f"\n\n<i>{html.escape(transcript)}</i>"
+    return text
+
+
+@dataclass
+class _MessageState:
+    pending: Optional[str] = None  # Последний текст, ещё не отправленный
+    pending_queued: bool = False  # Это позиция в очереди, а не этап обработки
+    sent: Optional[str] = None
+    sent_at: float = 0.0
+    started: bool = False  # Этап обработки опубликован, позиция больше не нужна
+    stage_marked: bool = False
+    final: bool = False
+    task: Optional[asyncio.Task] = None
+
+
+class ProgressNotifier:
+    """Объединение и троттлинг правок сообщений о прогрессе."""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._messages: dict[tuple[int, int], _MessageState] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._redis: Optional[redis.Redis] = None
+
+    def publish(
+        self,
+        bot_token: str,
+        chat_id: int,
+        message_id: int,
+        text: str,
+        final: bool = False,
+        queued: bool = False,
+    ) -> None:
+        """Запланировать правку; более новый текст заменяет ещё не отправленный.
+
+        queued=True — позиция в очереди: она не показывается после начала обработки.
+        """
+        key = (chat_id, message_id)
+        state = self._messages.get(key)
+        if state is None:
+            if len(self._messages) >= PRUNE_THRESHOLD:
+                self._prune()
+            state = self._messages[key] = _MessageState()
+
+        # После финального текста промежуточные этапы не показываем, после этапа — позицию
+        if state.final or (queued and state.started):
+            return
+        state.pending = text
+        state.pending_queued = queued
+        state.started = state.started or not queued
+        state.final = final
+
+        if state.task is None or state.task.done():
+            state.task = asyncio.create_task(self._flush(bot_token, key, state))
+
+    async def _flush(self, bot_token: str, key: tuple[int, int], state: _MessageState) -> None:
+        try:
+            while state.pending is not None:
+                delay = state.sent_at + self.min_interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                text, state.pending = state.pending, None
+                if text == state.sent:
+                    continue
+
+                if state.pending_queued:
+                    retry_after = await self._edit_queued(bot_token, key, text)
+                    if retry_after is None:
+                        # Обработку начал другой воркер, или позицию правят параллельно
+                        continue
+                else:
+                    if not state.stage_marked:
+                        await self._mark_stage(key)
+                        state.stage_marked = True
+                    retry_after = await self._edit(bot_token, key, text)
+                if retry_after:
+                    # Flood control: повторим позже, если текст не сменился новым
+                    if state.pending is None:
+                        state.pending = text
+                    state.sent_at = time.monotonic() + retry_after - self.min_interval
+                    continue
+
+                state.sent = text
+                state.sent_at = time.monotonic()
+        finally:
+            if state.final and state.pending is None:
+                self._messages.pop(key, None)
+
+    def _prune(self) -> None:
+        """Забыть сообщения без активной отправки, не менявшиеся дольше нескольких интервалов."""
+        cutoff = time.monotonic() - 10 * self.min_interval
+        for key, state in list(self._messages.items()):
+            if (state.task is None or state.task.done()) and state.sent_at < cutoff:
+                del self._messages[key]
+
+    def _get_redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.from_url(settings.redis_url)
+        return self._redis
+
+    async def _mark_stage(self, key: tuple[int, int]) -> None:
+        """Отметить начало обработки и дождаться уже идущей правки позиции."""
+        chat_id, message_id = key
+        client = self._get_redis()
+        lock_key = QUEUE_EDIT_LOCK_KEY.format(chat_id=chat_id, message_id=message_id)
+        try:
+            await client.set(
+                STAGE_MARKER_KEY.format(chat_id=chat_id, message_id=message_id), "1", ex=STAGE_MARKER_TTL
+            )
+            deadline = time.monotonic() + QUEUE_EDIT_LOCK_TTL
+            while await client.exists(lock_key) and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+        except redis.RedisError as e:
+            logger.warning(f"Progress stage mark failed for {chat_id}/{message_id}: {e}")
+
+    async def _edit_queued(self, bot_token: str, key: tuple[int, int], text: str) -> Optional[float]:
+        """Показать позицию в очереди, если обработка ещё не началась; иначе вернуть None.
+
+        Правка идёт под блокировкой, которую ждёт _mark_stage, поэтому позиция
+        не может перезаписать этап, отправленный другим воркером.
+        """
+        chat_id, message_id = key
+        client = self._get_redis()
+        lock_key = QUEUE_EDIT_LOCK_KEY.format(chat_id=chat_id, message_id=message_id)
+        try:
+            if not await client.set(lock_key, "1", nx=True, ex=QUEUE_EDIT_LOCK_TTL):
+                return None
+            try:
+                if await client.exists(STAGE_MARKER_KEY.format(chat_id=chat_id, message_id=message_id)):
+                    return None
+                return await self._edit(bot_token, key, text)
+            finally:
+                await client.delete(lock_key)
+        except redis.RedisError as e:
+            # Позиция не критична: без Redis её не показываем
+            logger.warning(f"Queue position edit skipped for {chat_id}/{message_id}: {e}")
+            return None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(event_hooks=http_client_hooks("telegram"))
+        return self._client
+
+    async def _edit(self, bot_token: str, key: tuple[int, int], text: str) -> float:
+        """Отредактировать сообщение; при 429 вернуть retry_after."""
+        chat_id, message_id = key
+        try:
+            response = await self._get_client().post(
+                f"{settings.telegram_api_url}/bot{bot_token}/editMessageText",
+                json={"chat_id": chat_id, "message_id": message_id, "text": text, "parse_mode": "HTML"}
+            )
+        except httpx.HTTPError as e:
+            logger.warning(f"Progress edit failed for {chat_id}/{message_id}: {e}")
+            return 0.0
+
+        if response.status_code == 429:
+            return float(response.json().get("parameters", {}).get("retry_after", 1))
+        if response.status_code != 200:
+            # Сообщение удалено или текст не изменился — прогресс не критичен
+            logger.debug(f"Progress edit for {chat_id}/{message_id} returned {response.status_code}")
+        return 0.0
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Дождаться отправки финальных текстов и закрыть HTTP-клиент."""
+        tasks = [state.task for state in self._messages.values() if state.task and not state.task.done()]
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+progress_notifier = ProgressNotifier(settings.progress_edit_interval)
+
+
+def report_stage(
+    bot_token: str,
+    chat_id: Optional[int],
+    message_id: Optional[int],
+    stage: ProgressStage,
+    transcript: Optional[str] = None,
+) -> None:
+    """Показать этап обработки, если у запроса есть сообщение о прогрессе."""
+    if chat_id is None or message_id is None:
+        return
+    final = stage in (ProgressStage.COMPLETED, ProgressStage.FAILED)
+    progress_notifier.publish(
+        bot_token, chat_id, message_id, render_progress(stage, transcript=transcript), final=final
+    )
+
+
+async def update_queue_positions(bot_token: str) -> int:
+    """Показать ожидающим запросам их позицию в очереди; вернуть число запросов."""
+    # Порядок выдачи брокером: приоритет сообщения (длительность и старение), затем FIFO
+    order = (ServiceRequest.id,)
+    if settings.scheduling_enabled:
+        order = (ServiceRequest.priority.desc(), ServiceRequest.id)
+    async with db_manager.get_session(read_only=True) as session:
+        rows = (await session.execute(
+            select(ServiceRequest.chat_id, ServiceRequest.progress_message_id)
+            .where(ServiceRequest.status == RequestStatus.PENDING)
+            .order_by(*order)
+            .limit(settings.progress_queue_limit)
+        )).all()
+
+    for position, (chat_id, message_id) in enumerate(rows, start=1):
+        if chat_id is not None and message_id is not None:
+            # Неизменившаяся позиция отбрасывается в notifier без запроса к API
+            progress_notifier.publish(
+                bot_token, chat_id, message_id, render_progress(ProgressStage.QUEUED, position), queued=True
+            )
+    return len(rows)
+
+
+async def watch_queue_positions(bot_token: str, interval: float) -> None:
+    """Периодически обновлять позиции в очереди; за интервал это делает один воркер."""
+    client = redis.from_url(settings.redis_url)
+    try:
+        while True:
+            try:
+                if await client.set(QUEUE_POSITIONS_LOCK_KEY, "1", nx=True, ex=max(1, int(interval))):
+                    await update_queue_positions(bot_token)
+            except Exception as e:
+                logger.warning(f"Queue position update failed: {e}")
+            await asyncio.sleep(interval)
+    finally:
+        await client.aclose()
@@ -0,0 +1,45 @@
+"""
+Приоритет задач распознавания по длительности голосового, со старением долго ждущих запросов
+"""
+
+from dataclasses import dataclass
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class SchedulingPolicy:
+    # Верхние границы корзин длительности в секундах, по возрастанию
+    bucket_limits: tuple[int, ...]
+    max_wait: float
+
+    @classmethod
+    def from_settings(cls) -> "SchedulingPolicy":
+        limits = sorted(int(value) for value in settings.scheduling_duration_buckets.split(",") if value.strip())
+        return cls(bucket_limits=tuple(limits), max_wait=settings.scheduling_max_wait)
+
+    @property
+    def aged_priority(self) -> int:
+        """Приоритет запросов, ожидающих дольше max_wait."""
+        return len(self.bucket_limits) + 1
+
+    @property
+    def max_priority(self) -> int:
+        return self.aged_priority
+
+    def priority(self, duration: int) -> int:
+        """Приоритет по длительности: чем короче запись, тем выше."""
+        for index, limit in enumerate(self.bucket_limits):
+            if duration <= limit:
+                return len(self.bucket_limits) - index
+        return 0
+
+
+scheduling_policy = SchedulingPolicy.from_settings()
+
+
+def task_priority(duration: int) -> int:
+    """Приоритет сообщения для задачи с записью длительностью duration."""
+    if not settings.scheduling_enabled:
+        return 0
+    return scheduling_policy.priority(duration)
@@ -0,0 +1,166 @@
+"""
+Теневой прогон кандидатов распознавания и обработки на выборке завершённых запросов
+"""
+
+import asyncio
+import random
+import time
+from typing import Callable, Optional, TypeVar
+
+import numpy as np
+
+from app.audio import SAMPLE_RATE, decode_audio, detect_speech, trim_silence
+from app.config import settings
+from app.database.engine import db_manager
+from app.database.models import RequestStatus, ServiceRequest, ShadowResult
+from app.monitoring.metrics import SHADOW_RUNS
+from app.processors import get_processor
+from app.recognition import BaseRecognizer, create_recognizer
+from app.services.catalog import get_catalog
+from app.services.shadow import ShadowService, text_similarity, word_error_rate
+from app.services.voice_service import VoiceService
+from app.tasks.broker import shadow_broker, shadow_enabled
+from app.tasks.voice_processing import download_voice
+
+T = TypeVar("T")
+
+# Распознаватели теневого воркера по (имени, языку), без разбиения на фрагменты:
+# оба движка работают в одном потоке, и их процессорное время сравнимо
+_recognizers: dict[tuple[str, Optional[str]], BaseRecognizer] = {}
+
+
+def should_shadow() -> bool:
+    """Попадает ли завершённый запрос в теневую выборку."""
+    return shadow_enabled() and random.random() < settings.shadow_sample_rate
+
+
+def _recognizer(name: str, language: Optional[str]) -> BaseRecognizer:
+    recognizer = _recognizers.get((name, language))
+    if recognizer is None:
+        recognizer = create_recognizer(name, language)
+        _recognizers[name, language] = recognizer
+    return recognizer
+
+
+def _thread_timed(function: Callable[..., T], *args) -> tuple[T, float, float]:
+    """Результат, время и процессорное время потока; выполняется в asyncio.to_thread."""
+    started, cpu_started = time.perf_counter(), time.thread_time()
+    result = function(*args)
+    return result, time.perf_counter() - started, time.thread_time() - cpu_started
+
+
+async def _timed_recognition(
+    recognizer: BaseRecognizer,
+    pcm: Optional[np.ndarray],
+    audio: Optional[bytes],
+    duration: int,
+) -> tuple[str, float, float]:
+    if pcm is not None and recognizer.supports_pcm:
+        return await asyncio.to_thread(_thread_timed, recognizer.recognize_pcm, pcm, SAMPLE_RATE)
+    # Без PCM распознаватель работает в event loop: процессорное время процесса приблизительно
+    started, cpu_started = time.perf_counter(), time.process_time()
+    text = await recognizer.recognize(audio, duration)
+    return text, time.perf_counter() - started, time.process_time() - cpu_started
+
+
+async def _shadow_recognizer(request: ServiceRequest, bot_token: str) -> ShadowResult:
+    language = request.language or settings.default_language
+    if request.recognizer_tier == "fast" and settings.tier_fast_recognizer:
+        primary_name = settings.tier_fast_recognizer
+    else:
+        primary_name = settings.language_recognizers.get(language, settings.recognizer)
+    primary = _recognizer(primary_name, language)
+    candidate = _recognizer(settings.shadow_recognizer, language)
+
+    audio = pcm = None
+    needs_pcm = primary.supports_pcm or candidate.supports_pcm
+    if needs_pcm or primary.requires_audio or candidate.requires_audio:
+        audio = await download_voice(bot_token, request.voice_file_id)
+    if needs_pcm:
+        pcm = await decode_audio(audio, SAMPLE_RATE)
+        if settings.vad_enabled:
+            # Тот же вход, что получил основной распознаватель
+            pcm = trim_silence(
+                pcm, detect_speech(pcm, SAMPLE_RATE), settings.vad_max_pause, settings.vad_padding
+            )
+
+    result = ShadowResult(
+        request_id=request.id,
+        kind="recognizer",
+        primary_engine=primary_name,
+        candidate_engine=settings.shadow_recognizer,
+    )
+    try:
+        primary_text, result.primary_seconds, result.primary_cpu_seconds = await _timed_recognition(
+            primary, pcm, audio, request.voice_duration
+        )
+    except Exception as e:
+        # Сбой основного движка тоже попадает в сравнение
+        result.error = f"primary: {e}"
+        return result
+    try:
+        candidate_text, result.candidate_seconds, result.candidate_cpu_seconds = await _timed_recognition(
+            candidate, pcm, audio, request.voice_duration
+        )
+    except Exception as e:
+        result.error = str(e)
+        return result
+
+    result.candidate_output = candidate_text
+    result.exact_match = candidate_text == primary_text
+    result.similarity = text_similarity(primary_text, candidate_text)
+    result.word_error_rate = word_error_rate(primary_text, candidate_text)
+    return result
+
+
+async def _shadow_processor(request: ServiceRequest, primary_key: str, candidate_key: str) -> ShadowResult:
+    primary, candidate = get_processor(primary_key), get_processor(candidate_key)
+    result = ShadowResult(
+        request_id=request.id,
+        kind="processor",
+        primary_engine=f"{primary.key}:v{primary.version}",
+        candidate_engine=f"{candidate.key}:v{candidate.version}",
+    )
+    try:
+        primary_text, result.primary_seconds, result.primary_cpu_seconds = await asyncio.to_thread(
+            _thread_timed, primary.process, request.processed_text
+        )
+    except Exception as e:
+        result.error = f"primary: {e}"
+        return result
+    try:
+        candidate_text, result.candidate_seconds, result.candidate_cpu_seconds = await asyncio.to_thread(
+            _thread_timed, candidate.process, request.processed_text
+        )
+    except Exception as e:
+        result.error = str(e)
+        return result
+
+    result.candidate_output = candidate_text
+    result.exact_match = candidate_text == primary_text
+    result.similarity = text_similarity(primary_text, candidate_text)
+    return result
+
+
+@shadow_broker.task
+async def run_shadow(request_id: int, bot_token: str):
+    """Прогнать кандидатов на завершённом запросе и записать сравнение."""
+    if not db_manager.engine:
+        db_manager.init_engine()
+
+    async with db_manager.get_session() as session:
+        request = await VoiceService(session).get_request(request_id)
+        if request is None or request.status != RequestStatus.COMPLETED or not request.processed_text:
+            return
+
+        results = []
+        if settings.shadow_recognizer:
+            results.append(await _shadow_recognizer(request, bot_token))
+        primary_key = get_catalog().subcategory(request.subcategory).processor
+        candidate_key = settings.shadow_processor_pairs.get(primary_key)
+        if candidate_key:
+            results.append(await _shadow_processor(request, primary_key, candidate_key))
+
+        for result in results:
+            SHADOW_RUNS.labels(result.kind, "error" if result.error else "ok").inc()
+        await ShadowService(session).add_results(results)
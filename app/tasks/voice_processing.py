@@ -1,12 +1,52 @@
 import asyncio
-import random
+import time
 from datetime import datetime
 
+import numpy as np
+import redis.asyncio as redis
+
+from app.audio import (
+    SAMPLE_RATE, QualityIssue, VadResult, assess_quality, decode_audio, detect_speech, trim_silence,
+)
+from app.config import settings
 from app.tasks.broker import broker
+from app.monitoring.http import http_client_hooks
+from app.monitoring.metrics import (
+    AUDIO_QUALITY_REJECTIONS, LANGUAGE_DETECTIONS, RECOGNIZER_TIER_REQUESTS,
+    observe_first_output, observe_queue_wait, track_stage,
+)
 from app.database.engine import db_manager
-from app.database.models import RequestStatus, ServiceCategory, ServiceSubcategory
+from app.recognition import detect_language, get_recognizer, language_id_enabled
+from app.database.models import RequestStatus, ServiceRequest
+from app.processors import get_processor, run_processor
+from app.processors.cache import response_cache, response_key
+from app.services.catalog import get_catalog
+from app.services.recognizer_tiers import RecognizerTier, tier_controller
 from app.services.voice_service import VoiceService
 from app.services.user_service import UserService
+from app.tasks.progress import ProgressStage, report_stage
+from app.tasks.scheduling import scheduling_policy
+
+TASK_NAME = "process_voice_message"
+# Ключ Redis, которым воркеры делят проверку зависших в очереди запросов
+STARVATION_LOCK_KEY = "scheduling:starvation_sweep"
+
+NO_SPEECH_TEXT = (
+    "🔇 <b>В сообщении не найдено речи</b>\n\n"
+    "Запишите голосовое сообщение ещё раз. Запрос не засчитан: оплата или бесплатная попытка возвращены."
+)
+QUALITY_TEXTS = {
+    QualityIssue.SILENT: NO_SPEECH_TEXT,
+    QualityIssue.CLIPPED: (
+        "📢 <b>Запись перегружена</b>\n\n"
+        "Звук искажён из-за слишком высокой громкости. Запишите сообщение ещё раз "
+        "чуть дальше от микрофона. Запрос не засчитан: оплата или бесплатная попытка возвращены."
+    ),
+    QualityIssue.BROKEN: (
+        "❌ <b>Запись пуста</b>\n\n"
+        "Отправьте голосовое сообщение ещё раз. Запрос не засчитан: оплата или бесплатная попытка возвращены."
+    ),
+}
 
 
 @broker.task
@@ -21,57 +61,162 @@ async def process_voice_message(request_id: int, bot_token: str):
         voice_service = VoiceService(session)
         user_service = UserService(session)
         
-        # Получаем запрос
-        request = await voice_service.get_request(request_id)
+        # Захватываем запрос; фиксируем сразу, чтобы он ушёл из очереди
+        request = await voice_service.claim_request(request_id)
         if not request:
-            print(f"Request {request_id} not found")
+            # Не найден или уже обрабатывается по переотправленной задаче
+            print(f"Request {request_id} not found or already claimed")
             return
+        await session.commit()
+        
+        chat_id, progress_message_id = request.chat_id, request.progress_message_id
         
         try:
-            # Помечаем запрос как обрабатываемый
-            await voice_service.update_request_status(
-                request_id, 
-                RequestStatus.PROCESSING
-            )
+            observe_queue_wait(TASK_NAME, request.created_at, datetime.utcnow())
+            started = time.perf_counter()
             
-            # Имитируем загрузку и обработку файла
-            # В реальном проекте здесь будет:
-            # 1. Скачивание файла через Bot API
-            # 2. Конвертация в нужный формат
-            # 3. Распознавание речи (Speech-to-Text)
-            # 4. Обработка в зависимости от категории/подкатегории
-            
-            # Симуляция обработки (20-60 секунд)
-            processing_time = random.randint(20, 60)
-            await asyncio.sleep(processing_time)
-            
-            # Генерируем mock результаты в зависимости от категории
-            processed_text = await _mock_speech_recognition(request)
-            response_text = await _mock_processing_response(
-                request.category, 
-                request.subcategory, 
-                processed_text
-            )
+            # Уровень выбирается по нагрузке в момент начала задачи
+            tier = await tier_controller.select(session)
+            fast = tier == RecognizerTier.FAST
+            language = settings.default_language
+            recognizer = get_recognizer(language, fast)
+            # Язык определяется по декодированной записи, даже если распознавателю она не нужна
+            identify = language_id_enabled()
             
-            # Обновляем запрос с результатами
-            await voice_service.update_request_status(
-                request_id,
-                RequestStatus.COMPLETED,
-                processed_text=processed_text,
-                response_text=response_text
-            )
+            audio = None
+            if recognizer.requires_audio or identify:
+                report_stage(bot_token, chat_id, progress_message_id, ProgressStage.DOWNLOADING)
+                with track_stage(TASK_NAME, "download"):
+                    audio = await download_voice(bot_token, request.voice_file_id)
             
-            # Отмечаем использование бесплатной услуги, если это было бесплатно
-            if request.is_free:
-                await user_service.mark_free_usage(request.user_id)
+            pcm = None
+            if audio is not None and (recognizer.supports_pcm or identify):
+                with track_stage(TASK_NAME, "decode"):
+                    pcm = await decode_audio(audio, SAMPLE_RATE)
+            
+            if pcm is not None and settings.quality_check_enabled:
+                # Вся запись по разреженной выборке: обработчик проверял только начало
+                with track_stage(TASK_NAME, "quality"):
+                    _, issue = assess_quality(
+                        pcm, settings.quality_min_rms_dbfs, settings.quality_max_clipping_ratio
+                    )
+                if issue is not None:
+                    AUDIO_QUALITY_REJECTIONS.labels("worker", issue.value).inc()
+                    await _refuse_request(voice_service, user_service, request, bot_token, QUALITY_TEXTS[issue])
+                    print(f"Request {request_id}: rejected by quality check ({issue.value})")
+                    return
+            
+            speech_duration = asr_seconds_saved = None
+            if pcm is not None and settings.vad_enabled:
+                with track_stage(TASK_NAME, "vad"):
+                    vad = detect_speech(pcm, SAMPLE_RATE)
+                    trimmed = _trim_silence(pcm, vad)
+                speech_duration = len(trimmed) / SAMPLE_RATE
+                asr_seconds_saved = (len(pcm) - len(trimmed)) / SAMPLE_RATE
+                pcm = trimmed
+                
+                if vad.speech_seconds < settings.vad_min_speech_seconds:
+                    # Речи нет — не тратим распознавание и возвращаем оплату
+                    await _refuse_request(
+                        voice_service, user_service, request, bot_token, NO_SPEECH_TEXT,
+                        speech_duration=speech_duration,
+                        asr_seconds_saved=asr_seconds_saved
+                    )
+                    print(f"Request {request_id}: no speech detected")
+                    return
+            
+            if pcm is not None and identify:
+                with track_stage(TASK_NAME, "language_id"):
+                    language = await detect_language(pcm, SAMPLE_RATE, fast)
+                recognizer = get_recognizer(language, fast)
+            LANGUAGE_DETECTIONS.labels(language).inc()
+            RECOGNIZER_TIER_REQUESTS.labels(tier.value).inc()
+            if not recognizer.supports_pcm:
+                pcm = None
             
-            # Отправляем результат пользователю
-            await _send_result_to_user(bot_token, request, response_text)
+            report_stage(bot_token, chat_id, progress_message_id, ProgressStage.RECOGNIZING)
+            with track_stage(TASK_NAME, "recognition"):
+                if settings.recognition_streaming and progress_message_id is not None:
+                    # Частичный текст показываем в сообщении о прогрессе (правки троттлятся)
+                    if pcm is not None:
+                        partials = recognizer.stream_samples(pcm, SAMPLE_RATE)
+                    else:
+                        partials = recognizer.recognize_stream(audio, request.voice_duration)
+                    processed_text = ""
+                    async for processed_text in partials:
+                        if not processed_text:
+                            continue
+                        if started is not None:
+                            observe_first_output(TASK_NAME, time.perf_counter() - started)
+                            started = None
+                        report_stage(
+                            bot_token, chat_id, progress_message_id,
+                            ProgressStage.RECOGNIZING, transcript=processed_text
+                        )
+                elif pcm is not None:
+                    processed_text = await recognizer.recognize_samples(pcm, SAMPLE_RATE)
+                else:
+                    processed_text = await recognizer.recognize(audio, request.voice_duration)
+            
+            processor_key = get_catalog().subcategory(request.subcategory).processor
+            processor = get_processor(processor_key)
+            cache_key = response_key(processed_text, request.subcategory, processor)
+            response_text = None
+            if settings.response_cache_enabled:
+                response_text = await response_cache.get(cache_key)
+            response_cached = response_text is not None
+            
+            if not response_cached:
+                report_stage(
+                    bot_token, chat_id, progress_message_id,
+                    ProgressStage.PROCESSING, transcript=processed_text
+                )
+                with track_stage(TASK_NAME, "processing"):
+                    response_text = await run_processor(processor_key, processed_text)
+                if settings.response_cache_enabled:
+                    await response_cache.set(cache_key, response_text)
+            
+            with track_stage(TASK_NAME, "saving"):
+                # Обновляем запрос с результатами
+                await voice_service.update_request_status(
+                    request_id,
+                    RequestStatus.COMPLETED,
+                    processed_text=processed_text,
+                    response_text=response_text,
+                    speech_duration=speech_duration,
+                    asr_seconds_saved=asr_seconds_saved,
+                    response_cached=response_cached,
+                    language=language,
+                    recognizer_tier=tier.value
+                )
+                
+                # Отмечаем использование бесплатной услуги, если это было бесплатно
+                if request.is_free:
+                    await user_service.mark_free_usage(request.user_id)
+                    await db_manager.mark_user_write(request.user_id)
+            
+            with track_stage(TASK_NAME, "delivery"):
+                # Отправляем результат пользователю
+                report_stage(bot_token, chat_id, progress_message_id, ProgressStage.COMPLETED)
+                if chat_id is None:
+                    # Запросы, созданные до появления chat_id
+                    user = await user_service.get_by_id(request.user_id)
+                    chat_id = user.telegram_id if user else None
+                if chat_id is not None:
+                    await _send_result_to_user(bot_token, chat_id, response_text)
+            
+            if started is not None:
+                # Без частичных результатов первый текст — итоговый ответ
+                observe_first_output(TASK_NAME, time.perf_counter() - started)
+            
+            # Результат уже у пользователя: теневой прогон его не задерживает
+            await _mirror_to_shadow(request_id, bot_token)
             
             print(f"Request {request_id} processed successfully")
             
         except Exception as e:
             print(f"Error processing request {request_id}: {e}")
+            report_stage(bot_token, chat_id, progress_message_id, ProgressStage.FAILED)
             
             # Помечаем запрос как неудачный
             await voice_service.update_request_status(
@@ -80,105 +225,139 @@ async def process_voice_message(request_id: int, bot_token: str):
                 response_text=f"Ошибка обработки: {str(e)}"
             )
             
-            # Возвращаем деньги, если это был платный запрос
-            if not request.is_free:
+            # Возвращаем деньги или бесплатную попытку
+            if request.is_free:
+                await user_service.reset_free_usage(request.user_id, request.previous_free_usage)
+            else:
                 await user_service.update_balance(request.user_id, request.cost)
+            await db_manager.mark_user_write(request.user_id)
 
 
-async def _mock_speech_recognition(request) -> str:
-    """Имитация распознавания речи."""
-    mock_texts = [
-        "Привет, как дела? Хотел обсудить новый проект.",
-        "Нужно организовать встречу на следующей неделе.",
-        "Расскажи про погоду и планы на выходные.",
-        "Помоги разобраться с документами и договором.",
-        "Номер телефона: 8-800-123-45-67, адрес улица Ленина дом 15."
-    ]
-    return random.choice(mock_texts)
-
-
-async def _mock_processing_response(
-    category: ServiceCategory,
-    subcategory: ServiceSubcategory, 
-    text: str
-) -> str:
-    """Имитация обработки в зависимости от категории."""
+async def requeue_starved_requests(bot_token: str) -> int:
+    """Переотправить с наивысшим приоритетом запросы, ждущие дольше scheduling_max_wait."""
+    if not db_manager.engine:
+        db_manager.init_engine()
     
-    if category == ServiceCategory.ARTISTIC:
-        if subcategory == ServiceSubcategory.DIALOGS:
-            return f"🎭 Художественная интерпретация диалога:\n\n" \
-                   f"Ваше сообщение преобразовано в красивый диалог:\n" \
-                   f"— {text}\n— Замечательно! Давайте это обсудим подробнее."
-        
-        elif subcategory == ServiceSubcategory.NATURE:
-            return f"🌿 Природное описание:\n\n" \
-                   f"Ваши слова звучат как шёпот леса: '{text}'\n" \
-                   f"Словно ветер несёт эти мысли через поля и луга..."
-        
-        elif subcategory == ServiceSubcategory.POETRY:
-            return f"📜 Поэтическая обработка:\n\n" \
-                   f"Из ваших слов родились строки:\n" \
-                   f"'{text[:30]}...'\n" \
-                   f"Как музыка души, что сердце трогает..."
+    async with db_manager.get_session() as session:
+        request_ids = await VoiceService(session).promote_starved_requests(
+            scheduling_policy.max_wait,
+            scheduling_policy.aged_priority
+        )
     
-    elif category == ServiceCategory.BUSINESS:
-        if subcategory == ServiceSubcategory.AGREEMENTS:
-            return f"🤝 Структурированное деловое предложение:\n\n" \
-                   f"ПРЕДМЕТ: Обсуждение проекта\n" \
-                   f"СОДЕРЖАНИЕ: {text}\n" \
-                   f"СЛЕДУЮЩИЕ ШАГИ: Организация встречи и подготовка документов"
-        
-        elif subcategory == ServiceSubcategory.PRESENTATIONS:
-            return f"📊 Структура для презентации:\n\n" \
-                   f"1. Введение: {text[:50]}...\n" \
-                   f"2. Основная часть: Развитие темы\n" \
-                   f"3. Заключение: Выводы и предложения"
+    # Старая задача остаётся в очереди; её отбросит claim_request
+    for request_id in request_ids:
+        await process_voice_message.kicker().with_labels(
+            priority=scheduling_policy.aged_priority
+        ).kiq(request_id, bot_token)
     
-    elif category == ServiceCategory.NUMBERS:
-        if subcategory == ServiceSubcategory.PHONE_NUMBERS:
-            import re
-            phones = re.findall(r'\d[\d\-\(\)\s]{7,}', text)
-            if phones:
-                return f"📞 Найденные контакты:\n\n" + \
-                       "\n".join([f"• {phone}" for phone in phones])
-            else:
-                return f"📞 В сообщении не найдено номеров телефонов.\n" \
-                       f"Исходный текст: {text}"
-        
-        elif subcategory == ServiceSubcategory.ROUTES:
-            return f"🗺️ Анализ маршрута:\n\n" \
-                   f"Описание: {text}\n" \
-                   f"Рекомендуемый транспорт: Общественный транспорт\n" \
-                   f"Примерное время: 30-45 минут"
+    if request_ids:
+        print(f"Requeued {len(request_ids)} starved requests")
+    return len(request_ids)
+
+
+async def watch_starved_requests(bot_token: str, interval: float) -> None:
+    """Периодически искать зависшие запросы; за интервал это делает один воркер."""
+    client = redis.from_url(settings.redis_url)
+    try:
+        while True:
+            try:
+                if await client.set(STARVATION_LOCK_KEY, "1", nx=True, ex=max(1, int(interval))):
+                    await requeue_starved_requests(bot_token)
+            except Exception as e:
+                print(f"Starved request check failed: {e}")
+            await asyncio.sleep(interval)
+    finally:
+        await client.aclose()
+
+
+# Попытки отправки результата при ответе 429
+SEND_ATTEMPTS = 3
+
+
+async def _mirror_to_shadow(request_id: int, bot_token: str):
+    """Отправить запрос в теневую очередь, если он попал в выборку."""
+    from app.tasks.shadow import run_shadow, should_shadow
+
+    if not should_shadow():
+        return
+    try:
+        await run_shadow.kiq(request_id, bot_token)
+    except Exception as e:
+        print(f"Shadow task for request {request_id} not sent: {e}")
+
+
+async def download_voice(bot_token: str, file_id: str) -> bytes:
+    """Скачать голосовое сообщение через Bot API (getFile + загрузка файла)."""
+    import httpx
     
-    # Базовый ответ
-    return f"✅ Обработка завершена.\n\n" \
-           f"Исходный текст: {text}\n\n" \
-           f"Категория: {category.value}\n" \
-           f"Подкатегория: {subcategory.value}"
+    async with httpx.AsyncClient(event_hooks=http_client_hooks("telegram")) as client:
+        response = await client.get(
+            f"{settings.telegram_api_url}/bot{bot_token}/getFile",
+            params={"file_id": file_id}
+        )
+        response.raise_for_status()
+        file_path = response.json()["result"]["file_path"]
+        
+        response = await client.get(f"{settings.telegram_api_url}/file/bot{bot_token}/{file_path}")
+        response.raise_for_status()
+        return response.content
+
 
+async def _refuse_request(
+    voice_service: VoiceService,
+    user_service: UserService,
+    request: ServiceRequest,
+    bot_token: str,
+    text: str,
+    **fields
+):
+    """Завершить запрос без распознавания, вернуть оплату или бесплатную попытку и сообщить пользователю."""
+    await voice_service.update_request_status(request.id, RequestStatus.FAILED, response_text=text, **fields)
+    if request.is_free:
+        # Бесплатная попытка отмечена при приёме запроса
+        await user_service.reset_free_usage(request.user_id, request.previous_free_usage)
+    else:
+        await user_service.update_balance(request.user_id, request.cost)
+    await db_manager.mark_user_write(request.user_id)
+    report_stage(bot_token, request.chat_id, request.progress_message_id, ProgressStage.FAILED)
+    if request.chat_id is not None:
+        await _send_message(bot_token, request.chat_id, text)
 
-async def _send_result_to_user(bot_token: str, request, response_text: str):
+
+def _trim_silence(pcm: np.ndarray, vad: VadResult) -> np.ndarray:
+    """Обрезать тишину по результату VAD с настройками пауз и отступов."""
+    return trim_silence(
+        pcm,
+        vad,
+        max_pause_seconds=settings.vad_max_pause,
+        padding_seconds=settings.vad_padding
+    )
+
+
+async def _send_result_to_user(bot_token: str, chat_id: int, response_text: str):
     """Отправить результат пользователю через Telegram Bot API."""
+    await _send_message(bot_token, chat_id, f"🎉 Ваш запрос обработан!\n\n{response_text}")
+
+
+async def _send_message(bot_token: str, chat_id: int, text: str):
+    """Отправить сообщение через Telegram Bot API с повтором при 429."""
     import httpx
     
     try:
-        user = request.user if hasattr(request, 'user') else None
-        if not user:
-            # Загружаем пользователя отдельно
-            async with db_manager.get_session() as session:
-                user_service = UserService(session)
-                user = await user_service.get_by_id(request.user_id)
-        
-        if user:
-            async with httpx.AsyncClient() as client:
-                await client.post(
-                    f"https://api.telegram.org/bot{bot_token}/sendMessage",
+        async with httpx.AsyncClient(event_hooks=http_client_hooks("telegram")) as client:
+            for _ in range(SEND_ATTEMPTS):
+                response = await client.post(
+                    f"{settings.telegram_api_url}/bot{bot_token}/sendMessage",
                     json={
-                        "chat_id": user.telegram_id,
-                        "text": f"🎉 Ваш запрос обработан!\n\n{response_text}",
+                        "chat_id": chat_id,
+                        "text": text,
                         "parse_mode": "HTML"
                     }
                 )
+                if response.status_code != 429:
+                    break
+                # Flood control: ждём, сколько просит Telegram
+                retry_after = response.json().get("parameters", {}).get("retry_after", 1)
+                await asyncio.sleep(retry_after)
     except Exception as e:
-        print(f"Error sending result to user: {e}")
\ No newline at end of file
+        print(f"Error sending message to user: {e}")
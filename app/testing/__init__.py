@@ -0,0 +1,14 @@
+"""
+Фейковые компоненты для нагрузочного и офлайн-тестирования
+"""
+
+from .audio_samples import synthesize_voice_pcm, synthesize_voice_wav
+from .bot_session import FakeBotSession
+from .fake_telegram import FakeTelegramServer
+
+__all__ = [
+    "FakeBotSession",
+    "FakeTelegramServer",
+    "synthesize_voice_pcm",
+    "synthesize_voice_wav",
+]
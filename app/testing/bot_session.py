@@ -0,0 +1,65 @@
+"""
+Фейковая сессия aiogram: отвечает на вызовы Bot API без сети
+"""
+
+import asyncio
+import itertools
+from collections import Counter
+from datetime import datetime
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import EditMessageText, GetMe, SendMessage, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import Chat, Message, User
+
+
+class FakeBotSession(BaseSession):
+    """Сессия, возвращающая синтетические ответы с заданной задержкой."""
+
+    def __init__(self, latency: float = 0.0, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.calls: Counter[str] = Counter()
+        self._message_ids = itertools.count(1)
+
+    async def close(self) -> None:
+        pass
+
+    async def make_request(
+        self,
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+        timeout: Optional[int] = None,
+    ) -> TelegramType:
+        self.calls[method.__api_method__] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._build_result(bot, method)
+
+    async def stream_content(
+        self,
+        url: str,
+        headers: Optional[Dict[str, Any]] = None,
+        timeout: int = 30,
+        chunk_size: int = 65536,
+        raise_for_status: bool = True,
+    ) -> AsyncGenerator[bytes, None]:
+        yield b""
+
+    def _build_result(self, bot: Bot, method: TelegramMethod[Any]) -> Any:
+        if isinstance(method, GetMe):
+            return User(id=bot.id, is_bot=True, first_name="FakeBot", username="fake_bot")
+
+        if isinstance(method, (SendMessage, EditMessageText)):
+            chat_id = method.chat_id if isinstance(method.chat_id, int) else 0
+            message_id = getattr(method, "message_id", None) or next(self._message_ids)
+            return Message(
+                message_id=message_id,
+                date=datetime.now(),
+                chat=Chat(id=chat_id, type="private"),
+                text=method.text,
+            )
+
+        return True
@@ -0,0 +1,312 @@
+"""
+Локальный фейковый сервер Telegram Bot API
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Optional
+
+from aiohttp import ClientSession, web
+
+from app.testing.audio_samples import synthesize_voice_wav
+
+logger = logging.getLogger(__name__)
+
+# Максимальное ожидание long polling, секунд
+MAX_POLL_TIMEOUT = 50
+
+
+class FakeTelegramServer:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        rate_limit_probability: float = 0.0,
+        retry_after: int = 1,
+        samples_dir: Optional[Path] = None,
+        sample_duration: float = 10.0,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.rate_limit_probability = rate_limit_probability
+        self.retry_after = retry_after
+        self.sample_duration = sample_duration
+
+        self.samples = sorted(samples_dir.glob("*.og*")) if samples_dir else []
+        self._generated_sample: Optional[bytes] = None
+        self._rng = random.Random(seed)
+
+        self.calls: Counter[str] = Counter()
+        self.rate_limited: Counter[str] = Counter()
+        self.updates: dict[str, list[dict]] = defaultdict(list)
+        self.update_events: dict[str, asyncio.Event] = defaultdict(asyncio.Event)
+        self.webhooks: dict[str, str] = {}
+        self.messages: dict[int, dict[int, dict]] = defaultdict(dict)
+        self._next_update_id: dict[str, int] = defaultdict(lambda: 1)
+        self._next_message_id = 1
+
+        self.methods = {
+            "getMe": self.get_me,
+            "getUpdates": self.get_updates,
+            "setWebhook": self.set_webhook,
+            "deleteWebhook": self.delete_webhook,
+            "getWebhookInfo": self.get_webhook_info,
+            "sendMessage": self.send_message,
+            "editMessageText": self.edit_message_text,
+            "answerCallbackQuery": self.answer_callback_query,
+            "getFile": self.get_file,
+        }
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_route("*", "/bot{token}/{method}", self.handle_method)
+        app.router.add_get("/file/bot{token}/{file_path:.+}", self.handle_file)
+        app.router.add_post("/_control/{token}/updates", self.handle_inject_updates)
+        app.router.add_get("/_control/stats", self.handle_stats)
+        return app
+
+    # --- Инфраструктура ---
+
+    async def _simulate_latency(self) -> None:
+        delay = self.latency + self._rng.uniform(0, self.latency_jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _should_rate_limit(self) -> bool:
+        return self._rng.random() < self.rate_limit_probability
+
+    @staticmethod
+    def _ok(result: Any) -> web.Response:
+        return web.json_response({"ok": True, "result": result})
+
+    @staticmethod
+    def _error(code: int, description: str, **parameters: Any) -> web.Response:
+        payload: dict[str, Any] = {"ok": False, "error_code": code, "description": description}
+        if parameters:
+            payload["parameters"] = parameters
+        return web.json_response(payload, status=code)
+
+    @staticmethod
+    async def _read_params(request: web.Request) -> dict[str, Any]:
+        """Параметры метода из query, JSON или form-data (aiogram шлёт multipart)."""
+        params: dict[str, Any] = dict(request.query)
+        if request.content_type == "application/json":
+            params.update(await request.json())
+        elif request.can_read_body:
+            for key, value in (await request.post()).items():
+                if isinstance(value, str):
+                    # Вложенные объекты aiogram сериализует в JSON-строки
+                    try:
+                        value = json.loads(value)
+                    except ValueError:
+                        pass
+                params[key] = value
+        return params
+
+    @staticmethod
+    def _bot_user(token: str) -> dict:
+        bot_id = int(token.split(":", 1)[0]) if ":" in token else 0
+        return {"id": bot_id, "is_bot": True, "first_name": "FakeBot", "username": "fake_bot"}
+
+    async def handle_method(self, request: web.Request) -> web.Response:
+        token = request.match_info["token"]
+        method = request.match_info["method"]
+        self.calls[method] += 1
+
+        await self._simulate_latency()
+
+        handler = self.methods.get(method)
+        if handler is None:
+            return self._error(404, "Not Found: method not found")
+
+        if method != "getUpdates" and self._should_rate_limit():
+            self.rate_limited[method] += 1
+            return self._error(
+                429,
+                f"Too Many Requests: retry after {self.retry_after}",
+                retry_after=self.retry_after,
+            )
+
+        params = await self._read_params(request)
+        return await handler(token, params)
+
+    # --- Методы Bot API ---
+
+    async def get_me(self, token: str, params: dict) -> web.Response:
+        return self._ok(self._bot_user(token))
+
+    async def get_updates(self, token: str, params: dict) -> web.Response:
+        offset = int(params.get("offset") or 0)
+        timeout = min(int(params.get("timeout") or 0), MAX_POLL_TIMEOUT)
+        limit = int(params.get("limit") or 100)
+
+        # Подтверждённые апдейты (id < offset) удаляются, как в Telegram
+        self.updates[token] = [u for u in self.updates[token] if u["update_id"] >= offset]
+
+        if not self.updates[token] and timeout:
+            event = self.update_events[token]
+            event.clear()
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        return self._ok(self.updates[token][:limit])
+
+    async def set_webhook(self, token: str, params: dict) -> web.Response:
+        self.webhooks[token] = params.get("url", "")
+        return self._ok(True)
+
+    async def delete_webhook(self, token: str, params: dict) -> web.Response:
+        self.webhooks.pop(token, None)
+        return self._ok(True)
+
+    async def get_webhook_info(self, token: str, params: dict) -> web.Response:
+        return self._ok({
+            "url": self.webhooks.get(token, ""),
+            "has_custom_certificate": False,
+            "pending_update_count": len(self.updates[token]),
+        })
+
+    def _message(self, token: str, chat_id: int, message_id: int, text: str, **extra: Any) -> dict:
+        return {
+            "message_id": message_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": self._bot_user(token),
+            "text": text,
+            **extra,
+        }
+
+    async def send_message(self, token: str, params: dict) -> web.Response:
+        if "chat_id" not in params or "text" not in params:
+            return self._error(400, "Bad Request: chat_id and text are required")
+
+        chat_id = int(params["chat_id"])
+        message_id = self._next_message_id
+        self._next_message_id += 1
+
+        message = self._message(token, chat_id, message_id, str(params["text"]))
+        self.messages[chat_id][message_id] = message
+        return self._ok(message)
+
+    async def edit_message_text(self, token: str, params: dict) -> web.Response:
+        if "inline_message_id" in params:
+            return self._ok(True)
+
+        chat_id = int(params.get("chat_id", 0))
+        message_id = int(params.get("message_id", 0))
+        stored = self.messages[chat_id].get(message_id)
+        text = str(params.get("text", ""))
+
+        if stored is not None and stored["text"] == text:
+            return self._error(400, "Bad Request: message is not modified")
+
+        message = self._message(token, chat_id, message_id, text, edit_date=int(time.time()))
+        self.messages[chat_id][message_id] = message
+        return self._ok(message)
+
+    async def answer_callback_query(self, token: str, params: dict) -> web.Response:
+        return self._ok(True)
+
+    async def get_file(self, token: str, params: dict) -> web.Response:
+        file_id = str(params.get("file_id", ""))
+        if not file_id:
+            return self._error(400, "Bad Request: file_id is required")
+
+        content = self._sample_for(file_id)
+        extension = "oga" if self.samples else "wav"
+        return self._ok({
+            "file_id": file_id,
+            "file_unique_id": f"u{abs(hash(file_id))}",
+            "file_size": len(content),
+            "file_path": f"voice/{file_id}.{extension}",
+        })
+
+    # --- Файлы ---
+
+    def _sample_for(self, file_id: str) -> bytes:
+        if self.samples:
+            index = sum(file_id.encode()) % len(self.samples)
+            return self.samples[index].read_bytes()
+
+        if self._generated_sample is None:
+            self._generated_sample = synthesize_voice_wav(self.sample_duration)
+        return self._generated_sample
+
+    async def handle_file(self, request: web.Request) -> web.Response:
+        await self._simulate_latency()
+        file_path = request.match_info["file_path"]
+        file_id = Path(file_path).stem
+        content_type = "audio/ogg" if self.samples else "audio/wav"
+        return web.Response(body=self._sample_for(file_id), content_type=content_type)
+
+    # --- Управление ---
+
+    async def handle_inject_updates(self, request: web.Request) -> web.Response:
+        token = request.match_info["token"]
+        payload = await request.json()
+        updates = payload if isinstance(payload, list) else [payload]
+
+        for update in updates:
+            update["update_id"] = self._next_update_id[token]
+            self._next_update_id[token] += 1
+
+        webhook = self.webhooks.get(token)
+        if webhook:
+            async with ClientSession() as session:
+                for update in updates:
+                    async with session.post(webhook, json=update) as response:
+                        if response.status >= 400:
+                            logger.warning(f"Webhook {webhook} returned {response.status}")
+        else:
+            self.updates[token].extend(updates)
+            self.update_events[token].set()
+
+        return self._ok(len(updates))
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            "calls": dict(self.calls),
+            "rate_limited": dict(self.rate_limited),
+            "pending_updates": {token: len(items) for token, items in self.updates.items()},
+        })
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Fake Telegram Bot API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="Base response latency, seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency, seconds")
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="Probability of answering 429 Too Many Requests")
+    parser.add_argument("--retry-after", type=int, default=1, help="retry_after in 429 responses")
+    parser.add_argument("--samples-dir", type=Path, help="Directory with sample .ogg/.oga files")
+    parser.add_argument("--sample-duration", type=float, default=10.0,
+                        help="Duration of the generated WAV when no samples are given")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    server = FakeTelegramServer(
+        latency=args.latency,
+        latency_jitter=args.jitter,
+        rate_limit_probability=args.rate_limit,
+        retry_after=args.retry_after,
+        samples_dir=args.samples_dir,
+        sample_duration=args.sample_duration,
+        seed=args.seed,
+    )
+    web.run_app(server.build_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+Разбор распознанного текста: телефоны, числа, вычисления, ряды
+"""
+
+from .calculator import Calculation, Quantity, calculate, format_quantity
+from .numerals import NumberSpan, find_numbers, format_number, normalize_numbers
+from .phones import PhoneMatch, extract_phones, extract_phones_batch, format_phone, normalize_spoken
+from .series import Series, SeriesSummary, extract_series, render_summary, summarize_batch
+
+__all__ = [
+    "Calculation",
+    "NumberSpan",
+    "PhoneMatch",
+    "Quantity",
+    "Series",
+    "SeriesSummary",
+    "calculate",
+    "extract_phones",
+    "extract_phones_batch",
+    "extract_series",
+    "find_numbers",
+    "format_number",
+    "format_phone",
+    "format_quantity",
+    "normalize_numbers",
+    "normalize_spoken",
+    "render_summary",
+    "summarize_batch",
+]
@@ -0,0 +1,382 @@
+"""
+Вычисление арифметики из распознанного текста
+"""
+
+import decimal
+import re
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
+from typing import Optional, Union
+
+from app.text.numerals import normalize_numbers
+
+MAX_TOKENS = 64
+MAX_EXPRESSIONS = 10
+MAX_EXPONENT = 100
+EVALUATION_TIMEOUT = 0.05  # Секунды на одно выражение
+PARSE_CACHE_SIZE = 4096
+TOO_LARGE = "слишком большое число"
+
+# Точность и диапазон порядков: большие степени переполняются, а не считаются долго
+CONTEXT = decimal.Context(
+    prec=28, Emax=999, Emin=-999,
+    traps=[decimal.DivisionByZero, decimal.InvalidOperation, decimal.Overflow],
+)
+
+OPERATOR_WORDS = {
+    "умножить на": "*", "умноженное на": "*", "помножить на": "*", "умножить": "*",
+    "разделить на": "/", "поделить на": "/", "делить на": "/", "деленное на": "/", "делённое на": "/",
+    "плюс": "+", "прибавить": "+",
+    "минус": "-", "отнять": "-", "вычесть": "-",
+    "в квадрате": "^ 2", "в кубе": "^ 3", "в степени": "^",
+    "процент": "%", "процента": "%", "процентов": "%",
+    "открыть скобку": "(", "скобка открывается": "(",
+    "закрыть скобку": ")", "скобка закрывается": ")",
+}
+# Единица → (величина, множитель к базовой единице)
+UNITS = {
+    "руб": ("rub", Decimal(1)), "рубль": ("rub", Decimal(1)), "рубля": ("rub", Decimal(1)),
+    "рублей": ("rub", Decimal(1)), "₽": ("rub", Decimal(1)),
+    "коп": ("rub", Decimal("0.01")), "копейка": ("rub", Decimal("0.01")),
+    "копейки": ("rub", Decimal("0.01")), "копеек": ("rub", Decimal("0.01")),
+    "м": ("m", Decimal(1)), "метр": ("m", Decimal(1)), "метра": ("m", Decimal(1)), "метров": ("m", Decimal(1)),
+    "км": ("m", Decimal(1000)), "километр": ("m", Decimal(1000)), "километра": ("m", Decimal(1000)),
+    "километров": ("m", Decimal(1000)),
+    "см": ("m", Decimal("0.01")), "сантиметр": ("m", Decimal("0.01")), "сантиметра": ("m", Decimal("0.01")),
+    "сантиметров": ("m", Decimal("0.01")),
+    "кг": ("kg", Decimal(1)), "килограмм": ("kg", Decimal(1)), "килограмма": ("kg", Decimal(1)),
+    "килограммов": ("kg", Decimal(1)),
+    "г": ("kg", Decimal("0.001")), "грамм": ("kg", Decimal("0.001")), "грамма": ("kg", Decimal("0.001")),
+    "граммов": ("kg", Decimal("0.001")),
+    "т": ("kg", Decimal(1000)), "тонна": ("kg", Decimal(1000)), "тонны": ("kg", Decimal(1000)),
+    "тонн": ("kg", Decimal(1000)),
+}
+# Единица показа результата: (порог, название, множитель) по убыванию порога
+DISPLAY_UNITS = {
+    "rub": ((Decimal(0), "руб.", Decimal(1)),),
+    "m": ((Decimal(1000), "км", Decimal(1000)), (Decimal(0), "м", Decimal(1))),
+    "kg": ((Decimal(1000), "т", Decimal(1000)), (Decimal(0), "кг", Decimal(1))),
+}
+
+_operator_words = "|".join(sorted(OPERATOR_WORDS, key=len, reverse=True))
+OPERATOR_PATTERN = re.compile(rf"(?<!\w)(?:{_operator_words})(?!\w)", re.IGNORECASE)
+TOKEN_PATTERN = re.compile(
+    r"(?P<number>\d+(?:[.,]\d+)?)|(?P<op>[-+*/×:^−])|(?P<percent>%)|(?P<paren>[()])"
+    r"|(?P<word>[а-яёa-z]+|₽)|(?P<other>\S)",
+    re.IGNORECASE,
+)
+# Телефоны (группы цифр через дефис, всего от 7 цифр) и время — не выражения
+PHONE_PATTERN = re.compile(r"(?<![\w.,])\+?\d+(?:[ -]?\(\d+\))?(?:[ -]?\d+)*?(?:-\d+){2,}(?![\w.,])")
+PHONE_MIN_DIGITS = 7
+TIME_PATTERN = re.compile(r"(?<![\w.,:])(?:[01]?\d|2[0-3]):[0-5]\d(?![\w.,:])")
+# Разряды через пробел: «1 000 000»
+GROUPED_NUMBER = re.compile(r"(?<![\w.,])\d{1,3}(?: \d{3})+(?![\w.,]| \d)")
+# Без знаков операций выражений в тексте нет («от» бывает только после «%»)
+OPERATOR_CHARS = re.compile(r"[-+*/×:^−%]")
+CANONICAL_OPERATORS = {"×": "*", ":": "/", "−": "-"}
+
+# Силы связывания для парсера Пратта
+ADDITIVE, MULTIPLICATIVE, PREFIX, POWER, POSTFIX = 10, 20, 30, 40, 50
+INFIX_POWER = {"+": ADDITIVE, "-": ADDITIVE, "*": MULTIPLICATIVE, "/": MULTIPLICATIVE, "от": MULTIPLICATIVE,
+               "^": POWER}
+
+
+@dataclass(frozen=True, slots=True)
+class Num:
+    value: Decimal
+
+
+@dataclass(frozen=True, slots=True)
+class WithUnit:
+    operand: "Node"
+    unit: str
+
+
+@dataclass(frozen=True, slots=True)
+class Percent:
+    operand: "Node"
+
+
+@dataclass(frozen=True, slots=True)
+class Negate:
+    operand: "Node"
+
+
+@dataclass(frozen=True, slots=True)
+class BinOp:
+    op: str
+    left: "Node"
+    right: "Node"
+
+
+Node = Union[Num, WithUnit, Percent, Negate, BinOp]
+
+
+@dataclass(frozen=True, slots=True)
+class Quantity:
+    value: Decimal
+    dimension: Optional[str] = None  # None — безразмерное число
+
+
+@dataclass(frozen=True, slots=True)
+class Calculation:
+    source: str  # Участок нормализованного текста
+    result: Optional[Quantity]
+    error: Optional[str] = None
+
+
+def _replace_operator(match: re.Match) -> str:
+    return f" {OPERATOR_WORDS[match.group(0).lower()]} "
+
+
+def _mask(match: re.Match) -> str:
+    """Заменить участок символом вне выражений, сохранив позиции."""
+    return "#" * len(match.group(0))
+
+
+def _mask_phone(match: re.Match) -> str:
+    digits = sum(char.isdigit() for char in match.group(0))
+    return _mask(match) if digits >= PHONE_MIN_DIGITS else match.group(0)
+
+
+def prepare_text(text: str) -> str:
+    """Числа цифрами, слова-операции символами; телефоны и время скрыты."""
+    text = OPERATOR_PATTERN.sub(_replace_operator, normalize_numbers(text))
+    text = TIME_PATTERN.sub(_mask, PHONE_PATTERN.sub(_mask_phone, text))
+    return GROUPED_NUMBER.sub(lambda match: match.group(0).replace(" ", ""), text)
+
+
+def _tokens(text: str) -> list[tuple[int, int, Optional[str]]]:
+    """(начало, конец, каноническая запись); None — слово вне выражения."""
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(text):
+        kind, value = match.lastgroup, match.group(0)
+        if kind == "number":
+            canonical = value.replace(",", ".")
+        elif kind == "op":
+            canonical = CANONICAL_OPERATORS.get(value, value)
+        elif kind in ("percent", "paren"):
+            canonical = value
+        elif kind == "word" and (value.lower() in UNITS or value.lower() == "от"):
+            canonical = value.lower()
+        else:
+            canonical = None
+        tokens.append((match.start(), match.end(), canonical))
+    return tokens
+
+
+def find_expressions(text: str) -> list[tuple[str, str]]:
+    """Кандидаты в выражения: (участок текста, нормализованная запись)."""
+    prepared = prepare_text(text)
+    if not OPERATOR_CHARS.search(prepared):
+        return []
+    expressions = []
+    run: list[tuple[int, int, str]] = []
+    for token in _tokens(prepared) + [(len(prepared), len(prepared), None)]:
+        if token[2] is not None:
+            run.append(token)
+            continue
+        if not run:
+            continue
+        parts = [canonical for _, _, canonical in run]
+        # Одно число со знаком («плюс два») — не вычисление
+        numbers = sum(part[0].isdigit() for part in parts)
+        has_operator = any(part in INFIX_POWER for part in parts)
+        if numbers >= 2 and has_operator:
+            source = " ".join(prepared[run[0][0]:run[-1][1]].split())
+            expressions.append((source, " ".join(parts)))
+        run = []
+    return expressions
+
+
+class _Parser:
+    def __init__(self, tokens: list[str]):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def next(self) -> str:
+        token = self.peek()
+        if token is None:
+            raise ValueError("Unexpected end of expression")
+        self.position += 1
+        return token
+
+    def compound(self, left: WithUnit) -> Node:
+        """«3 рубля 50 копеек», «2 км 300 м»: слагаемые одной величины по убыванию единиц."""
+        dimension, factor = UNITS[left.unit]
+        while self.position + 1 < len(self.tokens):
+            number, unit = self.tokens[self.position], self.tokens[self.position + 1]
+            if not number[0].isdigit() or unit not in UNITS:
+                break
+            unit_dimension, unit_factor = UNITS[unit]
+            if unit_dimension != dimension or unit_factor >= factor:
+                break
+            self.position += 2
+            left = BinOp("+", left, WithUnit(Num(Decimal(number)), unit))
+            factor = unit_factor
+        return left
+
+    def parse(self, min_power: int = 0) -> Node:
+        token = self.next()
+        if token[0].isdigit():
+            left: Node = Num(Decimal(token))
+        elif token == "(":
+            left = self.parse()
+            if self.next() != ")":
+                raise ValueError("Unbalanced parentheses")
+        elif token == "-":
+            left = Negate(self.parse(PREFIX))
+        elif token == "+":
+            left = self.parse(PREFIX)
+        else:
+            raise ValueError(f"Unexpected token: {token}")
+
+        while True:
+            token = self.peek()
+            if token is None or token == ")":
+                return left
+            if token == "%":
+                self.position += 1
+                left = Percent(left)
+                continue
+            if token in UNITS:
+                self.position += 1
+                left = self.compound(WithUnit(left, token))
+                continue
+            power = INFIX_POWER.get(token)
+            if power is None:
+                raise ValueError(f"Unexpected token: {token}")
+            if power <= min_power:
+                return left
+            self.position += 1
+            # Степень правоассоциативна
+            right = self.parse(power - 1 if token == "^" else power)
+            left = BinOp(token, left, right)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_expression(expression: str) -> Node:
+    """Дерево выражения по нормализованной записи (токены через пробел)."""
+    tokens = expression.split()
+    if len(tokens) > MAX_TOKENS:
+        raise ValueError("Expression is too long")
+    parser = _Parser(tokens)
+    node = parser.parse()
+    if parser.peek() is not None:
+        raise ValueError(f"Unexpected token: {parser.peek()}")
+    return node
+
+
+def _same_dimension(left: Quantity, right: Quantity) -> Optional[str]:
+    """Сложение числа с величиной считает число в тех же единицах."""
+    if left.dimension and right.dimension and left.dimension != right.dimension:
+        raise ValueError("Incompatible units")
+    return left.dimension or right.dimension
+
+
+def _evaluate(node: Node, deadline: float) -> Quantity:
+    result = _evaluate_node(node, deadline)
+    if not result.value.is_finite():
+        # Например, 0 в отрицательной степени
+        raise ZeroDivisionError("Non-finite result")
+    return result
+
+
+def _evaluate_node(node: Node, deadline: float) -> Quantity:
+    if time.monotonic() > deadline:
+        raise ValueError("Evaluation timed out")
+
+    if isinstance(node, Num):
+        return Quantity(node.value)
+    if isinstance(node, Negate):
+        operand = _evaluate(node.operand, deadline)
+        return Quantity(CONTEXT.minus(operand.value), operand.dimension)
+    if isinstance(node, WithUnit):
+        operand = _evaluate(node.operand, deadline)
+        if operand.dimension is not None:
+            raise ValueError("Unit applied twice")
+        dimension, factor = UNITS[node.unit]
+        return Quantity(CONTEXT.multiply(operand.value, factor), dimension)
+    if isinstance(node, Percent):
+        operand = _evaluate(node.operand, deadline)
+        return Quantity(CONTEXT.divide(operand.value, 100), operand.dimension)
+
+    left = _evaluate(node.left, deadline)
+    right = _evaluate(node.right, deadline)
+    if node.op in ("+", "-"):
+        if isinstance(node.right, Percent) and right.dimension is None:
+            # A ± p%: изменить A на p процентов
+            factor = CONTEXT.add(1, right.value) if node.op == "+" else CONTEXT.subtract(1, right.value)
+            return Quantity(CONTEXT.multiply(left.value, factor), left.dimension)
+        dimension = _same_dimension(left, right)
+        operation = CONTEXT.add if node.op == "+" else CONTEXT.subtract
+        return Quantity(operation(left.value, right.value), dimension)
+    if node.op in ("*", "от"):
+        if left.dimension and right.dimension:
+            raise ValueError("Cannot multiply two quantities")
+        return Quantity(CONTEXT.multiply(left.value, right.value), left.dimension or right.dimension)
+    if node.op == "/":
+        if right.dimension and right.dimension != left.dimension:
+            raise ValueError("Incompatible units")
+        dimension = None if right.dimension else left.dimension
+        return Quantity(CONTEXT.divide(left.value, right.value), dimension)
+
+    # Степень
+    if left.dimension or right.dimension:
+        raise ValueError("Cannot raise a quantity to a power")
+    if right.value != right.value.to_integral_value() or abs(right.value) > MAX_EXPONENT:
+        raise ValueError("Unsupported exponent")
+    return Quantity(CONTEXT.power(left.value, int(right.value)))
+
+
+def evaluate(node: Node, timeout: float = EVALUATION_TIMEOUT) -> Quantity:
+    return _evaluate(node, time.monotonic() + timeout)
+
+
+def format_quantity(quantity: Quantity) -> str:
+    value = quantity.value
+    if quantity.dimension is None:
+        return format_decimal(value)
+    for threshold, name, factor in DISPLAY_UNITS[quantity.dimension]:
+        if abs(value) >= threshold:
+            if quantity.dimension == "rub":
+                try:
+                    return f"{value.quantize(Decimal('0.01'), context=CONTEXT):f} {name}"
+                except decimal.InvalidOperation:
+                    # С копейками сумма не помещается в точность контекста
+                    return TOO_LARGE
+            return f"{format_decimal(CONTEXT.divide(value, factor))} {name}"
+    return format_decimal(value)
+
+
+def format_decimal(value: Decimal) -> str:
+    rounded = value.quantize(Decimal("1e-10"), context=CONTEXT) if value.adjusted() < 17 else value
+    return format(rounded.normalize(CONTEXT), "f")
+
+
+def calculate(text: str) -> list[Calculation]:
+    """Найти и вычислить выражения в тексте."""
+    calculations = []
+    for source, expression in find_expressions(text)[:MAX_EXPRESSIONS]:
+        if expression.count(" ") >= MAX_TOKENS:
+            calculations.append(Calculation(source, None, "слишком длинное выражение"))
+            continue
+        try:
+            node = parse_expression(expression)
+        except ValueError:
+            # Не выражение, а просто числа и знаки рядом
+            continue
+        try:
+            calculations.append(Calculation(source, evaluate(node)))
+        except (ZeroDivisionError, decimal.DivisionUndefined):
+            calculations.append(Calculation(source, None, "деление на ноль"))
+        except decimal.Overflow:
+            calculations.append(Calculation(source, None, TOO_LARGE))
+        except (ValueError, ArithmeticError):
+            calculations.append(Calculation(source, None, "не удалось вычислить"))
+    return calculations
@@ -0,0 +1,288 @@
+"""
+Числа, записанные словами, в распознанном тексте: разбор конечным автоматом за линейное время
+"""
+
+import re
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import NamedTuple, Optional, Union
+
+Number = Union[int, Decimal]
+
+# Классы слов: порядок внутри группы до тысячи — сотни, десятки, единицы
+UNIT, TEEN, TEN, HUNDRED, SCALE, HALF = range(6)
+
+
+class Lexeme(NamedTuple):
+    value: Number
+    kind: int
+    ordinal: bool = False
+
+
+# Количественные: значение → формы (именительный первым)
+UNITS = {
+    0: ("ноль", "нуль", "нуля", "нулю", "нолю", "нулем", "нулём", "нолем", "нуле", "ноле"),
+    1: ("один", "одна", "одно", "одни", "одного", "одной", "одному", "одну", "одним", "одною",
+        "одном", "одних", "одними"),
+    2: ("два", "две", "двух", "двум", "двумя"),
+    3: ("три", "трех", "трёх", "трем", "трём", "тремя"),
+    4: ("четыре", "четырех", "четырёх", "четырем", "четырём", "четырьмя"),
+    5: ("пять", "пяти", "пятью"),
+    6: ("шесть", "шести", "шестью"),
+    # «семью» не берём: чаще это форма слова «семья»
+    7: ("семь", "семи"),
+    8: ("восемь", "восьми", "восемью", "восьмью"),
+    9: ("девять", "девяти", "девятью"),
+}
+TEENS = {
+    10: "десять", 11: "одиннадцать", 12: "двенадцать", 13: "тринадцать", 14: "четырнадцать",
+    15: "пятнадцать", 16: "шестнадцать", 17: "семнадцать", 18: "восемнадцать", 19: "девятнадцать",
+}
+TENS = {
+    20: ("двадцать", "двадцати", "двадцатью"),
+    30: ("тридцать", "тридцати", "тридцатью"),
+    40: ("сорок", "сорока"),
+    50: ("пятьдесят", "пятидесяти", "пятьюдесятью"),
+    60: ("шестьдесят", "шестидесяти", "шестьюдесятью"),
+    70: ("семьдесят", "семидесяти", "семьюдесятью"),
+    80: ("восемьдесят", "восьмидесяти", "восемьюдесятью", "восьмьюдесятью"),
+    90: ("девяносто", "девяноста"),
+}
+# Сотни 2-9: именительный, основы родительного и творительного падежей
+HUNDREDS = {
+    2: ("двести", "двух", "двумя"),
+    3: ("триста", "трёх", "тремя"),
+    4: ("четыреста", "четырёх", "четырьмя"),
+    5: ("пятьсот", "пяти", "пятью"),
+    6: ("шестьсот", "шести", "шестью"),
+    7: ("семьсот", "семи", "семью"),
+    8: ("восемьсот", "восьми", "восемью"),
+    9: ("девятьсот", "девяти", "девятью"),
+}
+SCALES = {
+    1000: ("тысяча", "тысячи", "тысяче", "тысячу", "тысячей", "тысячею", "тысяч", "тысячам",
+           "тысячами", "тысячах"),
+    10 ** 6: ("миллион", "миллиона", "миллиону", "миллионом", "миллионе", "миллионы", "миллионов",
+              "миллионам", "миллионами", "миллионах"),
+    10 ** 9: ("миллиард", "миллиарда", "миллиарду", "миллиардом", "миллиарде", "миллиарды",
+              "миллиардов", "миллиардам", "миллиардами", "миллиардах"),
+}
+HALF_FORMS = ("полтора", "полторы", "полутора")
+
+# Порядковые: основа и тип окончаний
+ORDINAL_STEMS = {
+    1: ("перв", "ый"), 2: ("втор", "ой"), 3: ("трет", "ий"), 4: ("четвёрт", "ый"),
+    5: ("пят", "ый"), 6: ("шест", "ой"), 7: ("седьм", "ой"), 8: ("восьм", "ой"), 9: ("девят", "ый"),
+    10: ("десят", "ый"), 11: ("одиннадцат", "ый"), 12: ("двенадцат", "ый"), 13: ("тринадцат", "ый"),
+    14: ("четырнадцат", "ый"), 15: ("пятнадцат", "ый"), 16: ("шестнадцат", "ый"),
+    17: ("семнадцат", "ый"), 18: ("восемнадцат", "ый"), 19: ("девятнадцат", "ый"),
+    20: ("двадцат", "ый"), 30: ("тридцат", "ый"), 40: ("сороков", "ой"), 50: ("пятидесят", "ый"),
+    60: ("шестидесят", "ый"), 70: ("семидесят", "ый"), 80: ("восьмидесят", "ый"),
+    90: ("девяност", "ый"), 100: ("сот", "ый"),
+    1000: ("тысячн", "ый"), 10 ** 6: ("миллионн", "ый"), 10 ** 9: ("миллиардн", "ый"),
+}
+ADJECTIVE_ENDINGS = ("ого", "ому", "ым", "ом", "ая", "ой", "ую", "ое", "ые", "ых", "ыми")
+SOFT_ENDINGS = ("ий", "ьего", "ьему", "ьим", "ьем", "ья", "ьей", "ью", "ье", "ьи", "ьих", "ьими")
+# Основы родительного падежа для «двухсотый», «пятитысячный»
+GENITIVE_PREFIXES = {
+    2: "двух", 3: "трёх", 4: "четырёх", 5: "пяти", 6: "шести", 7: "семи", 8: "восьми", 9: "девяти",
+}
+
+WORD_PATTERN = re.compile(r"[а-яё]+|\d+(?:[.,]\d+)?", re.IGNORECASE)
+
+
+def _ordinal_forms(stem: str, nominative: str) -> list[str]:
+    if nominative == "ий":
+        return [stem + ending for ending in SOFT_ENDINGS]
+    return [stem + nominative] + [stem + ending for ending in ADJECTIVE_ENDINGS]
+
+
+def _kind(value: int) -> int:
+    if value < 10:
+        return UNIT
+    if value < 20:
+        return TEEN
+    if value < 100:
+        return TEN
+    if value < 1000:
+        return HUNDRED
+    return SCALE
+
+
+def _build_lexicon() -> dict[str, Lexeme]:
+    lexicon: dict[str, Lexeme] = {}
+
+    def add(form: str, lexeme: Lexeme) -> None:
+        lexicon[form] = lexeme
+        lexicon[form.replace("ё", "е")] = lexeme
+
+    for value, forms in UNITS.items():
+        for form in forms:
+            add(form, Lexeme(value, UNIT))
+    for value, form in TEENS.items():
+        for variant in (form, form[:-1] + "и", form[:-1] + "ью"):
+            add(variant, Lexeme(value, TEEN))
+    for value, forms in TENS.items():
+        for form in forms:
+            add(form, Lexeme(value, TEN))
+    for form in ("сто", "ста"):
+        add(form, Lexeme(100, HUNDRED))
+    for digit, (nominative, genitive, instrumental) in HUNDREDS.items():
+        value = digit * 100
+        for form in (nominative, genitive + "сот", genitive + "стам", instrumental + "стами", genitive + "стах"):
+            add(form, Lexeme(value, HUNDRED))
+    for value, forms in SCALES.items():
+        for form in forms:
+            add(form, Lexeme(value, SCALE))
+    for form in HALF_FORMS:
+        add(form, Lexeme(Decimal("1.5"), HALF))
+
+    for value, (stem, nominative) in ORDINAL_STEMS.items():
+        for form in _ordinal_forms(stem, nominative):
+            add(form, Lexeme(value, _kind(value), ordinal=True))
+    for digit, prefix in GENITIVE_PREFIXES.items():
+        for value, stem in ((digit * 100, prefix + "сот"), (digit * 1000, prefix + "тысячн")):
+            for form in _ordinal_forms(stem, "ый"):
+                add(form, Lexeme(value, _kind(value) if value < 1000 else SCALE, ordinal=True))
+    return lexicon
+
+
+LEXICON = _build_lexicon()
+
+# Какие классы могут идти после данного внутри группы до тысячи (None — группа пуста)
+_FOLLOWS = {
+    None: {UNIT, TEEN, TEN, HUNDRED, HALF},
+    HUNDRED: {UNIT, TEEN, TEN},
+    TEN: {UNIT},
+    TEEN: set(),
+    UNIT: set(),
+    HALF: set(),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class NumberSpan:
+    start: int
+    end: int
+    value: Number
+    ordinal: bool = False
+
+
+class _Builder:
+    """Состояние автомата для одного составного числа."""
+
+    __slots__ = ("start", "end", "total", "group", "last_kind", "last_scale", "ordinal")
+
+    def __init__(self, start: int):
+        self.start = start
+        self.end = start
+        self.total: Number = 0
+        self.group: Number = 0
+        self.last_kind: Optional[int] = None
+        self.last_scale = float("inf")
+        self.ordinal = False
+
+    def accepts(self, lexeme: Lexeme) -> bool:
+        if self.ordinal:
+            return False
+        if lexeme.kind == SCALE:
+            return lexeme.value < self.last_scale
+        return lexeme.kind in _FOLLOWS[self.last_kind]
+
+    def accepts_digits(self, value: int) -> bool:
+        """Группа цифрами после разряда («5 тысяч 300»)."""
+        return not self.ordinal and self.last_kind is None and bool(self.total) and value < min(1000, self.last_scale)
+
+    def add(self, lexeme: Lexeme, end: int) -> None:
+        self.end = end
+        self.ordinal = lexeme.ordinal
+        if lexeme.kind == SCALE:
+            self.total += (self.group or 1) * lexeme.value
+            self.group = 0
+            self.last_kind = None
+            self.last_scale = lexeme.value
+        else:
+            self.group += lexeme.value
+            self.last_kind = lexeme.kind
+
+    def add_digits(self, value: Number, end: int) -> None:
+        """Число цифрами: продолжить его может только разряд («5 тысяч»)."""
+        self.end = end
+        self.group = value
+        self.last_kind = HALF
+
+    def span(self) -> NumberSpan:
+        value = self.total + self.group
+        if isinstance(value, Decimal) and value == value.to_integral_value():
+            value = int(value)
+        return NumberSpan(self.start, self.end, value, self.ordinal)
+
+
+def _parse_digits(token: str) -> Number:
+    if "," in token or "." in token:
+        return Decimal(token.replace(",", "."))
+    return int(token)
+
+
+def find_numbers(text: str) -> list[NumberSpan]:
+    """Числа, записанные словами (и «цифры + разряд»), с позициями в тексте."""
+    spans: list[NumberSpan] = []
+    builder: Optional[_Builder] = None
+    # Число цифрами, за которым может последовать разряд
+    digits: Optional[tuple[int, int, Number]] = None
+
+    for match in WORD_PATTERN.finditer(text):
+        start, end = match.span()
+        token = match.group(0).lower()
+        lexeme = LEXICON.get(token)
+        previous_end = builder.end if builder is not None else digits[1] if digits is not None else start
+        adjacent = text[previous_end:start].isspace()
+
+        if builder is not None and lexeme is not None and adjacent and builder.accepts(lexeme):
+            builder.add(lexeme, end)
+            continue
+        if builder is not None and token.isdigit() and adjacent and builder.accepts_digits(int(token)):
+            builder.add_digits(int(token), end)
+            continue
+        if builder is None and digits is not None and lexeme is not None and lexeme.kind == SCALE and adjacent:
+            builder = _Builder(digits[0])
+            builder.add_digits(digits[2], digits[1])
+            builder.add(lexeme, end)
+            digits = None
+            continue
+
+        if builder is not None:
+            spans.append(builder.span())
+            builder = None
+        digits = None
+
+        if lexeme is not None:
+            builder = _Builder(start)
+            builder.add(lexeme, end)
+        elif token[0].isdigit():
+            digits = (start, end, _parse_digits(token))
+
+    if builder is not None:
+        spans.append(builder.span())
+    return spans
+
+
+def format_number(value: Number) -> str:
+    if isinstance(value, Decimal):
+        return format(value.normalize(), "f")
+    return str(value)
+
+
+def normalize_numbers(text: str) -> str:
+    """Заменить числа, записанные словами, цифрами."""
+    spans = find_numbers(text)
+    if not spans:
+        return text
+    parts = []
+    position = 0
+    for span in spans:
+        parts.append(text[position:span.start])
+        parts.append(format_number(span.value))
+        position = span.end
+    parts.append(text[position:])
+    return "".join(parts)
@@ -0,0 +1,152 @@
+"""
+Поиск и нормализация телефонных номеров в распознанном тексте
+"""
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Iterable
+
+SPOKEN_DIGITS = {
+    "ноль": "0", "нуль": "0",
+    "один": "1", "одна": "1", "раз": "1",
+    "два": "2", "две": "2",
+    "три": "3",
+    "четыре": "4",
+    "пять": "5",
+    "шесть": "6",
+    "семь": "7",
+    "восемь": "8",
+    "девять": "9",
+}
+
+# Разделитель расшифровок в пакетном режиме: не входит ни в один шаблон
+BATCH_SEPARATOR = "\x00"
+
+# Минимум цифр продиктованного номера, чтобы не трогать «два три слова»
+MIN_SPOKEN_DIGITS = 5
+MIN_DIGITS = 8
+MAX_DIGITS = 15  # E.164
+RU_DIGITS = 11
+
+_digit_word = "|".join(sorted(SPOKEN_DIGITS, key=len, reverse=True))
+# Первые буквы слов-цифр и «плюс»: с опережающей проверкой движок быстро отбрасывает позиции
+_first_letters = "".join(sorted({word[0] for word in SPOKEN_DIGITS} | {"п"}))
+SPOKEN_PATTERN = re.compile(
+    rf"(?=[{_first_letters}])(?:\bплюс[ ,\-]+)?(?:\b(?:{_digit_word})\b[ ,\-]*){{{MIN_SPOKEN_DIGITS},}}",
+    re.IGNORECASE,
+)
+SPOKEN_WORD_PATTERN = re.compile(rf"\bплюс\b|\b(?:{_digit_word})\b", re.IGNORECASE)
+# Группы цифр через пробел, дефис, точку или скобки; не внутри слов и чисел
+CANDIDATE_PATTERN = re.compile(r"(?<![\w+])(?:\+[ ]?)?\(?\d(?:[ \-.()]{0,2}\d)+(?![\w])")
+NON_DIGITS = re.compile(r"\D")
+
+
+@dataclass(frozen=True, slots=True)
+class PhoneMatch:
+    e164: str  # +79123456789
+    source: str  # Фрагмент текста (продиктованные цифры — уже цифрами)
+
+
+def _spoken_to_digits(match: re.Match) -> str:
+    digits = []
+    for word in SPOKEN_WORD_PATTERN.findall(match.group(0)):
+        word = word.lower()
+        digits.append("+" if word == "плюс" else SPOKEN_DIGITS[word])
+    # Пробел после — чтобы номер не слипся со следующим словом
+    return "".join(digits) + " "
+
+
+def normalize_spoken(text: str) -> str:
+    """Заменить продиктованные по цифрам номера цифрами."""
+    return SPOKEN_PATTERN.sub(_spoken_to_digits, text)
+
+
+def _split_domestic(digits: str) -> list[str]:
+    """Номера без «+»: 8/7 + 10 цифр, мобильный без кода страны, выход на международную линию."""
+    numbers = []
+    while digits:
+        if digits.startswith("810") and len(digits) >= 3 + MIN_DIGITS:
+            # Дальше длина неизвестна: весь остаток — один международный номер
+            rest = digits[3:]
+            if len(rest) <= MAX_DIGITS and rest[0] != "0":
+                numbers.append("+" + rest)
+            break
+        if digits.startswith("00") and len(digits) >= 2 + MIN_DIGITS:
+            rest = digits[2:]
+            if len(rest) <= MAX_DIGITS and rest[0] != "0":
+                numbers.append("+" + rest)
+            break
+        if digits[0] in "78" and len(digits) >= RU_DIGITS:
+            numbers.append("+7" + digits[1:RU_DIGITS])
+            digits = digits[RU_DIGITS:]
+        elif digits[0] == "9" and len(digits) >= RU_DIGITS - 1:
+            numbers.append("+7" + digits[:RU_DIGITS - 1])
+            digits = digits[RU_DIGITS - 1:]
+        else:
+            break
+    return numbers
+
+
+def _normalize(candidate: str) -> list[str]:
+    digits = NON_DIGITS.sub("", candidate)
+    if len(digits) < MIN_DIGITS:
+        return []
+    if candidate.startswith("+"):
+        if digits[0] == "7" and len(digits) > RU_DIGITS:
+            # +7 и следующие за ним номера подряд
+            return ["+" + digits[:RU_DIGITS]] + _split_domestic(digits[RU_DIGITS:])
+        if digits[0] != "0" and len(digits) <= MAX_DIGITS:
+            return ["+" + digits]
+        return []
+    return _split_domestic(digits)
+
+
+def _extract_normalized(text: str) -> list[tuple[int, PhoneMatch]]:
+    """Номера с позицией начала фрагмента в тексте."""
+    return [
+        (match.start(), PhoneMatch(e164, match.group(0).strip()))
+        for match in CANDIDATE_PATTERN.finditer(text)
+        for e164 in _normalize(match.group(0))
+    ]
+
+
+def _deduplicate(matches: Iterable[PhoneMatch]) -> list[PhoneMatch]:
+    seen: dict[str, PhoneMatch] = {}
+    for match in matches:
+        seen.setdefault(match.e164, match)
+    return list(seen.values())
+
+
+def extract_phones(text: str) -> list[PhoneMatch]:
+    """Номера из одной расшифровки в порядке появления, без повторов."""
+    return _deduplicate(phone for _, phone in _extract_normalized(normalize_spoken(text)))
+
+
+def extract_phones_batch(texts: list[str]) -> list[list[PhoneMatch]]:
+    """Номера для каждой расшифровки; все тексты обрабатываются одним проходом."""
+    if not texts:
+        return []
+    # Разделитель внутри расшифровки сдвинул бы границы текстов
+    joined = BATCH_SEPARATOR.join(text.replace(BATCH_SEPARATOR, " ") for text in texts)
+    normalized = normalize_spoken(joined)
+
+    # Начала расшифровок в нормализованном тексте
+    starts = [0]
+    position = normalized.find(BATCH_SEPARATOR)
+    while position != -1:
+        starts.append(position + 1)
+        position = normalized.find(BATCH_SEPARATOR, position + 1)
+
+    results: list[list[PhoneMatch]] = [[] for _ in texts]
+    for start, phone in _extract_normalized(normalized):
+        results[bisect_right(starts, start) - 1].append(phone)
+    return [_deduplicate(matches) for matches in results]
+
+
+def format_phone(e164: str) -> str:
+    """Российские номера — в привычном виде, остальные — как есть."""
+    if e164.startswith("+7") and len(e164) == RU_DIGITS + 1:
+        return f"+7 ({e164[2:5]}) {e164[5:8]}-{e164[8:10]}-{e164[10:12]}"
+    return e164
+
@@ -0,0 +1,167 @@
+"""
+Числовые ряды из распознанного текста и их векторная сводка в NumPy
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+# Минус — знак числа, только если перед ним нет слова или цифры («2020-2024» — два числа)
+NUMBER_PATTERN = re.compile(r"(?:(?<![\w-])-)?\d+(?:[.,]\d+)?")
+# Три и больше чисел через запятую без пробела — список, а не десятичные дроби («120,140,95»)
+LIST_PATTERN = re.compile(r"\d+(?:,\d+){2,}")
+# Год внутри подписи («продажи за 2024 год:») — часть подписи, а не значение ряда
+_LABEL_WORD = r"(?:[^\W\d_]+|(?:19|20)\d\d)"
+# Подпись ряда — до пяти слов перед двоеточием («продажи за неделю:»), начинается со слова
+LABEL_PATTERN = re.compile(rf"([^\W\d_]+(?: {_LABEL_WORD}){{0,4}})\s*:")
+PERCENTILES = (25, 75, 90)
+# Порог модифицированного z-score (Iglewicz–Hoaglin): устойчив к самим выбросам на коротких рядах
+OUTLIER_Z = 3.5
+# Выбросы ищем только в рядах не короче этого
+MIN_OUTLIER_VALUES = 4
+
+
+@dataclass(frozen=True, slots=True)
+class Series:
+    label: Optional[str]
+    values: tuple[float, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class SeriesSummary:
+    label: Optional[str]
+    count: int
+    mean: float
+    median: float
+    std: float
+    minimum: float
+    maximum: float
+    percentiles: tuple[float, ...]  # По PERCENTILES
+    growth: tuple[float, ...]  # Изменение к предыдущему значению, %; NaN после нуля
+    total_change: Optional[float]  # Последнее к первому, %
+    outliers: tuple[float, ...]
+
+
+def _numbers(text: str) -> list[float]:
+    return [float(match.replace(",", ".")) for match in NUMBER_PATTERN.findall(text)]
+
+
+def extract_series(text: str) -> list[Series]:
+    """Ряды текста: по подписям «название:», иначе один ряд из всех чисел."""
+    text = LIST_PATTERN.sub(lambda match: match.group().replace(",", ", "), text)
+    labels = list(LABEL_PATTERN.finditer(text))
+    if not labels:
+        values = _numbers(text)
+        return [Series(None, tuple(values))] if values else []
+
+    series = []
+    leading = _numbers(text[:labels[0].start()])
+    if leading:
+        series.append(Series(None, tuple(leading)))
+    for index, label in enumerate(labels):
+        end = labels[index + 1].start() if index + 1 < len(labels) else len(text)
+        values = _numbers(text[label.end():end])
+        if values:
+            series.append(Series(label.group(1).strip(), tuple(values)))
+    return series
+
+
+def _padded(series: Sequence[Series]) -> np.ndarray:
+    width = max(1, max(len(item.values) for item in series))
+    matrix = np.full((len(series), width), np.nan)
+    for row, item in enumerate(series):
+        matrix[row, :len(item.values)] = item.values
+    return matrix
+
+
+def _quantiles(ordered: np.ndarray, counts: np.ndarray, quantiles: Sequence[float]) -> np.ndarray:
+    """Квантили строк отсортированной матрицы (как np.percentile с method="linear")."""
+    rows = np.arange(len(ordered))[:, None]
+    position = (counts[:, None] - 1) * np.asarray(quantiles)[None, :]
+    lower = np.floor(position).astype(int)
+    upper = np.minimum(lower + 1, counts[:, None] - 1)
+    below, above = ordered[rows, lower], ordered[rows, upper]
+    return below + (above - below) * (position - lower)
+
+
+def summarize_batch(series: Sequence[Series]) -> list[SeriesSummary]:
+    """Сводки для пачки рядов одним векторным проходом."""
+    if not series:
+        return []
+    # Ряд без значений (только NaN) даёт NaN в сводке, без предупреждений NumPy
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return _summarize(series)
+
+
+def _summarize(series: Sequence[Series]) -> list[SeriesSummary]:
+    matrix = _padded(series)
+    valid = ~np.isnan(matrix)
+    counts = np.count_nonzero(valid, axis=1)
+    rows = np.arange(len(series))
+
+    mean = np.where(valid, matrix, 0.0).sum(axis=1) / counts
+    std = np.sqrt(np.where(valid, (matrix - mean[:, None]) ** 2, 0.0).sum(axis=1) / counts)
+    ordered = np.sort(matrix, axis=1)
+    minimum = ordered[:, 0]
+    maximum = ordered[rows, counts - 1]
+    quantiles = _quantiles(ordered, counts, [0.5] + [q / 100 for q in PERCENTILES])
+    median, percentiles = quantiles[:, 0], quantiles[:, 1:]
+
+    # Рост к предыдущему значению; за последним значением ряда NaN из дополнения
+    previous, current = matrix[:, :-1], matrix[:, 1:]
+    growth = np.where(previous != 0, (current - previous) / np.abs(previous) * 100, np.nan)
+    first = matrix[:, 0]
+    last = matrix[rows, counts - 1]
+    total_change = np.where(first != 0, (last - first) / np.abs(first) * 100, np.nan)
+
+    deviation = np.abs(matrix - median[:, None])
+    mad = _quantiles(np.sort(deviation, axis=1), counts, [0.5])[:, 0]
+    z_score = 0.6745 * deviation / mad[:, None]
+    # При нулевом MAD (большинство значений равны) выбросы не ищем
+    outlier_mask = (z_score > OUTLIER_Z) & ((mad > 0) & (counts >= MIN_OUTLIER_VALUES))[:, None]
+
+    summaries = []
+    for row, item in enumerate(series):
+        count = int(counts[row])
+        change = float(total_change[row])
+        summaries.append(SeriesSummary(
+            label=item.label,
+            count=count,
+            mean=float(mean[row]),
+            median=float(median[row]),
+            std=float(std[row]),
+            minimum=float(minimum[row]),
+            maximum=float(maximum[row]),
+            percentiles=tuple(float(value) for value in percentiles[row]),
+            growth=tuple(float(value) for value in growth[row, :count - 1]),
+            total_change=None if count < 2 or np.isnan(change) else change,
+            outliers=tuple(float(value) for value in matrix[row][outlier_mask[row]]),
+        ))
+    return summaries
+
+
+def _percent(value: float) -> str:
+    return "—" if np.isnan(value) else f"{value:+.1f}%"
+
+
+def render_summary(summary: SeriesSummary) -> str:
+    """Сводка одного ряда в несколько коротких строк."""
+    title = summary.label.capitalize() if summary.label else "Ряд"
+    lines = [
+        f"{title} — значений: {summary.count}",
+        f"Среднее {summary.mean:g} · медиана {summary.median:g} · σ {summary.std:.3g}",
+        f"Мин {summary.minimum:g} · "
+        + " · ".join(f"P{q} {value:g}" for q, value in zip(PERCENTILES, summary.percentiles))
+        + f" · макс {summary.maximum:g}",
+    ]
+    if summary.growth:
+        growth = ", ".join(_percent(value) for value in summary.growth[:12])
+        if len(summary.growth) > 12:
+            growth += ", …"
+        total = f" (итого {_percent(summary.total_change)})" if summary.total_change is not None else ""
+        lines.append(f"Рост: {growth}{total}")
+    if summary.outliers:
+        lines.append("Выбросы: " + ", ".join(f"{value:g}" for value in summary.outliers))
+    return "\n".join(lines)
@@ -8,9 +8,6 @@ from .helpers import *
 
 __all__ = [
     # Constants
-    "SERVICE_PRICES",
-    "SERVICE_CATEGORIES", 
-    "SERVICE_SUBCATEGORIES",
     "FREE_USAGE_LIMIT_HOURS",
     "MAX_VOICE_DURATION",
     "MIN_BALANCE_FOR_UNLIMITED",
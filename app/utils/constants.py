@@ -12,55 +12,7 @@ from app.database.models import (
     TransactionType
 )
 
-# Текстовые описания категорий
-CATEGORY_DESCRIPTIONS = {
-    ServiceCategory.ARTISTIC: "🎨 Художественная обработка",
-    ServiceCategory.BUSINESS: "💼 Бизнес коммуникации",
-    ServiceCategory.NUMBERS: "🔢 Работа с цифрами и данными"
-}
-
-# Текстовые описания подкатегорий
-SUBCATEGORY_DESCRIPTIONS = {
-    # Художественные
-    ServiceSubcategory.DIALOGS: "🗣 Диалоги и беседы",
-    ServiceSubcategory.NATURE: "🌿 Описание природы",
-    ServiceSubcategory.MUSIC: "🎵 Музыкальное содержание",
-    ServiceSubcategory.POETRY: "📝 Поэзия и стихи",
-
-    # Бизнес
-    ServiceSubcategory.AGREEMENTS: "📋 Договоры и соглашения",
-    ServiceSubcategory.LAWS: "⚖️ Правовые вопросы",
-    ServiceSubcategory.PRESENTATIONS: "📊 Презентации",
-    ServiceSubcategory.NEGOTIATIONS: "🤝 Переговоры",
-
-    # Цифры
-    ServiceSubcategory.ROUTES: "🗺 Маршруты и направления",
-    ServiceSubcategory.PHONE_NUMBERS: "📱 Номера телефонов",
-    ServiceSubcategory.STATISTICS: "📈 Статистические данные",
-    ServiceSubcategory.CALCULATIONS: "🧮 Расчеты и вычисления"
-}
-
-# Соответствие подкатегорий категориям
-CATEGORY_SUBCATEGORIES = {
-    ServiceCategory.ARTISTIC: [
-        ServiceSubcategory.DIALOGS,
-        ServiceSubcategory.NATURE,
-        ServiceSubcategory.MUSIC,
-        ServiceSubcategory.POETRY
-    ],
-    ServiceCategory.BUSINESS: [
-        ServiceSubcategory.AGREEMENTS,
-        ServiceSubcategory.LAWS,
-        ServiceSubcategory.PRESENTATIONS,
-        ServiceSubcategory.NEGOTIATIONS
-    ],
-    ServiceCategory.NUMBERS: [
-        ServiceSubcategory.ROUTES,
-        ServiceSubcategory.PHONE_NUMBERS,
-        ServiceSubcategory.STATISTICS,
-        ServiceSubcategory.CALCULATIONS
-    ]
-}
+# Описания, цены и лимиты услуг — в каталоге (app.services.catalog)
 
 # Статусы запросов с эмодзи
 REQUEST_STATUS_EMOJI = {
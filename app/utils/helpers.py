@@ -9,8 +9,8 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, Union
 from decimal import Decimal, ROUND_HALF_UP
 
+from app.services.catalog import get_catalog
 from .constants import (
-    SERVICE_PRICES, 
     FREE_USAGE_LIMIT_HOURS, 
     STARS_TO_RUB_RATE,
     DEFAULT_TIMEZONE
@@ -33,15 +33,14 @@ def format_currency(amount: Union[float, Decimal], currency: str = "RUB") -> str
         return f"{amount:.2f} {currency}"
 
 
-def calculate_service_price(category: str, subcategory: str) -> float:
-    """Вычисление цены услуги"""
-    if category not in SERVICE_PRICES:
-        return 0.0
+def calculate_service_price(category: str, subcategory: str) -> Decimal:
+    """Вычисление цены услуги по каталогу"""
+    # Ключи каталога — str-енумы, поэтому поиск по строковому значению работает напрямую
+    service = get_catalog().subcategories.get(subcategory)
+    if service is None or service.category != category:
+        return Decimal("0.00")
     
-    if subcategory not in SERVICE_PRICES[category]:
-        return 0.0
-    
-    return SERVICE_PRICES[category][subcategory]
+    return service.price
 
 
 def calculate_time_until_next_free_use(last_free_use: datetime) -> Optional[timedelta]:
@@ -137,10 +136,12 @@ def format_user_info(user_data: Dict[str, Any]) -> str:
 
 def format_service_info(category: str, subcategory: str) -> str:
     """Форматирование информации об услуге"""
-    from .constants import SERVICE_CATEGORIES, SERVICE_SUBCATEGORIES
+    catalog = get_catalog()
+    category_info = catalog.categories.get(category)
+    service_info = catalog.subcategories.get(subcategory)
     
-    category_name = SERVICE_CATEGORIES.get(category, category)
-    subcategory_name = SERVICE_SUBCATEGORIES.get(category, {}).get(subcategory, subcategory)
+    category_name = category_info.description if category_info else category
+    subcategory_name = service_info.description if service_info else subcategory
     price = calculate_service_price(category, subcategory)
     
     return f"{category_name} → {subcategory_name}\n💰 Цена: {format_currency(price)}"
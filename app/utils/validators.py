@@ -101,18 +101,16 @@ def validate_payment_amount(amount: float, payment_method: str) -> tuple[bool, O
 
 def validate_service_category(category: str) -> bool:
     """Валидация категории услуги"""
-    from .constants import SERVICE_CATEGORIES
-    return category in SERVICE_CATEGORIES
+    from app.services.catalog import get_catalog
+    return category in get_catalog().categories
 
 
 def validate_service_subcategory(category: str, subcategory: str) -> bool:
     """Валидация подкатегории услуги"""
-    from .constants import SERVICE_SUBCATEGORIES
+    from app.services.catalog import get_catalog
     
-    if category not in SERVICE_SUBCATEGORIES:
-        return False
-    
-    return subcategory in SERVICE_SUBCATEGORIES[category]
+    service = get_catalog().subcategories.get(subcategory)
+    return service is not None and service.category == category
 
 
 def sanitize_input(text: str, max_length: int = 1000) -> str:
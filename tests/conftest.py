@@ -0,0 +1,13 @@
+import os
+
+# Обязательные настройки без .env: модули app читают settings при импорте
+for name, value in {
+    "BOT_TOKEN": "123456:test",
+    "DB_NAME": "voice_service_test",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "SECRET_KEY": "test",
+    "JWT_SECRET": "test",
+    "TASK_BROKER": "memory",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,112 @@
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from app.benchmarks.admission_sim import QueueSimulation, generate_jobs
+from app.bot.handlers import service as service_handlers
+from app.bot.states.service import ServiceStates
+from app.database.models import ServiceCategory, ServiceSubcategory
+from app.services.admission import AdmissionDecision, AdmissionPolicy, AdmissionVerdict, QueueLoad
+
+POLICY = AdmissionPolicy(
+    free_defer_wait=300.0,
+    free_reject_wait=900.0,
+    free_max_in_flight=50,
+    paid_max_in_flight=1000,
+    min_throughput=0.05,
+    default_processing_seconds=40.0,
+)
+
+
+def _load(pending: int, in_flight_free: int = 0, in_flight_paid: int = 0) -> QueueLoad:
+    # 300 завершённых за 300 с — 1 запрос в секунду
+    return QueueLoad(
+        pending=pending,
+        in_flight_free=in_flight_free,
+        in_flight_paid=in_flight_paid,
+        completed_in_window=300,
+        window_seconds=300.0,
+        avg_processing_seconds=40.0,
+    )
+
+
+def test_light_load_admits_everyone():
+    assert POLICY.decide(_load(pending=10), is_free=True).verdict == AdmissionVerdict.ADMIT
+    assert POLICY.decide(_load(pending=10), is_free=False).verdict == AdmissionVerdict.ADMIT
+
+
+def test_free_requests_are_deferred_then_rejected_as_wait_grows():
+    deferred = POLICY.decide(_load(pending=400), is_free=True)
+    rejected = POLICY.decide(_load(pending=1000), is_free=True)
+
+    assert (deferred.verdict, deferred.reason) == (AdmissionVerdict.DEFER, "free_wait")
+    assert (rejected.verdict, rejected.reason) == (AdmissionVerdict.REJECT, "free_wait")
+    assert POLICY.decide(_load(pending=1000), is_free=False).admitted
+
+
+def test_in_flight_caps_defer_requests():
+    free = POLICY.decide(_load(pending=0, in_flight_free=50), is_free=True)
+    paid = POLICY.decide(_load(pending=0, in_flight_paid=1000), is_free=False)
+
+    assert (free.verdict, free.reason) == (AdmissionVerdict.DEFER, "free_cap")
+    assert (paid.verdict, paid.reason) == (AdmissionVerdict.DEFER, "paid_cap")
+
+
+def _simulate(policy):
+    jobs = generate_jobs(
+        duration=2400, rate=0.5, spike_start=600, spike_length=600, spike_factor=6.0,
+        free_share=0.6, mean_service=40.0, service_sigma=0.5, seed=7,
+    )
+    return QueueSimulation(
+        policy, workers=30, window=300, retry_delay=120, retry_probability=0.5, max_retries=3, seed=7,
+    ).run(jobs)
+
+
+def test_simulated_spike_keeps_paid_latency_down():
+    baseline = _simulate(None)
+    controlled = _simulate(POLICY)
+
+    assert controlled.verdicts.get("defer", 0) > 0
+    assert controlled.free_abandoned > 0
+    assert max(controlled.paid_latency) < max(baseline.paid_latency) / 2
+    assert controlled.max_queue < baseline.max_queue
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("verdict", "keeps_selection"),
+    [(AdmissionVerdict.DEFER, True), (AdmissionVerdict.REJECT, False)],
+)
+async def test_voice_handler_keeps_selection_only_when_deferred(monkeypatch, verdict, keeps_selection):
+    @asynccontextmanager
+    async def get_session(*args, **kwargs):
+        yield SimpleNamespace()
+
+    decision = AdmissionDecision(verdict, 600.0, _load(pending=600))
+    monkeypatch.setattr(service_handlers.db_manager, "get_session", get_session)
+    monkeypatch.setattr(service_handlers.AdmissionController, "check", AsyncMock(return_value=decision))
+    monkeypatch.setattr(service_handlers.settings, "quality_check_enabled", False)
+
+    state = FSMContext(MemoryStorage(), StorageKey(bot_id=1, chat_id=1, user_id=1))
+    await state.set_state(ServiceStates.waiting_for_voice_message)
+    await state.update_data(category=ServiceCategory.NUMBERS, subcategory=ServiceSubcategory.CALCULATIONS)
+    message = SimpleNamespace(
+        voice=SimpleNamespace(duration=5, file_size=1024, file_id="voice"),
+        chat=SimpleNamespace(id=1),
+        answer=AsyncMock(),
+    )
+    user = SimpleNamespace(id=1, balance=0, last_free_usage=None)
+
+    await service_handlers.voice_message_handler(message, state, user)
+
+    text = message.answer.await_args.args[0]
+    if keeps_selection:
+        assert await state.get_state() == ServiceStates.waiting_for_voice_message.state
+        assert "услуга остаётся выбранной" in text
+    else:
+        assert await state.get_state() is None
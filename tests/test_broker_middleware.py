@@ -0,0 +1,31 @@
+import pytest
+from taskiq import TaskiqMessage
+
+from app.tasks import broker as broker_module
+from app.tasks.broker import PUBLISH_TIMEOUT, BrokerMiddleware, TracingMiddleware
+
+
+def _message(task_id: str) -> TaskiqMessage:
+    return TaskiqMessage(task_id=task_id, task_name="task", labels={}, args=[], kwargs={})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("middleware_class, pending", [
+    (BrokerMiddleware, "_publish_started"),
+    (TracingMiddleware, "_publish_spans"),
+])
+async def test_failed_publishes_are_dropped_after_the_timeout(monkeypatch, middleware_class, pending):
+    middleware = middleware_class()
+    now = 1000.0
+    monkeypatch.setattr(broker_module.time, "perf_counter", lambda: now)
+
+    # Отправка упала: post_send не вызывается
+    await middleware.pre_send(_message("failed"))
+    now += PUBLISH_TIMEOUT / 2
+    await middleware.pre_send(_message("sent"))
+    await middleware.post_send(_message("sent"))
+    assert list(getattr(middleware, pending)) == ["failed"]
+
+    now += PUBLISH_TIMEOUT
+    await middleware.pre_send(_message("next"))
+    assert list(getattr(middleware, pending)) == ["next"]
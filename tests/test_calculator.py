@@ -0,0 +1,46 @@
+from app.text.calculator import TOO_LARGE, calculate, format_quantity
+
+
+def test_rubles_beyond_precision_are_reported_as_too_large():
+    (calculation,) = calculate("открыть скобку 10 в степени 30 закрыть скобку рублей")
+
+    assert format_quantity(calculation.result) == TOO_LARGE
+
+
+def test_rubles_are_rounded_to_kopecks():
+    (calculation,) = calculate("сто рублей разделить на три")
+
+    assert format_quantity(calculation.result) == "33.33 руб."
+
+
+def test_zero_to_negative_power_is_reported_as_division_by_zero():
+    (calculation,) = calculate("ноль в степени минус один")
+
+    assert calculation.result is None
+    assert calculation.error == "деление на ноль"
+
+
+def test_phone_numbers_and_times_are_not_evaluated():
+    assert calculate("8-800-123-45-67") == []
+    assert calculate("позвони 8 (800) 123-45-67") == []
+    assert calculate("встреча в 12:30") == []
+
+
+def test_short_hyphenated_numbers_are_still_subtracted():
+    (calculation,) = calculate("10-5-2")
+
+    assert format_quantity(calculation.result) == "3"
+
+
+def test_digit_groups_are_one_number():
+    (calculation,) = calculate("1 000 000 + 1")
+
+    assert format_quantity(calculation.result) == "1000001"
+
+
+def test_processor_reports_errors_instead_of_failing():
+    from app.processors.numbers import CalculationsProcessor
+
+    response = CalculationsProcessor().process("ноль в степени минус один и десять в степени тридцать рублей")
+
+    assert "деление на ноль" in response
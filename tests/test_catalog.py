@@ -0,0 +1,85 @@
+import asyncio
+import json
+from decimal import Decimal
+
+import pytest
+
+from app.config import settings
+from app.services import catalog as catalog_module
+from app.services.catalog import Catalog, CatalogManager
+
+
+class FakeRedis:
+    def __init__(self, versions):
+        self.versions = list(versions)
+
+    async def get(self, key):
+        value = self.versions.pop(0) if len(self.versions) > 1 else self.versions[0]
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    async def aclose(self):
+        pass
+
+
+def _catalog_data() -> dict:
+    with open(settings.catalog_file, encoding="utf-8") as file:
+        return json.load(file)
+
+
+@pytest.fixture
+def catalog_file(tmp_path, monkeypatch):
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps(_catalog_data(), ensure_ascii=False), encoding="utf-8")
+    monkeypatch.setattr(settings, "catalog_file", str(path))
+    monkeypatch.setattr(settings, "catalog_source", "file")
+    return path
+
+
+def _set_first_price(path, price: str) -> None:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["categories"][0]["subcategories"][0]["price"] = price
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def test_duplicate_subcategories_are_rejected():
+    data = _catalog_data()
+    data["categories"][0]["subcategories"].append(data["categories"][0]["subcategories"][0])
+
+    with pytest.raises(ValueError):
+        Catalog.from_dict(data)
+
+
+async def _watch(manager: CatalogManager, client: FakeRedis, monkeypatch) -> None:
+    monkeypatch.setattr(catalog_module.redis, "from_url", lambda *args, **kwargs: client)
+    task = asyncio.create_task(manager.watch(0.01))
+    await asyncio.sleep(0.1)
+    task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_new_version_is_loaded_and_listeners_notified(catalog_file, monkeypatch):
+    manager = CatalogManager()
+    loaded = []
+    manager.add_listener(loaded.append)
+    subcategory = next(iter(manager.catalog.subcategories))
+    _set_first_price(catalog_file, "99.50")
+
+    await _watch(manager, FakeRedis(["3"]), monkeypatch)
+
+    assert manager.catalog.version == "3"
+    assert manager.catalog.price(subcategory) == Decimal("99.50")
+    # Неизменная версия каталог не перечитывает
+    assert [catalog.version for catalog in loaded] == ["3"]
+
+
+@pytest.mark.asyncio
+async def test_failed_reload_keeps_the_current_catalog(catalog_file, monkeypatch):
+    manager = CatalogManager()
+    current = manager.catalog
+    catalog_file.write_text("{", encoding="utf-8")
+
+    await _watch(manager, FakeRedis([ConnectionError("down"), "4"]), monkeypatch)
+
+    assert manager.catalog is current
@@ -0,0 +1,102 @@
+import math
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from app.config import Settings, settings
+from app.database.engine import DatabaseManager
+
+
+class FakeRedis:
+    """Общие отметки записей, как в Redis у нескольких процессов."""
+
+    def __init__(self):
+        self.keys = set()
+
+    async def set(self, key, value, px=None):
+        self.keys.add(key)
+
+    async def exists(self, key):
+        return int(key in self.keys)
+
+    async def aclose(self):
+        pass
+
+
+async def _create_marker(manager: DatabaseManager, engine, name: str) -> None:
+    async with engine.begin() as connection:
+        await connection.execute(text("CREATE TABLE marker (name TEXT)"))
+        await connection.execute(text("INSERT INTO marker VALUES (:name)"), {"name": name})
+
+
+@pytest_asyncio.fixture
+async def manager(tmp_path, monkeypatch):
+    """Primary и реплика — два локальных файла SQLite."""
+    primary, replica = tmp_path / "primary.db", tmp_path / "replica.db"
+    monkeypatch.setattr(Settings, "database_url", property(lambda self: f"sqlite+aiosqlite:///{primary}"))
+    monkeypatch.setattr(settings, "db_replica_urls", f"sqlite+aiosqlite:///{replica}")
+    monkeypatch.setattr(settings, "debug", False)
+
+    manager = DatabaseManager()
+    manager.init_engine()
+    manager._redis = FakeRedis()
+    await _create_marker(manager, manager.engine, "primary")
+    await _create_marker(manager, manager.replica_engines[0], "replica")
+    yield manager
+    await manager.close()
+
+
+async def _read_from(manager: DatabaseManager, **kwargs) -> str:
+    async with manager.get_session(read_only=True, **kwargs) as session:
+        return (await session.execute(text("SELECT name FROM marker"))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_replica_is_unused_until_its_lag_is_known(manager):
+    assert manager.replica_lag == {0: math.inf}
+    assert await _read_from(manager) == "primary"
+
+    manager.replica_lag[0] = 0.0
+    assert await _read_from(manager) == "replica"
+
+
+@pytest.mark.asyncio
+async def test_lagging_or_unreachable_replica_falls_back_to_primary(manager):
+    manager.replica_lag[0] = settings.db_replica_max_lag + 1
+    assert await _read_from(manager) == "primary"
+
+    # SQLite не знает pg_is_in_recovery(): проверка не удаётся, как у недоступной реплики
+    await manager.check_replication_lag()
+    assert manager.replica_lag[0] == math.inf
+    assert await _read_from(manager) == "primary"
+
+
+@pytest.mark.asyncio
+async def test_reads_after_a_users_write_go_to_primary(manager):
+    manager.replica_lag[0] = 0.0
+    async with manager.get_session(user_id=1) as session:
+        await session.execute(text("UPDATE marker SET name = 'primary'"))
+
+    assert await _read_from(manager, user_id=1) == "primary"
+    assert await _read_from(manager, user_id=2) == "replica"
+
+
+@pytest.mark.asyncio
+async def test_write_marks_are_shared_between_processes(manager):
+    manager.replica_lag[0] = 0.0
+    other_process = DatabaseManager()
+    other_process.replica_engines = manager.replica_engines
+    other_process._redis = manager._redis
+    await other_process.mark_user_write(1)
+
+    assert await _read_from(manager, user_id=1) == "primary"
+
+
+@pytest.mark.asyncio
+async def test_plain_selects_are_not_writes(manager):
+    manager.replica_lag[0] = 0.0
+    async with manager.get_session(user_id=1) as session:
+        await session.execute(text("SELECT name FROM marker"))
+
+    assert await _read_from(manager, user_id=1) == "replica"
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+import app.recognition as recognition
+from app.config import Settings, settings
+from app.recognition import BaseRecognizer, detect_language, get_recognizer, identify_text
+
+
+class EnglishRecognizer(BaseRecognizer):
+    """Первый проход, который слышит английскую речь (mock и fake всегда отвечают по-русски)."""
+
+    name = "english"
+    supports_pcm = True
+
+    async def recognize(self, audio, duration):
+        return "hello, I need the report for this week"
+
+    def recognize_pcm(self, pcm, sample_rate):
+        return "hello, I need the report for this week"
+
+
+@pytest.fixture
+def two_languages(monkeypatch):
+    monkeypatch.setattr(settings, "recognition_languages", "ru,en:fake")
+    monkeypatch.setattr(recognition, "_recognizers", {})
+    monkeypatch.setattr(recognition, "_language_id_recognizer", EnglishRecognizer())
+    monkeypatch.setattr(settings, "language_id_recognizer", "english")
+
+
+def test_recognition_languages_must_not_be_empty():
+    with pytest.raises(ValidationError):
+        Settings(recognition_languages=" , ")
+
+
+def test_identify_text():
+    assert identify_text("мне нужно это сделать").language == "ru"
+    assert identify_text("мені треба це зробити").language == "uk"
+    assert identify_text("123") is None
+
+
+@pytest.mark.asyncio
+async def test_non_default_language_is_detected_and_routed(two_languages):
+    assert settings.default_language == "ru"
+
+    language = await detect_language(np.zeros(16000, np.int16), 16000)
+    recognizer = get_recognizer(language)
+
+    assert language == "en"
+    assert recognizer.inner.name == "fake" and recognizer.language == "en"
+    assert get_recognizer().language == "ru"
@@ -0,0 +1,34 @@
+from decimal import Decimal
+
+import pytest
+
+from app.text.numerals import find_numbers, normalize_numbers
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("восемьсот двадцать три", "823"),
+    ("полтора миллиона", "1500000"),
+    ("двадцать пятого мая", "25 мая"),
+    ("пять тысяч триста", "5300"),
+    ("5 тысяч", "5000"),
+    ("5 тысяч 300", "5300"),
+    ("пять тысяч 300 рублей", "5300 рублей"),
+    ("2 миллиона 500 тысяч", "2500000"),
+    ("три пять", "3 5"),
+])
+def test_normalize_numbers(text, expected):
+    assert normalize_numbers(text) == expected
+
+
+def test_digit_groups_join_only_adjacent_smaller_groups():
+    assert normalize_numbers("5 тысяч, 300") == "5000, 300"
+    assert normalize_numbers("12 тысяч 2024 года") == "12000 2024 года"
+    assert normalize_numbers("300 и 5") == "300 и 5"
+
+
+def test_spans_keep_positions_and_ordinals():
+    (span,) = find_numbers("на третьем этаже")
+
+    assert (span.start, span.end, span.value, span.ordinal) == (3, 10, 3, True)
+    assert find_numbers("2,5 тысячи")[0].value == 2500
+    assert find_numbers("полторы")[0].value == Decimal("1.5")
@@ -0,0 +1,8 @@
+from app.text.phones import extract_phones, extract_phones_batch
+
+
+def test_batch_matches_single_extraction_when_texts_contain_separator():
+    texts = ["позвони\x00 на +7 916 123 45 67", "\x00\x00", "номер 8 495 765 43 21"]
+
+    assert extract_phones_batch(texts) == [extract_phones(text.replace("\x00", " ")) for text in texts]
+    assert [len(phones) for phones in extract_phones_batch(texts)] == [1, 0, 1]
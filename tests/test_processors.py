@@ -0,0 +1,51 @@
+import pytest
+
+from app.processors import (
+    BaseProcessor, DefaultProcessor, ProcessorProfile, get_processor, register_processor, registered_keys,
+    run_processor,
+)
+from app.processors import registry
+
+
+class UpperProcessor(BaseProcessor):
+    key = "test_upper"
+    profile = ProcessorProfile.THREAD
+
+    def setup(self) -> None:
+        self.ready = True
+
+    def process(self, text: str) -> str:
+        return text.upper()
+
+
+@pytest.fixture
+def upper(monkeypatch):
+    monkeypatch.setattr(registry, "_registry", dict(registry._registry))
+    monkeypatch.setattr(registry, "_instances", {})
+    return register_processor(UpperProcessor)
+
+
+def test_catalog_processors_are_registered():
+    assert {"statistics", "calculations", "phone_numbers", "routes"} <= set(registered_keys())
+
+
+def test_duplicate_keys_are_rejected(upper):
+    with pytest.raises(ValueError):
+        register_processor(UpperProcessor)
+
+
+def test_instances_are_set_up_once(upper):
+    processor = get_processor("test_upper")
+
+    assert processor.ready
+    assert get_processor("test_upper") is processor
+
+
+def test_unknown_key_falls_back_to_default(upper):
+    assert isinstance(get_processor("missing"), DefaultProcessor)
+
+
+@pytest.mark.asyncio
+async def test_run_processor_follows_the_profile(upper):
+    assert await run_processor("test_upper", "текст") == "ТЕКСТ"
+    assert "текст" in await run_processor("missing", "текст")
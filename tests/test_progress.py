@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from app.tasks.progress import STAGE_MARKER_KEY, ProgressNotifier, ProgressStage, render_progress
+
+KEY = (1, 10)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.keys = set()
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.keys:
+            return False
+        self.keys.add(key)
+        return True
+
+    async def exists(self, key):
+        return int(key in self.keys)
+
+    async def delete(self, key):
+        self.keys.discard(key)
+
+
+class RecordingNotifier(ProgressNotifier):
+    def __init__(self, min_interval: float, retry_after: tuple[float, ...] = ()):
+        super().__init__(min_interval)
+        self.edits = []
+        self.retry_after = list(retry_after)
+        self._redis = FakeRedis()
+
+    async def _edit(self, bot_token, key, text):
+        self.edits.append(text)
+        return self.retry_after.pop(0) if self.retry_after else 0.0
+
+    async def wait(self):
+        await asyncio.wait([state.task for state in self._messages.values() if state.task])
+
+
+def _stage(stage: ProgressStage) -> str:
+    return render_progress(stage)
+
+
+@pytest.mark.asyncio
+async def test_edits_are_coalesced_to_the_latest_text():
+    notifier = RecordingNotifier(min_interval=0.05)
+
+    for stage in (ProgressStage.DOWNLOADING, ProgressStage.RECOGNIZING, ProgressStage.PROCESSING):
+        notifier.publish("token", *KEY, _stage(stage))
+        await asyncio.sleep(0)
+    notifier.publish("token", *KEY, _stage(ProgressStage.COMPLETED), final=True)
+    await notifier.wait()
+
+    assert notifier.edits == [_stage(ProgressStage.DOWNLOADING), _stage(ProgressStage.COMPLETED)]
+    assert KEY not in notifier._messages
+
+
+@pytest.mark.asyncio
+async def test_queue_position_is_not_shown_after_processing_started():
+    notifier = RecordingNotifier(min_interval=0.0)
+
+    notifier.publish("token", *KEY, _stage(ProgressStage.RECOGNIZING))
+    notifier.publish("token", *KEY, render_progress(ProgressStage.QUEUED, 3), queued=True)
+    await notifier.wait()
+
+    assert notifier.edits == [_stage(ProgressStage.RECOGNIZING)]
+
+
+@pytest.mark.asyncio
+async def test_queue_position_yields_to_another_workers_stage():
+    notifier = RecordingNotifier(min_interval=0.0)
+    notifier._redis.keys.add(STAGE_MARKER_KEY.format(chat_id=KEY[0], message_id=KEY[1]))
+
+    notifier.publish("token", *KEY, render_progress(ProgressStage.QUEUED, 3), queued=True)
+    await notifier.wait()
+
+    assert notifier.edits == []
+
+
+@pytest.mark.asyncio
+async def test_flood_control_retries_the_text():
+    notifier = RecordingNotifier(min_interval=0.0, retry_after=(0.01,))
+
+    notifier.publish("token", *KEY, _stage(ProgressStage.COMPLETED), final=True)
+    await notifier.wait()
+
+    assert notifier.edits == [_stage(ProgressStage.COMPLETED)] * 2
+
+
+def test_long_transcripts_are_cut_from_the_start():
+    text = render_progress(ProgressStage.RECOGNIZING, transcript="а" * 5000 + " <конец>")
+
+    assert "…" in text and text.endswith("&lt;конец&gt;</i>")
+    assert len(text) < 4096
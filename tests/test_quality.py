@@ -0,0 +1,101 @@
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.audio.decode import SAMPLE_RATE
+from app.audio.quality import QualityIssue, assess_quality, measure_quality
+from app.database.models import RequestStatus
+from app.tasks import voice_processing
+
+MIN_RMS_DBFS = -50.0
+MAX_CLIPPING = 0.01
+
+
+def _tone(seconds: float, amplitude: float) -> np.ndarray:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return np.clip(amplitude * np.sin(2 * np.pi * 220 * t), -32768, 32767).astype(np.int16)
+
+
+def test_normal_recording_passes():
+    quality, issue = assess_quality(_tone(20, 8000), MIN_RMS_DBFS, MAX_CLIPPING)
+
+    assert issue is None
+    assert -20 < quality.rms_dbfs < -10
+
+
+def test_silent_clipped_and_empty_recordings_are_rejected():
+    clipped = _tone(20, 60000)
+
+    assert assess_quality(np.zeros(SAMPLE_RATE * 5, np.int16), MIN_RMS_DBFS, MAX_CLIPPING)[1] == QualityIssue.SILENT
+    assert assess_quality(clipped, MIN_RMS_DBFS, MAX_CLIPPING)[1] == QualityIssue.CLIPPED
+    assert assess_quality(np.zeros(0, np.int16), MIN_RMS_DBFS, MAX_CLIPPING)[1] == QualityIssue.BROKEN
+
+
+def test_long_recordings_are_measured_on_a_sparse_sample():
+    quality = measure_quality(_tone(600, 8000))
+
+    assert quality.samples < SAMPLE_RATE * 10
+
+
+class FakeVoiceService:
+    def __init__(self):
+        self.statuses = []
+
+    async def update_request_status(self, request_id, status, **fields):
+        self.statuses.append(status)
+
+
+class FakeUserService:
+    def __init__(self, last_free_usage):
+        self.last_free_usage = last_free_usage
+        self.balance = Decimal("0")
+
+    async def reset_free_usage(self, user_id, previous):
+        self.last_free_usage = previous
+
+    async def update_balance(self, user_id, amount):
+        self.balance += amount
+
+
+@pytest.fixture
+def no_delivery(monkeypatch):
+    async def nothing(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(voice_processing.db_manager, "mark_user_write", nothing)
+    monkeypatch.setattr(voice_processing, "_send_message", nothing)
+    monkeypatch.setattr(voice_processing, "report_stage", lambda *args, **kwargs: None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("previous", [None, datetime(2026, 1, 1, 12, 0)])
+async def test_refused_free_request_restores_previous_free_usage(no_delivery, previous):
+    request = SimpleNamespace(
+        id=1, user_id=2, is_free=True, cost=Decimal("0"), chat_id=3, progress_message_id=4,
+        previous_free_usage=previous
+    )
+    voice_service = FakeVoiceService()
+    user_service = FakeUserService(last_free_usage=datetime(2026, 1, 2, 12, 0))
+
+    await voice_processing._refuse_request(voice_service, user_service, request, "token", "text")
+
+    assert voice_service.statuses == [RequestStatus.FAILED]
+    assert user_service.last_free_usage == previous
+    assert user_service.balance == 0
+
+
+@pytest.mark.asyncio
+async def test_refused_paid_request_is_refunded(no_delivery):
+    request = SimpleNamespace(
+        id=1, user_id=2, is_free=False, cost=Decimal("15.00"), chat_id=None, progress_message_id=None,
+        previous_free_usage=None
+    )
+    user_service = FakeUserService(last_free_usage=datetime(2026, 1, 2, 12, 0))
+
+    await voice_processing._refuse_request(FakeVoiceService(), user_service, request, "token", "text")
+
+    assert user_service.balance == Decimal("15.00")
+    assert user_service.last_free_usage == datetime(2026, 1, 2, 12, 0)
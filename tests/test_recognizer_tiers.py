@@ -0,0 +1,33 @@
+import pytest
+
+from app.services.admission import QueueLoad
+from app.services.recognizer_tiers import RecognizerTier, TierPolicy
+
+POLICY = TierPolicy(degrade_wait=300.0, recover_wait=120.0, degrade_pending=200, recover_pending=50)
+ACCURATE, FAST = RecognizerTier.ACCURATE, RecognizerTier.FAST
+
+
+@pytest.mark.parametrize("pending, wait, expected", [
+    (200, 300.0, ACCURATE),  # Ровно на порогах уровень держится
+    (201, 0.0, FAST),
+    (0, 300.1, FAST),
+    (150, 200.0, ACCURATE),
+])
+def test_degrade(pending, wait, expected):
+    assert POLICY.next_tier(ACCURATE, QueueLoad(pending=pending), wait) == expected
+
+
+@pytest.mark.parametrize("pending, wait, expected", [
+    (50, 0.0, FAST),  # Ровно на порогах уровень держится
+    (0, 120.0, FAST),
+    (49, 119.0, ACCURATE),
+    (49, 200.0, FAST),  # Возврат — только по обоим порогам
+    (150, 0.0, FAST),
+])
+def test_recover(pending, wait, expected):
+    assert POLICY.next_tier(FAST, QueueLoad(pending=pending), wait) == expected
+
+
+def test_recover_thresholds_must_not_exceed_degrade_thresholds():
+    with pytest.raises(ValueError):
+        TierPolicy(degrade_wait=100.0, recover_wait=120.0, degrade_pending=200, recover_pending=50)
@@ -0,0 +1,69 @@
+import pytest
+import redis.asyncio as redis
+
+from app.database.models import ServiceSubcategory
+from app.processors import get_processor
+from app.processors.cache import ResponseCache, response_key
+
+
+class FakeRedis:
+    def __init__(self, fail: bool = False):
+        self.values = {}
+        self.fail = fail
+
+    async def get(self, key):
+        if self.fail:
+            raise redis.ConnectionError("down")
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        if self.fail:
+            raise redis.ConnectionError("down")
+        self.values[key] = value
+
+
+def _cache(client: FakeRedis, max_entries: int = 2, ttl: int = 60) -> ResponseCache:
+    cache = ResponseCache(max_entries, ttl)
+    cache._client = client
+    return cache
+
+
+def test_key_changes_with_processor_version(monkeypatch):
+    processor = get_processor("statistics")
+    subcategory = list(ServiceSubcategory)[0]
+    key = response_key("текст", subcategory, processor)
+
+    monkeypatch.setattr(processor, "version", processor.version + "-next")
+
+    assert response_key("текст", subcategory, processor) != key
+    assert response_key("другой текст", subcategory, processor) != key
+
+
+@pytest.mark.asyncio
+async def test_redis_hit_fills_the_local_cache():
+    shared = FakeRedis()
+    await _cache(shared).set("a", "ответ")
+    cache = _cache(shared)
+
+    assert await cache.get("a") == "ответ"
+    shared.values.clear()
+    assert await cache.get("a") == "ответ"
+    assert await cache.get("b") is None
+
+
+@pytest.mark.asyncio
+async def test_local_cache_evicts_least_recently_used():
+    cache = _cache(FakeRedis(fail=True), max_entries=2)
+    for key in "abc":
+        await cache.set(key, key.upper())
+
+    assert list(cache._entries) == ["b", "c"]
+    assert await cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_not_served():
+    cache = _cache(FakeRedis(fail=True), ttl=-1)
+    await cache.set("a", "A")
+
+    assert await cache.get("a") is None
@@ -0,0 +1,53 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.models import Base, RequestStatus, ServiceCategory, ServiceSubcategory, User
+from app.services.voice_service import VoiceService
+from app.tasks.scheduling import SchedulingPolicy
+
+POLICY = SchedulingPolicy(bucket_limits=(15, 60, 180), max_wait=600.0)
+
+
+def test_shorter_recordings_get_higher_priority():
+    assert [POLICY.priority(duration) for duration in (5, 15, 16, 60, 120, 180, 600)] == [3, 3, 2, 2, 1, 1, 0]
+
+
+def test_aged_requests_outrank_every_bucket():
+    assert POLICY.aged_priority == POLICY.max_priority == 4
+    assert POLICY.aged_priority > POLICY.priority(0)
+
+
+@pytest_asyncio.fixture
+async def session(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'voice.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        session.add(User(id=1, telegram_id=100))
+        await session.flush()
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_request_is_claimed_once(session, monkeypatch):
+    catalog = SimpleNamespace(price=lambda subcategory: Decimal("10.00"))
+    monkeypatch.setattr("app.services.voice_service.get_catalog", lambda: catalog)
+    voice_service = VoiceService(session)
+    request = await voice_service.create_service_request(
+        user_id=1,
+        category=list(ServiceCategory)[0],
+        subcategory=list(ServiceSubcategory)[0],
+        voice_file_id="file",
+        voice_duration=10,
+        priority=POLICY.priority(10)
+    )
+
+    claimed = await voice_service.claim_request(request.id)
+    # Задача, переотправленная при старении, запрос уже не получит
+    assert claimed is not None and claimed.status == RequestStatus.PROCESSING
+    assert await voice_service.claim_request(request.id) is None
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.audio.decode import SAMPLE_RATE, decode_wav
+from app.audio.segment import Chunk, split_on_silence
+from app.audio.stitch import stitch_transcripts
+from app.config import Settings
+from app.testing.audio_samples import synthesize_voice_wav
+
+
+def _noise(seconds: float) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.integers(-8000, 8000, int(seconds * SAMPLE_RATE)).astype(np.int16)
+
+
+def test_short_recording_is_a_single_chunk():
+    pcm = _noise(10)
+
+    assert split_on_silence(pcm) == [Chunk(0, len(pcm))]
+
+
+def test_chunks_cover_the_recording_within_the_limit():
+    pcm = decode_wav(synthesize_voice_wav(180, seed=3))
+
+    chunks = split_on_silence(pcm, max_chunk_seconds=30.0)
+
+    assert chunks[0].start == 0
+    assert chunks[-1].end == len(pcm)
+    assert all(chunk.duration() <= 30.0 for chunk in chunks)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert previous.start < chunk.start <= previous.end
+
+
+def test_hard_cuts_overlap_when_there_are_no_pauses():
+    pcm = _noise(70)
+
+    chunks = split_on_silence(pcm, max_chunk_seconds=30.0, overlap_seconds=1.0)
+
+    assert len(chunks) == 3
+    assert all(chunk.overlaps_previous for chunk in chunks[1:])
+    assert chunks[0].end - chunks[1].start == SAMPLE_RATE
+
+
+def test_overlap_not_shorter_than_chunk_is_rejected():
+    with pytest.raises(ValueError):
+        split_on_silence(_noise(70), max_chunk_seconds=1.0, overlap_seconds=1.0)
+    with pytest.raises(ValidationError):
+        Settings(recognition_chunk_seconds=1.0, recognition_chunk_overlap=2.0)
+
+
+def test_stitch_drops_words_repeated_in_the_overlap():
+    chunks = [Chunk(0, 10), Chunk(8, 20, overlaps_previous=True), Chunk(20, 30)]
+    texts = ["привет как дела", "Дела, хорошо спасибо", "дела идут"]
+
+    assert stitch_transcripts(chunks, texts) == "привет как дела хорошо спасибо дела идут"
@@ -0,0 +1,61 @@
+import asyncio
+import math
+import warnings
+
+import pytest
+
+from app.processors import get_processor, run_processor
+from app.text.series import Series, extract_series, summarize_batch
+
+
+def test_comma_separated_list_is_not_read_as_decimals():
+    assert extract_series("120,140,95") == [Series(None, (120.0, 140.0, 95.0))]
+    assert extract_series("рост 2,5 и 3,5") == [Series(None, (2.5, 3.5))]
+
+
+def test_years_stay_in_the_label():
+    assert extract_series("продажи за 2024 год: 120, 140") == [Series("продажи за 2024 год", (120.0, 140.0))]
+
+
+def test_labels_split_series():
+    assert extract_series("продажи: 120, 140, 95; расходы: 80, 90") == [
+        Series("продажи", (120.0, 140.0, 95.0)),
+        Series("расходы", (80.0, 90.0)),
+    ]
+
+
+def test_batch_summary():
+    short, long = summarize_batch([Series("a", (10.0, 20.0)), Series("b", (1.0, 2.0, 3.0, 4.0, 100.0))])
+
+    assert (short.mean, short.median, short.total_change) == (15.0, 15.0, 100.0)
+    assert short.growth == (100.0,)
+    assert long.median == 3.0 and long.maximum == 100.0
+    assert long.outliers == (100.0,)
+
+
+def test_empty_series_gives_nan_without_warnings():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        (summary,) = summarize_batch([Series(None, ())])
+
+    assert summary.count == 0
+    assert math.isnan(summary.mean) and math.isnan(summary.std) and math.isnan(summary.median)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_statistics_requests_are_processed_in_one_batch(monkeypatch):
+    processor = get_processor("statistics")
+    batches = []
+    process_batch = processor.process_batch
+
+    def recording(texts):
+        batches.append(len(texts))
+        return process_batch(texts)
+
+    monkeypatch.setattr(processor, "process_batch", recording)
+    texts = ["продажи: 1, 2, 3", "расходы: 4, 5", "нет чисел"]
+
+    responses = await asyncio.gather(*(run_processor("statistics", text) for text in texts))
+
+    assert batches == [3]
+    assert responses == [processor.process(text) for text in texts]
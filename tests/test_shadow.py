@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.shadow import word_error_rate
+from app.tasks import shadow
+
+
+class Processor:
+    def __init__(self, key, process):
+        self.key, self.version, self.process = key, 1, process
+
+
+def _fail(text):
+    raise RuntimeError("boom")
+
+
+@pytest.fixture
+def processors(monkeypatch):
+    registry = {
+        "primary": Processor("primary", str.upper),
+        "candidate": Processor("candidate", str.upper),
+        "broken": Processor("broken", _fail),
+    }
+    monkeypatch.setattr(shadow, "get_processor", registry.__getitem__)
+
+
+def test_word_error_rate():
+    assert word_error_rate("раз два три", "раз два три") == 0
+    assert word_error_rate("раз два три", "раз три") == pytest.approx(1 / 3)
+    assert word_error_rate("", "") == 0
+
+
+@pytest.mark.asyncio
+async def test_matching_candidate(processors):
+    request = SimpleNamespace(id=1, processed_text="текст")
+
+    result = await shadow._shadow_processor(request, "primary", "candidate")
+
+    assert result.exact_match and result.error is None
+    assert result.primary_seconds is not None and result.candidate_seconds is not None
+
+
+@pytest.mark.asyncio
+async def test_primary_failure_is_recorded(processors):
+    request = SimpleNamespace(id=1, processed_text="текст")
+
+    result = await shadow._shadow_processor(request, "broken", "candidate")
+
+    assert result.error == "primary: boom"
+    assert result.primary_seconds is None and result.candidate_seconds is None
+    assert result.exact_match is None
@@ -0,0 +1,49 @@
+import numpy as np
+
+from app.audio.decode import SAMPLE_RATE
+from app.audio.vad import detect_speech, trim_silence
+
+RNG = np.random.default_rng(0)
+
+
+def _silence(seconds: float) -> np.ndarray:
+    return RNG.normal(0, 20, int(seconds * SAMPLE_RATE)).astype(np.int16)
+
+
+def _speech(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (6000 * np.sin(2 * np.pi * 180 * t)).astype(np.int16)
+
+
+def test_silence_has_no_speech():
+    result = detect_speech(_silence(3))
+
+    assert result.segments() == []
+    assert len(trim_silence(_silence(3), result)) == 0
+
+
+def test_speech_segments_are_found_around_a_long_pause():
+    pcm = np.concatenate([_silence(1), _speech(2), _silence(3), _speech(1), _silence(1)])
+
+    result = detect_speech(pcm)
+    (first_start, first_end), (second_start, second_end) = result.segments()
+
+    assert abs(first_start / SAMPLE_RATE - 1) < 0.05 and abs(first_end / SAMPLE_RATE - 3.15) < 0.05
+    assert abs(second_start / SAMPLE_RATE - 6) < 0.05
+    assert 2.9 < result.speech_seconds < 3.5
+
+
+def test_short_pauses_are_merged_and_clicks_dropped():
+    click = np.full(int(0.02 * SAMPLE_RATE), 20000, np.int16)
+    pcm = np.concatenate([_silence(1), _speech(1), _silence(0.1), _speech(1), _silence(1), click, _silence(1)])
+
+    assert len(detect_speech(pcm).segments()) == 1
+
+
+def test_trim_shortens_long_pauses():
+    pcm = np.concatenate([_silence(1), _speech(2), _silence(3), _speech(1), _silence(1)])
+
+    trimmed = trim_silence(pcm, detect_speech(pcm), max_pause_seconds=0.5, padding_seconds=0.1)
+
+    # Речь 3 с, хвост 0.15 с у каждого участка, отступы 0.1 с и пауза 0.5 с
+    assert abs(len(trimmed) / SAMPLE_RATE - 4.2) < 0.05